@@ -1,35 +1,1857 @@
 #!/usr/bin/env python3
 """Generate dashboard.html with embedded FIFA data and visualizations."""
 
+import argparse
+import base64
+import cProfile
 import csv
+import gc
+import hashlib
+import heapq
+import http.server
 import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import struct
+import threading
+import time
+import tracemalloc
+import unicodedata
+from collections import deque
+from contextlib import contextmanager
+from datetime import date
+from html import escape
+from operator import itemgetter
 from pathlib import Path
 
-def read_csv_to_json(filepath):
-    """Read CSV file and return as list of dicts."""
+DEFAULT_SUBTITLE = '153 years of international football data (1872-2025)'
+
+class StageProfiler:
+    """Record wall time, CPU time and tracemalloc peak for each build stage."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            start_current = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = {
+                'stage': name,
+                'wall_s': round(time.perf_counter() - wall, 6),
+                'cpu_s': round(time.process_time() - cpu, 6),
+            }
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                entry['peak_alloc_bytes'] = peak - start_current
+                entry['retained_bytes'] = current - start_current
+            self.stages.append(entry)
+
+    def report(self):
+        """Return the collected stages plus totals as a JSON-serialisable dict."""
+        return {
+            'stages': self.stages,
+            'total_wall_s': round(sum(s['wall_s'] for s in self.stages), 6),
+            'total_cpu_s': round(sum(s['cpu_s'] for s in self.stages), 6),
+            'tracemalloc': tracemalloc.is_tracing(),
+        }
+
+    def print_table(self):
+        print(f"{'stage':<32} {'wall s':>8} {'cpu s':>8} {'peak MB':>9}")
+        for entry in self.stages:
+            peak = entry.get('peak_alloc_bytes')
+            peak_text = f"{peak / 1024 / 1024:9.1f}" if peak is not None else f"{'-':>9}"
+            print(f"{entry['stage']:<32} {entry['wall_s']:8.3f} {entry['cpu_s']:8.3f} {peak_text}")
+
+NO_PROFILE = StageProfiler(enabled=False)
+
+FLAG_VALUES = ('TRUE', 'FALSE')
+MAX_MINUTE = 130
+MINUTE_VALUES = frozenset(['NA', *map(str, range(1, MAX_MINUTE + 1))])
+
+class DatasetValidator:
+    """Row checks fused into the CSV read loop, plus the cross-file state they need.
+
+    results and goalscorers get their own read loop (_read_<file>) with the
+    checks inlined, so a clean row costs a handful of comparisons and no
+    calls; the other files go through _read_rows and a per-row _ok_<file>.
+    The per-field explanations are only built, by _check, for rows that
+    fail. Errors drop the row; warnings keep it but still land in the
+    quarantine file. Files must be read in load order (results first) so
+    later files can be checked against known matches. Reading a file again
+    replaces what the last read of it recorded.
+    """
+
+    # Files whose rows are checked against the kept results rows
+    MATCH_CHECKED = ('goalscorers', 'shootouts')
+
+    def __init__(self):
+        # file name -> issues of its last read, in load order
+        self.file_issues = {}
+        self.score_issues = []
+        self.rows = {}
+        self.rejected = {}
+        # match key -> kept results row; scores are only parsed in finish()
+        self.matches = {}
+        self.goal_rows = {}
+        self.missing_minutes = 0
+        self._valid_dates = {}
+        self._teams = None
+
+    @property
+    def issues(self):
+        """Every flagged row: each file's in load order, then the score checks."""
+        return [issue for issues in self.file_issues.values() for issue in issues] + self.score_issues
+
+    @property
+    def teams(self):
+        """Teams with a kept results row."""
+        if self._teams is None:
+            self._teams = {team for _, home, away in self.matches for team in (home, away)}
+        return self._teams
+
+    def _date_ok(self, value):
+        ok = self._valid_dates.get(value)
+        if ok is None:
+            try:
+                date.fromisoformat(value)
+                ok = len(value) == 10
+            except ValueError:
+                ok = False
+            self._valid_dates[value] = ok
+        return ok
+
+    def read(self, name, reader, header):
+        """Return the kept rows of one file, validating them as they stream off reader."""
+        self.rejected[name] = 0
+        self.file_issues[name] = []
+        read_file = getattr(self, f'_read_{name}', None)
+        rows = read_file(reader, header) if read_file else self._read_rows(name, reader, header)
+        self.rows[name] = len(rows) + self.rejected[name]
+        return rows
+
+    def _read_rows(self, name, reader, header):
+        fast_ok = getattr(self, f'_ok_{name}')
+        valid_dates = self._valid_dates
+        last_date = ''
+        rows = []
+        for values in reader:
+            row = dict(zip(header, values))
+            day = row.get('date')
+            if day is None or (valid_dates.get(day) and day >= last_date):
+                if fast_ok(row):
+                    if day is not None:
+                        last_date = day
+                    rows.append(row)
+                    continue
+            last_date = self._check(name, reader.line_num, row, last_date, rows)
+        return rows
+
+    def _read_results(self, reader, header):
+        pick = itemgetter(*map(header.index, ('date', 'home_team', 'away_team', 'home_score',
+                                              'away_score', 'neutral', 'tournament')))
+        valid_dates = self._valid_dates
+        self.matches = matches = {}
+        last_date = ''
+        rows = []
+        for values in reader:
+            row = dict(zip(header, values))
+            day, home, away, home_score, away_score, neutral, tournament = pick(values)
+            if ((valid_dates.get(day) or self._date_ok(day)) and day >= last_date
+                    and home_score.isdigit() and away_score.isdigit() and neutral in FLAG_VALUES
+                    and tournament and home and away and home != away):
+                last_date = day
+                matches[(day, home, away)] = row
+                rows.append(row)
+            else:
+                last_date = self._check('results', reader.line_num, row, last_date, rows)
+        self._teams = None
+        return rows
+
+    def _read_goalscorers(self, reader, header):
+        pick = itemgetter(*map(header.index, ('date', 'home_team', 'away_team', 'team', 'minute',
+                                              'own_goal', 'penalty', 'scorer')))
+        valid_dates, matches = self._valid_dates, self.matches
+        self.goal_rows = goal_rows = {}
+        self.missing_minutes = 0
+        last_date = ''
+        missing_minutes = 0
+        match_date = match_home = match_away = counts = date_ok = None
+        rows = []
+        for values in reader:
+            row = dict(zip(header, values))
+            day, home, away, team, minute, own_goal, penalty, scorer = pick(values)
+            if day != match_date or home != match_home or away != match_away:
+                # A match's goals are listed together, so only its first row
+                # pays for the date check and the lookups
+                match_date, match_home, match_away = day, home, away
+                match = (day, home, away)
+                date_ok = (valid_dates.get(day) or self._date_ok(day)) and day >= last_date
+                counts = goal_rows.get(match)
+                if counts is None and match in matches:
+                    counts = goal_rows[match] = [0, 0]
+            if (date_ok and counts is not None
+                    and minute in MINUTE_VALUES and own_goal in FLAG_VALUES and penalty in FLAG_VALUES
+                    and not (own_goal == 'TRUE' and penalty == 'TRUE')
+                    and (team == home or team == away) and scorer):
+                last_date = day
+                if minute == 'NA':
+                    missing_minutes += 1
+                counts[team != home] += 1
+                rows.append(row)
+            else:
+                last_date = self._check('goalscorers', reader.line_num, row, last_date, rows)
+        self.missing_minutes += missing_minutes
+        return rows
+
+    def _check(self, name, line, row, last_date, rows):
+        """Slow path for a row that failed the inline checks: explain, record, keep.
+
+        Returns the date later rows are ordered against; only a kept row
+        moves it forward.
+        """
+        problems = []
+        value = row.get('date')
+        if value is not None:
+            if not self._date_ok(value):
+                problems.append(('error', f"invalid date {value!r}"))
+            elif value < last_date:
+                problems.append(('warning', f"date {value} is before the previous row"))
+        getattr(self, f'_explain_{name}')(row, problems)
+        keep = True
+        for severity, reason in problems:
+            self.file_issues[name].append({'file': f'{name}.csv', 'line': line, 'severity': severity,
+                                           'reason': reason, 'row': row})
+            keep = keep and severity != 'error'
+        record = getattr(self, f'_record_{name}', None)
+        if keep:
+            if record:
+                record(row)
+            rows.append(row)
+            if value is not None and value > last_date:
+                last_date = value
+        else:
+            self.rejected[name] += 1
+        return last_date
+
+    def _explain_results(self, row, problems):
+        for side in ('home_score', 'away_score'):
+            if not row[side].isdigit():
+                problems.append(('error', f"{side} {row[side]!r} is not a non-negative integer"))
+        if row['neutral'] not in FLAG_VALUES:
+            problems.append(('error', f"neutral {row['neutral']!r} is not TRUE/FALSE"))
+        if not row['home_team'] or not row['away_team'] or row['home_team'] == row['away_team']:
+            problems.append(('error', 'home and away team must be two different teams'))
+        if not row['tournament']:
+            problems.append(('error', 'missing tournament'))
+
+    def _record_results(self, row):
+        self.matches[match_key(row)] = row
+
+    def _explain_goalscorers(self, row, problems):
+        minute = row['minute']
+        if minute != 'NA' and not (minute.isdigit() and 0 < int(minute) <= MAX_MINUTE):
+            problems.append(('error', f"minute {minute!r} is not NA or 1-{MAX_MINUTE}"))
+        for flag in ('own_goal', 'penalty'):
+            if row[flag] not in FLAG_VALUES:
+                problems.append(('error', f"{flag} {row[flag]!r} is not TRUE/FALSE"))
+        if row['own_goal'] == 'TRUE' and row['penalty'] == 'TRUE':
+            problems.append(('error', 'goal is flagged as both own goal and penalty'))
+        if row['team'] not in (row['home_team'], row['away_team']):
+            problems.append(('error', f"scoring team {row['team']!r} did not play in this match"))
+        if not row['scorer']:
+            problems.append(('error', 'missing scorer'))
+        self._explain_match(row, problems)
+
+    def _record_goalscorers(self, row):
+        if row['minute'] == 'NA':
+            self.missing_minutes += 1
+        counts = self.goal_rows.get(match_key(row))
+        if counts is None:
+            counts = self.goal_rows[match_key(row)] = [0, 0]
+        counts[0 if row['team'] == row['home_team'] else 1] += 1
+
+    def _ok_shootouts(self, row):
+        teams = (row['home_team'], row['away_team'])
+        return (row['winner'] in teams and (not row['first_shooter'] or row['first_shooter'] in teams)
+                and self._match_ok(row))
+
+    def _explain_shootouts(self, row, problems):
+        if row['winner'] not in (row['home_team'], row['away_team']):
+            problems.append(('error', f"winner {row['winner']!r} did not play in this match"))
+        if row['first_shooter'] and row['first_shooter'] not in (row['home_team'], row['away_team']):
+            problems.append(('warning', f"first shooter {row['first_shooter']!r} did not play in this match"))
+        self._explain_match(row, problems)
+
+    def _ok_former_names(self, row):
+        return (self._date_ok(row['start_date']) and self._date_ok(row['end_date'])
+                and row['start_date'] <= row['end_date'])
+
+    def _explain_former_names(self, row, problems):
+        for field in ('start_date', 'end_date'):
+            if not self._date_ok(row[field]):
+                problems.append(('error', f"invalid {field} {row[field]!r}"))
+        if not problems and row['start_date'] > row['end_date']:
+            problems.append(('error', 'start_date is after end_date'))
+
+    def _match_ok(self, row):
+        # Only kept results rows are in matches, so both teams are known
+        return match_key(row) in self.matches
+
+    def _explain_match(self, row, problems):
+        for side in ('home_team', 'away_team'):
+            if row[side] not in self.teams:
+                problems.append(('warning', f"unknown team {row[side]!r}"))
+        if match_key(row) not in self.matches:
+            problems.append(('warning', 'no matching row in results.csv'))
+
+    def finish(self):
+        """Compare goal rows per match against the final score."""
+        self.score_issues = []
+        for key, counts in self.goal_rows.items():
+            result = self.matches.get(key)
+            if result is None:
+                continue
+            for side, listed in zip(('home', 'away'), counts):
+                final = int(result[f'{side}_score'])
+                if listed > final:
+                    self.score_issues.append({
+                        'file': 'goalscorers.csv', 'line': None, 'severity': 'warning',
+                        'reason': f"{listed} {side} goal rows but the final score has {final}",
+                        'row': dict(zip(('date', 'home_team', 'away_team'), key))})
+
+    def summary(self):
+        severities = {}
+        for issue in self.issues:
+            severities[issue['severity']] = severities.get(issue['severity'], 0) + 1
+        return {'rows': self.rows, 'rejected': self.rejected, 'issues': severities,
+                'missing_minutes': self.missing_minutes}
+
+    def write_quarantine(self, path):
+        """Write every flagged row with its reason as CSV."""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['file', 'line', 'severity', 'reason', 'row'])
+            for issue in self.issues:
+                writer.writerow([issue['file'], issue['line'] or '', issue['severity'],
+                                 issue['reason'], json.dumps(issue['row'], ensure_ascii=False)])
+
+    def print_summary(self):
+        counts = self.summary()
+        parts = [f"{self.rows[name] - self.rejected[name]}/{self.rows[name]} {name}"
+                 for name in self.rows]
+        print(f"Validated: {', '.join(parts)} kept; "
+              f"{counts['issues'].get('error', 0)} errors, {counts['issues'].get('warning', 0)} warnings, "
+              f"{self.missing_minutes} goals without a minute")
+
+def read_csv_to_json(filepath, validator=None):
+    """Read CSV file and return as list of dicts, validating rows as they stream in."""
     with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        return list(reader)
-
-def main():
-    base_path = Path(__file__).parent / 'Dataset'
-
-    # Read all datasets
-    print("Reading datasets...")
-    results = read_csv_to_json(base_path / 'results.csv')
-    goalscorers = read_csv_to_json(base_path / 'goalscorers.csv')
-    shootouts = read_csv_to_json(base_path / 'shootouts.csv')
-    former_names = read_csv_to_json(base_path / 'former_names.csv')
-
-    print(f"Loaded: {len(results)} results, {len(goalscorers)} goals, {len(shootouts)} shootouts")
-
-    # Convert to JSON strings for embedding
-    results_json = json.dumps(results)
-    goalscorers_json = json.dumps(goalscorers)
-    shootouts_json = json.dumps(shootouts)
-    former_names_json = json.dumps(former_names)
-
-    html_content = f'''<!DOCTYPE html>
+        if validator is None:
+            return list(csv.DictReader(f))
+        # csv.reader + zip is cheaper than DictReader; the difference
+        # covers most of the validation cost
+        reader = csv.reader(f)
+        header = next(reader)
+        return validator.read(Path(filepath).stem, reader, header)
+
+def load_datasets(base_path, profiler=NO_PROFILE, validator=None, datasets=None, names=None):
+    """Read all four CSV files into a dict of row lists.
+
+    Given the datasets of an earlier load and the validator that checked
+    them, only the files in names are read again, plus the match-checked
+    files when the kept matches changed; the rest are reused.
+    """
+    datasets = dict(datasets or {})
+    order = ('results', 'goalscorers', 'shootouts', 'former_names')
+    names = set(order if names is None else names)
+    for name in order:
+        if name not in names:
+            continue
+        previous_matches = set(validator.matches) if name == 'results' and validator is not None else None
+        with profiler.stage(f'read_csv_to_json {name}'):
+            datasets[name] = read_csv_to_json(base_path / f'{name}.csv', validator)
+        if previous_matches is not None and previous_matches != validator.matches.keys():
+            names.update(DatasetValidator.MATCH_CHECKED)
+    if validator is not None:
+        validator.finish()
+    return datasets
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def date_columns(rows):
+    """Split ISO dates into epoch-day, year, 0-based month and JS weekday columns."""
+    columns = {'day': [], 'year': [], 'month': [], 'dow': []}
+    parsed = {}
+    for row in rows:
+        value = row['date']
+        fields = parsed.get(value)
+        if fields is None:
+            d = date.fromisoformat(value)
+            fields = parsed[value] = (d.toordinal() - EPOCH_ORDINAL, d.year,
+                                      d.month - 1, d.isoweekday() % 7)
+        columns['day'].append(fields[0])
+        columns['year'].append(fields[1])
+        columns['month'].append(fields[2])
+        columns['dow'].append(fields[3])
+    return columns
+
+def epoch_day(value):
+    """Days since 1970-01-01 for an ISO date string."""
+    return date.fromisoformat(value).toordinal() - EPOCH_ORDINAL
+
+def parse_flag(value):
+    """CSV booleans are written TRUE/FALSE; accept any casing."""
+    return value.strip().lower() == 'true'
+
+def without_dates(rows):
+    """Copy rows without their date string, which travels as columns instead."""
+    return [{k: v for k, v in row.items() if k != 'date'} for row in rows]
+
+def result_rows_for_embedding(results):
+    """Copy result rows without their date and with integer scores."""
+    rows = without_dates(results)
+    for row in rows:
+        row['home_score'] = int(row['home_score'])
+        row['away_score'] = int(row['away_score'])
+    return rows
+
+GOAL_ROW_TEAM_FIELDS = ('home_team', 'away_team', 'team')
+
+def goal_rows_for_embedding(goalscorers, scorer_ids, team_names):
+    """Copy goal rows with scorer and team names swapped for interned ids.
+
+    Team ids index the scorer table's teamNames: home_team becomes
+    home_team_id, and so on. Minutes become integers (null when not
+    recorded) and own_goal/penalty booleans.
+    """
+    team_ids = {team: i for i, team in enumerate(team_names)}
+    rows = []
+    for row, scorer_id in zip(goalscorers, scorer_ids):
+        embedded = {k: v for k, v in row.items() if k not in ('date', 'scorer') + GOAL_ROW_TEAM_FIELDS}
+        embedded['scorer_id'] = scorer_id
+        embedded['minute'] = None if row['minute'] == 'NA' else int(row['minute'])
+        embedded['own_goal'] = row['own_goal'] == 'TRUE'
+        embedded['penalty'] = row['penalty'] == 'TRUE'
+        for field in GOAL_ROW_TEAM_FIELDS:
+            embedded[f'{field}_id'] = team_ids[row[field]]
+        rows.append(embedded)
+    return rows
+
+DATE_COLUMN_TYPES = {'day': 'Int32Array', 'year': 'Int16Array', 'month': 'Uint8Array', 'dow': 'Uint8Array'}
+SCORER_COLUMN_TYPES = {'teamOffsets': 'Int32Array', 'teamIds': 'Int16Array',
+                       'goals': 'Int32Array', 'penalties': 'Int32Array', 'ownGoals': 'Int32Array',
+                       'firstDay': 'Int32Array', 'lastDay': 'Int32Array'}
+
+# Packed column codecs; the first payload byte names the one used
+PACK_VARINT, PACK_DELTA, PACK_RLE, PACK_BITS, PACK_FLOAT = range(5)
+PACK_MAX_BITS = 24
+
+def zigzag(n):
+    """Map signed integers to unsigned so small magnitudes stay small."""
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+def write_varints(numbers, out):
+    """Append unsigned integers to out as LEB128 varints."""
+    for n in numbers:
+        while n >= 0x80:
+            out.append(n & 0x7f | 0x80)
+            n >>= 7
+        out.append(n)
+    return out
+
+def pack_column(values, array_type):
+    """Base64 of a typed column in the smallest of the packed codecs.
+
+    Every payload is [codec][varint count][body]. Integer columns try
+    zigzag varints of the values (PACK_VARINT), of the differences between
+    neighbours (PACK_DELTA, for sorted columns), (value, run length) pairs
+    (PACK_RLE, for flags and long runs), and a fixed bit width above the
+    minimum (PACK_BITS). Float columns travel as little-endian bytes.
+    """
+    header = write_varints([len(values)], bytearray())
+    if array_type.startswith('Float'):
+        fmt = 'f' if array_type == 'Float32Array' else 'd'
+        return base64.b64encode(bytes([PACK_FLOAT]) + header + struct.pack(f'<{len(values)}{fmt}', *values)).decode()
+
+    values = list(values)
+    candidates = [write_varints(map(zigzag, values), bytearray([PACK_VARINT]) + header),
+                  write_varints((zigzag(value - previous) for previous, value in zip([0] + values, values)),
+                                bytearray([PACK_DELTA]) + header)]
+
+    runs = []
+    for value in values:
+        if runs and runs[-1][0] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([value, 1])
+    candidates.append(write_varints((n for value, length in runs for n in (zigzag(value), length)),
+                                    bytearray([PACK_RLE]) + header))
+
+    low = min(values, default=0)
+    width = (max(values, default=0) - low).bit_length()
+    if width <= PACK_MAX_BITS:
+        bits = write_varints([zigzag(low)], bytearray([PACK_BITS]) + header)
+        bits.append(width)
+        if width:
+            buffer = filled = 0
+            for value in values:
+                buffer |= (value - low) << filled
+                filled += width
+                while filled >= 8:
+                    bits.append(buffer & 0xff)
+                    buffer >>= 8
+                    filled -= 8
+            if filled:
+                bits.append(buffer)
+        candidates.append(bits)
+    return base64.b64encode(min(candidates, key=len)).decode()
+
+def typed_columns_js(columns, types=DATE_COLUMN_TYPES, packed=False):
+    """Render columns as a JS object literal; typed columns become typed arrays.
+
+    With packed, typed columns are pack_column payloads that the page's
+    unpackColumn() expands on load.
+    """
+    fields = []
+    for name, values in columns.items():
+        if name in types and packed:
+            fields.append(f"{name}: unpackColumn({types[name]}, '{pack_column(values, types[name])}')")
+        elif name in types:
+            fields.append(f"{name}: new {types[name]}({json.dumps(values)})")
+        else:
+            fields.append(f"{name}: {json.dumps(values)}")
+    return '{' + ', '.join(fields) + '}'
+
+def build_scorer_table(goalscorers):
+    """Intern scorer names and aggregate per-scorer goal statistics.
+
+    Ids are assigned by descending goal count (ties by name), so the top-k
+    scorers are ids 0..k-1. teamNames interns every team named in a goal
+    row; scorer i's teams are teamIds[teamOffsets[i]:teamOffsets[i + 1]],
+    main team first. Returns the table columns and each goal row's id.
+    """
+    stats = {}
+    for row in goalscorers:
+        name = row['scorer']
+        entry = stats.get(name)
+        if entry is None:
+            entry = stats[name] = {'goals': 0, 'penalties': 0, 'own_goals': 0, 'teams': {},
+                                   'first': row['date'], 'last': row['date']}
+        entry['goals'] += 1
+        if parse_flag(row['own_goal']):
+            entry['own_goals'] += 1
+            # An own goal is credited to the opponent of the scorer's side
+            team = row['away_team'] if row['team'] == row['home_team'] else row['home_team']
+        else:
+            team = row['team']
+            if parse_flag(row['penalty']):
+                entry['penalties'] += 1
+        entry['teams'][team] = entry['teams'].get(team, 0) + 1
+        entry['first'] = min(entry['first'], row['date'])
+        entry['last'] = max(entry['last'], row['date'])
+
+    ranked = sorted(stats, key=lambda name: (-stats[name]['goals'], name))
+    ids = {name: i for i, name in enumerate(ranked)}
+    team_names = sorted({row[field] for row in goalscorers for field in GOAL_ROW_TEAM_FIELDS})
+    team_ids = {team: i for i, team in enumerate(team_names)}
+
+    table = {'name': ranked, 'teamNames': team_names, 'teamOffsets': [0], 'teamIds': [],
+             'goals': [], 'penalties': [], 'ownGoals': [], 'firstDay': [], 'lastDay': []}
+    for name in ranked:
+        entry = stats[name]
+        # Main team first for scorers registered under several sides
+        teams = sorted(entry['teams'], key=lambda team: -entry['teams'][team])
+        table['teamIds'].extend(team_ids[team] for team in teams)
+        table['teamOffsets'].append(len(table['teamIds']))
+        table['goals'].append(entry['goals'])
+        table['penalties'].append(entry['penalties'])
+        table['ownGoals'].append(entry['own_goals'])
+        table['firstDay'].append(epoch_day(entry['first']))
+        table['lastDay'].append(epoch_day(entry['last']))
+    return table, [ids[row['scorer']] for row in goalscorers]
+
+def goal_tournaments(results, goalscorers):
+    """Tournament of each goal row, joined on (date, home, away); None if unmatched."""
+    tournament_of = {match_key(row): row['tournament'] for row in results}
+    return [tournament_of.get(match_key(row)) for row in goalscorers]
+
+class ScorerLeaderboard:
+    """Top-k scorers for any year range and tournament filter.
+
+    Goals are bucketed by (tournament, year), plus an all-tournament bucket per
+    year. Each bucket keeps its scorers sorted by goal count. A query merges
+    the buckets in range with the threshold algorithm: walk every list in
+    descending order through a heap, look up each newly seen scorer's exact
+    total by random access, and stop once the k-th best total reaches the sum
+    of the remaining list heads. Goal rows are never rescanned.
+    """
+
+    def __init__(self, goalscorers, scorer_ids, tournaments):
+        counts = {}
+        for row, scorer_id, tournament in zip(goalscorers, scorer_ids, tournaments):
+            year = int(row['date'][:4])
+            keys = [(None, year)] if tournament is None else [(None, year), (tournament, year)]
+            for key in keys:
+                bucket = counts.setdefault(key, {})
+                bucket[scorer_id] = bucket.get(scorer_id, 0) + 1
+        self.buckets = {}
+        for key, bucket in counts.items():
+            ranked = sorted(bucket.items(), key=lambda item: (-item[1], item[0]))
+            self.buckets[key] = (ranked, bucket)
+        self.tournaments = sorted({t for t, _ in self.buckets if t is not None})
+
+    def _lists(self, start_year, end_year, tournaments):
+        selected = []
+        for (tournament, year), bucket in self.buckets.items():
+            if start_year is not None and year < start_year:
+                continue
+            if end_year is not None and year > end_year:
+                continue
+            if tournaments is None:
+                if tournament is None:
+                    selected.append(bucket)
+            elif tournament in tournaments:
+                selected.append(bucket)
+        return selected
+
+    def top(self, k, start_year=None, end_year=None, tournaments=None):
+        """Return [(scorer_id, goals)] for the k best scorers in the window.
+
+        Ties at the cut-off are not ordered; everything above it is exact.
+        """
+        if k <= 0:
+            return []
+        if tournaments is not None:
+            tournaments = set(tournaments)
+        lists = self._lists(start_year, end_year, tournaments)
+        heap = [(-ranked[0][1], i, 0) for i, (ranked, _) in enumerate(lists)]
+        heapq.heapify(heap)
+        threshold = sum(ranked[0][1] for ranked, _ in lists)
+        seen = set()
+        best = []  # min-heap of (total, -scorer_id)
+        while heap:
+            if len(best) == k and best[0][0] >= threshold:
+                break
+            _, i, pos = heapq.heappop(heap)
+            ranked = lists[i][0]
+            scorer_id, count = ranked[pos]
+            threshold -= count
+            if pos + 1 < len(ranked):
+                threshold += ranked[pos + 1][1]
+                heapq.heappush(heap, (-ranked[pos + 1][1], i, pos + 1))
+            if scorer_id in seen:
+                continue
+            seen.add(scorer_id)
+            total = sum(lookup.get(scorer_id, 0) for _, lookup in lists)
+            if len(best) < k:
+                heapq.heappush(best, (total, -scorer_id))
+            elif (total, -scorer_id) > best[0]:
+                heapq.heapreplace(best, (total, -scorer_id))
+        return [(-neg_id, total) for total, neg_id in sorted(best, reverse=True)]
+
+    def to_columns(self):
+        """Flatten the buckets into CSR columns for embedding in the page."""
+        tournament_ids = {t: i for i, t in enumerate(self.tournaments)}
+        columns = {'tournaments': self.tournaments, 'bucketTournament': [], 'bucketYear': [],
+                   'offsets': [0], 'ids': [], 'counts': []}
+        for (tournament, year), (ranked, _) in sorted(
+                self.buckets.items(), key=lambda item: (item[0][0] is not None, item[0][0] or '', item[0][1])):
+            columns['bucketTournament'].append(-1 if tournament is None else tournament_ids[tournament])
+            columns['bucketYear'].append(year)
+            for scorer_id, count in ranked:
+                columns['ids'].append(scorer_id)
+                columns['counts'].append(count)
+            columns['offsets'].append(len(columns['ids']))
+        return columns
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch with size bounded by roughly 3k items.
+
+    Level h holds items of weight 2**h. When the sketch is full, the first
+    over-capacity level is sorted and every other item (random offset)
+    is promoted to the next level, halving it while keeping rank error
+    near 1/k regardless of how many items were seen.
+    """
+
+    def __init__(self, k=64, rng=None):
+        self.k = k
+        self.rng = rng or random.Random(0)
+        self.levels = [[]]
+        self.size = 0
+        self.count = 0
+        self.max_size = self._max_size()
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(self.k * (2 / 3) ** depth) + 1)
+
+    def _max_size(self):
+        return sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def update(self, value):
+        self.levels[0].append(value)
+        self.size += 1
+        self.count += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        self.max_size = self._max_size()
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.size += other.size
+        self.count += other.count
+        while self.size >= self.max_size:
+            self._compress()
+        return self
+
+    def _compress(self):
+        for level, items in enumerate(self.levels):
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                    self.max_size = self._max_size()
+                items.sort()
+                offset = self.rng.randint(0, 1)
+                leftover = [items.pop()] if len(items) % 2 else []
+                self.levels[level + 1].extend(items[offset::2])
+                self.levels[level] = leftover
+                self.size = sum(len(items) for items in self.levels)
+                if self.size < self.max_size:
+                    break
+
+    def quantiles(self, qs):
+        """Approximate values at each rank fraction in qs."""
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.levels)
+                          for value in items)
+        total = sum(weight for _, weight in weighted)
+        answers = []
+        for q in qs:
+            target, seen = q * total, 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    answers.append(value)
+                    break
+            else:
+                answers.append(None)
+        return answers
+
+def build_minute_sketches(goalscorers, tournaments, k=64):
+    """One streaming pass filling goal-minute sketches per tournament, decade and team."""
+    rng = random.Random(0)
+    sketches = {'tournament': {}, 'decade': {}, 'team': {}}
+    for row, tournament in zip(goalscorers, tournaments):
+        minute = row['minute']
+        if not minute.isdigit():
+            continue
+        minute = int(minute)
+        groups = (('decade', int(row['date'][:3]) * 10), ('team', row['team']), ('tournament', tournament))
+        for kind, key in groups:
+            if key is None:
+                continue
+            sketch = sketches[kind].get(key)
+            if sketch is None:
+                sketch = sketches[kind][key] = KLLSketch(k, rng)
+            sketch.update(minute)
+    return sketches
+
+def sketches_for_embedding(sketches):
+    """Keep only the level lists; JS merges them by concatenating weighted items."""
+    return {kind: {str(key): [sorted(items) for items in sketch.levels]
+                   for key, sketch in groups.items()}
+            for kind, groups in sketches.items()}
+
+def csr_groups(keys_per_row, names=None):
+    """Group row positions by key into CSR columns (names, offsets, rows).
+
+    keys_per_row yields the keys of each row; positions within a group stay
+    in row order, so date-sorted rows give date-sorted groups. Pass names to
+    fix the group order (keys outside it are dropped).
+    """
+    groups = {}
+    for position, keys in enumerate(keys_per_row):
+        for key in keys:
+            groups.setdefault(key, []).append(position)
+    if names is None:
+        names = sorted(groups)
+    offsets, rows = [0], []
+    for name in names:
+        rows.extend(groups.get(name, ()))
+        offsets.append(len(rows))
+    return names, offsets, rows
+
+def build_match_index(results):
+    """Sorted per-team and per-tournament position lists for the match browser."""
+    teams, team_offsets, team_rows = csr_groups(
+        (row['home_team'], row['away_team']) for row in results)
+    tournaments, tournament_offsets, tournament_rows = csr_groups(
+        (row['tournament'],) for row in results)
+    return {'teams': teams, 'teamOffsets': team_offsets, 'teamRows': team_rows,
+            'tournaments': tournaments, 'tournamentOffsets': tournament_offsets,
+            'tournamentRows': tournament_rows}
+
+def build_goal_index(teams, goalscorers):
+    """goalscorersData positions grouped by the team credited with the goal.
+
+    Groups use the match index's team ids. Kept apart from the match index so
+    the team-only nodes built on that do not depend on goalscorers.
+    """
+    _, offsets, rows = csr_groups(((row['team'],) for row in goalscorers), teams)
+    return {'offsets': offsets, 'rows': rows}
+
+PYRAMID_LEVELS = ('day', 'week', 'month', 'year', 'decade')
+
+def pyramid_bucket(level, day, year, month):
+    """Bucket number of a match at one pyramid level.
+
+    Weeks start on Monday: epoch day 0 was a Thursday, so day + 3 counts
+    from Monday 1969-12-29. Months count from year 0 so they stay dense.
+    """
+    if level == 'day':
+        return day
+    if level == 'week':
+        return (day + 3) // 7
+    if level == 'month':
+        return year * 12 + month
+    if level == 'year':
+        return year
+    return year // 10
+
+def build_time_pyramid(results, dates):
+    """Dense match, goal and home-win counts at day/week/month/year/decade resolution.
+
+    Each level is {origin, matches, goals, homeWins}, with index i covering
+    bucket origin + i. Averages and rates are ratios of these counts, so the
+    page derives them for the visible buckets only.
+    """
+    pyramid = {}
+    for level in PYRAMID_LEVELS:
+        buckets = [pyramid_bucket(level, day, year, month)
+                   for day, year, month in zip(dates['day'], dates['year'], dates['month'])]
+        origin = min(buckets, default=0)
+        size = max(buckets, default=-1) - origin + 1
+        columns = {'origin': origin, 'matches': [0] * size, 'goals': [0] * size, 'homeWins': [0] * size}
+        for row, bucket in zip(results, buckets):
+            i = bucket - origin
+            home, away = int(row['home_score']), int(row['away_score'])
+            columns['matches'][i] += 1
+            columns['goals'][i] += home + away
+            if home > away:
+                columns['homeWins'][i] += 1
+        pyramid[level] = columns
+    return pyramid
+
+PYRAMID_COLUMN_TYPES = {'matches': 'Uint32Array', 'goals': 'Uint32Array', 'homeWins': 'Uint32Array'}
+
+# Levels the zoomed-out first paint can use; the day and week levels hold
+# nearly all the buckets and follow in timePyramidFine
+PYRAMID_COARSE_LEVELS = ('month', 'year', 'decade')
+PYRAMID_FINE_LEVELS = ('day', 'week')
+
+def time_pyramid_js(pyramid, packed=False, levels=PYRAMID_LEVELS):
+    """Render pyramid levels as a JS object with one typed-array block per level.
+
+    firstDay and lastDay (one past the last match day) come along, so the
+    page knows the full span without the day level.
+    """
+    day = pyramid['day']
+    fields = [f"firstDay: {day['origin']}", f"lastDay: {day['origin'] + len(day['matches'])}"]
+    fields.extend(f"{level}: {typed_columns_js(pyramid[level], PYRAMID_COLUMN_TYPES, packed)}" for level in levels)
+    return '{' + ', '.join(fields) + '}'
+
+LINE_POINTS = 1000
+
+def lttb(xs, ys, threshold):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps from an x-sorted line.
+
+    The first and last points always stay; every bucket in between keeps
+    the point forming the largest triangle with the previous pick and the
+    next bucket's average, so peaks and troughs survive the cut.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    picked = [0]
+    a = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        avg_x = sum(xs[end:next_end]) / (next_end - end)
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (ys[i] - ay) - (ax - xs[i]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        picked.append(best)
+        a = best
+    picked.append(n - 1)
+    return picked
+
+def downsample_line(xs, ys, max_points=LINE_POINTS):
+    """Cap a line at max_points with LTTB (0 keeps every point)."""
+    keep = lttb(xs, ys, max_points) if max_points else range(len(xs))
+    return {'x': [xs[i] for i in keep], 'y': [ys[i] for i in keep]}
+
+def build_line_series(year_level, max_points=LINE_POINTS):
+    """Goals per year and goals per match from 1900, from the pyramid's year level."""
+    years, goals, averages = [], [], []
+    for i, (matches, total) in enumerate(zip(year_level['matches'], year_level['goals'])):
+        year = year_level['origin'] + i
+        if matches and year >= 1900:
+            years.append(year)
+            goals.append(total)
+            averages.append(round(total / matches, 3))
+    return {'goalsByYear': downsample_line(years, goals, max_points),
+            'avgGoalsByYear': downsample_line(years, averages, max_points)}
+
+LINE_SERIES_COLUMN_TYPES = {'x': 'Int32Array', 'y': 'Float64Array'}
+
+def line_series_js(series, packed=False):
+    """Render each downsampled line as a JS object of typed x/y columns."""
+    lines = ', '.join(f"{name}: {typed_columns_js(columns, LINE_SERIES_COLUMN_TYPES, packed)}"
+                      for name, columns in series.items())
+    return '{' + lines + '}'
+
+# (kind, size): the last `size` matches, or the matches in the last `size` days
+FORM_WINDOWS = (('matches', 10), ('days', 365))
+
+def form_window_key(kind, size):
+    """Column prefix of a form window, e.g. m10 or d365."""
+    return f"{kind[0]}{size}"
+
+def match_outcome(row, team):
+    """(points, goal difference, won) of one match from team's side."""
+    home, away = int(row['home_score']), int(row['away_score'])
+    difference = home - away if row['home_team'] == team else away - home
+    return (3 if difference > 0 else 1 if difference == 0 else 0), difference, int(difference > 0)
+
+def build_team_form(results, days, match_index, windows=FORM_WINDOWS):
+    """Rolling points, goal difference and wins after every match of every team.
+
+    Walks each team's date-sorted matches (matchIndex.teamRows) once. Every
+    window keeps a deque of the matches inside it plus running sums, so all
+    windows advance together in O(1) amortised per match. Columns line up
+    with teamRows; day windows also record how many matches they hold.
+    """
+    keys = [form_window_key(kind, size) for kind, size in windows]
+    columns = {'windows': [{'key': key, 'kind': kind, 'size': size}
+                           for key, (kind, size) in zip(keys, windows)]}
+    for key, (kind, _) in zip(keys, windows):
+        for stat in ('Points', 'GoalDiff', 'Wins') + (('Played',) if kind == 'days' else ()):
+            columns[key + stat] = []
+
+    offsets, rows = match_index['teamOffsets'], match_index['teamRows']
+    for team_id, team in enumerate(match_index['teams']):
+        states = [(kind, size, deque(), [0, 0, 0], columns[key + 'Points'], columns[key + 'GoalDiff'],
+                   columns[key + 'Wins'], columns.get(key + 'Played'))
+                  for key, (kind, size) in zip(keys, windows)]
+        for position in rows[offsets[team_id]:offsets[team_id + 1]]:
+            day = days[position]
+            points, difference, won = match_outcome(results[position], team)
+            for kind, size, window, sums, points_col, diff_col, wins_col, played_col in states:
+                window.append((day, points, difference, won))
+                sums[0] += points
+                sums[1] += difference
+                sums[2] += won
+                while len(window) > size if kind == 'matches' else window[0][0] <= day - size:
+                    _, old_points, old_difference, old_won = window.popleft()
+                    sums[0] -= old_points
+                    sums[1] -= old_difference
+                    sums[2] -= old_won
+                points_col.append(sums[0])
+                diff_col.append(sums[1])
+                wins_col.append(sums[2])
+                if played_col is not None:
+                    played_col.append(len(window))
+    return columns
+
+def team_form_column_types(windows=FORM_WINDOWS):
+    """Typed-array types for the build_team_form columns."""
+    types = {}
+    for kind, size in windows:
+        key = form_window_key(kind, size)
+        types.update({key + 'Points': 'Int16Array', key + 'GoalDiff': 'Int16Array',
+                      key + 'Wins': 'Int16Array', key + 'Played': 'Int16Array'})
+    return types
+
+STREAK_KINDS = ('win', 'unbeaten', 'losing', 'scoring')
+STREAK_TOP = 15
+
+def streak_flags(scored, conceded):
+    """Whether a match continues each STREAK_KINDS run."""
+    return (scored > conceded, scored >= conceded, scored < conceded, scored > 0)
+
+class StreakState:
+    """One team's runs of one STREAK_KINDS kind."""
+
+    __slots__ = ('length', 'start', 'last', 'decade', 'decade_length', 'decade_start',
+                 'best_length', 'best_start', 'best_end', 'decade_best')
+
+    def __init__(self, day=0):
+        # Current run
+        self.length = 0
+        self.start = self.last = day
+        # Current run's part inside decade
+        self.decade = None
+        self.decade_length = 0
+        self.decade_start = day
+        # Longest run, and decade -> (length, start, end) of each decade's longest
+        self.best_length = 0
+        self.best_start = self.best_end = day
+        self.decade_best = {}
+
+class StreakTracker:
+    """Longest and current win/unbeaten/losing/scoring runs for every team.
+
+    Feed matches in date order with add_match(). All state is per team and
+    kind, so matches appended later extend the same runs without a recount.
+    A run's decade record only counts matches inside that decade.
+    """
+
+    def __init__(self):
+        # team -> one StreakState per kind
+        self.teams = {}
+        self.last_day = {}
+
+    def add_match(self, row, day, year):
+        """Update both sides' runs with one result row."""
+        home, away = int(row['home_score']), int(row['away_score'])
+        self.add(row['home_team'], day, year, home, away)
+        self.add(row['away_team'], day, year, away, home)
+
+    def add(self, team, day, year, scored, conceded):
+        """Update one team's runs with a match it played."""
+        states = self.teams.get(team)
+        if states is None:
+            states = self.teams[team] = [StreakState(day) for _ in STREAK_KINDS]
+        self.last_day[team] = day
+        decade = year // 10 * 10
+        for state, continues in zip(states, streak_flags(scored, conceded)):
+            if not continues:
+                state.length = state.decade_length = 0
+                state.decade = decade
+                continue
+            if state.length == 0:
+                state.start = day
+            state.length += 1
+            state.last = day
+            if state.decade != decade or state.decade_length == 0:
+                state.decade, state.decade_length, state.decade_start = decade, 0, day
+            state.decade_length += 1
+            if state.length > state.best_length:
+                state.best_length, state.best_start, state.best_end = state.length, state.start, day
+            best = state.decade_best.get(decade)
+            if best is None or state.decade_length > best[0]:
+                state.decade_best[decade] = (state.decade_length, state.decade_start, day)
+
+    def records(self, team):
+        """{kind: {best, current, decades}} with (length, start day, end day) runs."""
+        return {kind: {'best': (state.best_length, state.best_start, state.best_end),
+                       'current': (state.length, state.start, state.last) if state.length else (0, None, None),
+                       'decades': dict(sorted(state.decade_best.items()))}
+                for kind, state in zip(STREAK_KINDS, self.teams[team])}
+
+    def to_columns(self, teams, top=STREAK_TOP):
+        """Per-team best/current runs aligned with teams, plus each decade's top runs."""
+        columns = {'kinds': list(STREAK_KINDS), 'lastDay': [self.last_day.get(team, 0) for team in teams]}
+        decade_columns = {'decadeKind': [], 'decadeTeam': [], 'decadeDecade': [],
+                          'decadeLength': [], 'decadeStart': [], 'decadeEnd': []}
+        for k, kind in enumerate(STREAK_KINDS):
+            empty = StreakState()
+            states = [self.teams[team][k] if team in self.teams else empty for team in teams]
+            columns[kind + 'Best'] = [state.best_length for state in states]
+            columns[kind + 'BestStart'] = [state.best_start for state in states]
+            columns[kind + 'BestEnd'] = [state.best_end for state in states]
+            columns[kind + 'Current'] = [state.length for state in states]
+            columns[kind + 'CurrentStart'] = [state.start if state.length else 0 for state in states]
+            by_decade = {}
+            for team_id, state in enumerate(states):
+                for decade, run in state.decade_best.items():
+                    by_decade.setdefault(decade, []).append((run[0], team_id, run[1], run[2]))
+            for decade in sorted(by_decade):
+                for length, team_id, start, end in heapq.nlargest(top, by_decade[decade],
+                                                                  key=lambda run: (run[0], -run[1])):
+                    decade_columns['decadeKind'].append(k)
+                    decade_columns['decadeTeam'].append(team_id)
+                    decade_columns['decadeDecade'].append(decade)
+                    decade_columns['decadeLength'].append(length)
+                    decade_columns['decadeStart'].append(start)
+                    decade_columns['decadeEnd'].append(end)
+        columns.update(decade_columns)
+        return columns
+
+def build_streaks(results, dates, tracker=None):
+    """Run date-sorted results through a (new or existing) StreakTracker."""
+    tracker = tracker or StreakTracker()
+    for row, day, year in zip(results, dates['day'], dates['year']):
+        tracker.add_match(row, day, year)
+    return tracker
+
+def streak_column_types():
+    """Typed-array types for StreakTracker.to_columns."""
+    types = {'lastDay': 'Int32Array', 'decadeKind': 'Uint8Array', 'decadeTeam': 'Int16Array',
+             'decadeDecade': 'Int16Array', 'decadeLength': 'Int16Array',
+             'decadeStart': 'Int32Array', 'decadeEnd': 'Int32Array'}
+    for kind in STREAK_KINDS:
+        types.update({kind + 'Best': 'Int16Array', kind + 'BestStart': 'Int32Array',
+                      kind + 'BestEnd': 'Int32Array', kind + 'Current': 'Int16Array',
+                      kind + 'CurrentStart': 'Int32Array'})
+    return types
+
+# Letters NFKD does not decompose into a base letter plus accents
+FOLD_LETTERS = {'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd',
+                'þ': 'th', 'ı': 'i', 'ə': 'e'}
+
+def fold_name(name):
+    """Lowercase and strip diacritics so 'José' and 'jose' share a search key.
+
+    Drops every mark (category M), the same rule as foldName's /\\p{M}/ in
+    the page, so queries fold to the keys built here.
+    """
+    decomposed = unicodedata.normalize('NFKD', name.lower())
+    return ''.join(FOLD_LETTERS.get(c, c) for c in decomposed if not unicodedata.category(c).startswith('M'))
+
+SEARCH_KIND_TEAM, SEARCH_KIND_SCORER, SEARCH_KIND_FORMER = 0, 1, 2
+
+# Hits the search box shows, and the longest prefix whose ranked hits are
+# precomputed instead of scanned for
+SEARCH_HIT_LIMIT = 8
+SEARCH_SHORT_PREFIX = 2
+
+def search_rank(ref):
+    """Teams and former names first, then scorers by goal rank (lower id = more goals)."""
+    return ((ref & 3) == SEARCH_KIND_SCORER, ref >> 2, ref & 3)
+
+def utf16_length(text):
+    """Length of text in UTF-16 code units, as JS counts it."""
+    return len(text) + sum(ord(c) > 0xFFFF for c in text)
+
+def build_search_index(teams, scorers, former_names):
+    """Front-coded sorted prefix index over team, scorer and former team names.
+
+    Every word start of a folded name becomes a key ('lionel messi' and
+    'messi'), so type-ahead matches surnames too. Each key carries a ref of
+    id * 4 + kind pointing at the team (match index id), scorer (scorer
+    table id) or former_names row it came from. Keys are sorted and
+    front-coded in UTF-16 code units, as the page's string comparisons and
+    slice() count them: each stores how many leading units it shares with
+    the previous key. shortHits maps every prefix of up to
+    SEARCH_SHORT_PREFIX characters to its first SEARCH_HIT_LIMIT refs in
+    search_rank order, so the shortest queries, which match the most keys,
+    are a lookup.
+    """
+    entries = set()
+    sources = [(SEARCH_KIND_TEAM, teams), (SEARCH_KIND_SCORER, scorers),
+               (SEARCH_KIND_FORMER, [row['former'] for row in former_names])]
+    for kind, names in sources:
+        for i, name in enumerate(names):
+            words = fold_name(name).split()
+            for start in range(len(words)):
+                entries.add((' '.join(words[start:]), i * 4 + kind))
+    short = {}
+    for key, ref in entries:
+        for length in range(1, min(len(key), SEARCH_SHORT_PREFIX) + 1):
+            short.setdefault(key[:length], set()).add(ref)
+    index = {'shared': [], 'suffixes': [], 'refs': [],
+             'shortHits': {prefix: sorted(refs, key=search_rank)[:SEARCH_HIT_LIMIT]
+                           for prefix, refs in sorted(short.items())}}
+    previous = ''
+    for key, ref in sorted(entries, key=lambda entry: (entry[0].encode('utf-16-be'), entry[1])):
+        shared = 0
+        limit = min(len(key), len(previous))
+        while shared < limit and key[shared] == previous[shared]:
+            shared += 1
+        while utf16_length(key[:shared]) > 255:
+            shared -= 1
+        index['shared'].append(utf16_length(key[:shared]))
+        index['suffixes'].append(key[shared:])
+        index['refs'].append(ref)
+        previous = key
+    index['suffixes'] = '\n'.join(index['suffixes'])
+    return index
+
+SEARCH_INDEX_COLUMN_TYPES = {'shared': 'Uint8Array', 'refs': 'Int32Array'}
+
+MATCH_INDEX_COLUMN_TYPES = {'teamOffsets': 'Int32Array', 'teamRows': 'Int32Array',
+                            'tournamentOffsets': 'Int32Array', 'tournamentRows': 'Int32Array'}
+GOAL_INDEX_COLUMN_TYPES = {'offsets': 'Int32Array', 'rows': 'Int32Array'}
+
+LEADERBOARD_COLUMN_TYPES = {'bucketTournament': 'Int16Array', 'bucketYear': 'Int16Array',
+                            'offsets': 'Int32Array', 'ids': 'Int32Array', 'counts': 'Uint16Array'}
+
+def match_key(row):
+    """Key shared by results, goalscorers and shootouts rows of one match."""
+    return (row['date'], row['home_team'], row['away_team'])
+
+GOAL_ENCODINGS = ('rows', 'nested')
+GOAL_FLAG_BITS = {'penalty': 1, 'ownGoal': 2, 'away': 4}
+
+def build_match_goals(results, goalscorers, scorer_ids):
+    """Goal events nested under their results row, in CSR form.
+
+    The goals of match i are offsets[i]..offsets[i + 1] - 1 of the flat
+    scorer, minute (0 when unknown) and flags columns. flags packs
+    GOAL_FLAG_BITS, with 'away' set when the goal's team is the away side,
+    so no date or team strings are repeated. Goals with no matching
+    results row are left out.
+    """
+    positions = {match_key(row): i for i, row in enumerate(results)}
+    grouped = [[] for _ in results]
+    for row, scorer_id in zip(goalscorers, scorer_ids):
+        i = positions.get(match_key(row))
+        if i is None:
+            continue
+        flags = 0
+        if parse_flag(row['penalty']):
+            flags |= GOAL_FLAG_BITS['penalty']
+        if parse_flag(row['own_goal']):
+            flags |= GOAL_FLAG_BITS['ownGoal']
+        if row['team'] == row['away_team']:
+            flags |= GOAL_FLAG_BITS['away']
+        grouped[i].append((scorer_id, int(row['minute']) if row['minute'].isdigit() else 0, flags))
+    columns = {'flagBits': GOAL_FLAG_BITS, 'offsets': [0], 'scorer': [], 'minute': [], 'flags': []}
+    for goals in grouped:
+        for scorer_id, minute, flags in goals:
+            columns['scorer'].append(scorer_id)
+            columns['minute'].append(minute)
+            columns['flags'].append(flags)
+        columns['offsets'].append(len(columns['scorer']))
+    return columns
+
+MATCH_GOALS_COLUMN_TYPES = {'offsets': 'Int32Array', 'scorer': 'Int32Array',
+                            'minute': 'Uint8Array', 'flags': 'Uint8Array'}
+
+SCORE_GRID_LIMIT = 10
+GOAL_MINUTE_BIN = 5
+GOAL_MINUTE_LIMIT = 120
+GOAL_MARGIN_LIMIT = 3
+CONTOUR_LEVELS = 8
+
+def build_score_grid(results, limit=SCORE_GRID_LIMIT):
+    """Match counts per final score, row-major by home score, up to limit-limit."""
+    size = limit + 1
+    counts = [0] * (size * size)
+    for row in results:
+        home, away = int(row['home_score']), int(row['away_score'])
+        if home <= limit and away <= limit:
+            counts[home * size + away] += 1
+    return {'size': size, 'counts': counts}
+
+def contour_thresholds(counts, levels=CONTOUR_LEVELS):
+    """Contour levels at evenly spaced quantiles of the non-empty cells."""
+    values = sorted(count for count in counts if count)
+    if not values:
+        return []
+    return sorted({values[len(values) * level // levels] for level in range(levels)})
+
+def build_goal_timing_grid(results, goalscorers):
+    """Goals by minute and by the scoring side's margin just before the goal.
+
+    Results and goals are both sorted by match key (goals by minute within a
+    match) and merged in one pass, replaying each match's running score.
+    Matches with unknown minutes, goals credited to neither side, or goals
+    that don't add up to the final score are left out.
+    """
+    width = GOAL_MINUTE_LIMIT // GOAL_MINUTE_BIN
+    height = 2 * GOAL_MARGIN_LIMIT + 1
+    counts = [0] * (width * height)
+    goals = sorted(((match_key(row), int(row['minute']) if row['minute'].isdigit() else 0, row['team'])
+                    for row in goalscorers), key=lambda goal: goal[:2])
+    matches = replayed = 0
+    i = 0
+    for key, result in sorted(((match_key(row), row) for row in results), key=lambda item: item[0]):
+        while i < len(goals) and goals[i][0] < key:
+            i += 1
+        start = i
+        while i < len(goals) and goals[i][0] == key:
+            i += 1
+        match_goals = goals[start:i]
+        home_team, away_team = key[1], key[2]
+        if (not match_goals or len(match_goals) != int(result['home_score']) + int(result['away_score'])
+                or any(not minute or team not in (home_team, away_team) for _, minute, team in match_goals)
+                or sum(team == home_team for _, _, team in match_goals) != int(result['home_score'])):
+            continue
+        home = away = 0
+        for _, minute, team in match_goals:
+            margin = home - away if team == home_team else away - home
+            column = min(minute - 1, GOAL_MINUTE_LIMIT - 1) // GOAL_MINUTE_BIN
+            row = max(-GOAL_MARGIN_LIMIT, min(GOAL_MARGIN_LIMIT, margin)) + GOAL_MARGIN_LIMIT
+            counts[row * width + column] += 1
+            if team == home_team:
+                home += 1
+            else:
+                away += 1
+        matches += 1
+        replayed += len(match_goals)
+    return {'width': width, 'height': height, 'minuteBin': GOAL_MINUTE_BIN, 'marginLimit': GOAL_MARGIN_LIMIT,
+            'matches': matches, 'goals': replayed, 'counts': counts, 'thresholds': contour_thresholds(counts)}
+
+DENSITY_GRID_COLUMN_TYPES = {'counts': 'Uint32Array'}
+
+def density_grids_js(grids, packed=False):
+    """Render each grid as a JS object with a typed counts column."""
+    fields = ', '.join(f"{name}: {typed_columns_js(grid, DENSITY_GRID_COLUMN_TYPES, packed)}"
+                       for name, grid in grids.items())
+    return '{' + fields + '}'
+
+RIVALRY_MIN_MATCHES = 10
+LAYOUT_ITERATIONS = 300
+LAYOUT_THETA = 0.9
+LAYOUT_CHARGE = -30
+LAYOUT_GRAVITY = 0.05
+# Bump when the layout forces change so cached layouts are recomputed
+LAYOUT_VERSION = 1
+
+def build_rivalry_graph(results, min_matches=RIVALRY_MIN_MATCHES):
+    """Teams linked by how often they met, keeping pairs with min_matches or more.
+
+    Nodes are sorted team names with their total match counts; edges are
+    (source, target, matches) with source < target.
+    """
+    pairs, played = {}, {}
+    for row in results:
+        home, away = row['home_team'], row['away_team']
+        played[home] = played.get(home, 0) + 1
+        played[away] = played.get(away, 0) + 1
+        pair = (home, away) if home < away else (away, home)
+        pairs[pair] = pairs.get(pair, 0) + 1
+    kept = {pair: count for pair, count in pairs.items() if count >= min_matches}
+    teams = sorted({team for pair in kept for team in pair})
+    ids = {team: i for i, team in enumerate(teams)}
+    edges = sorted((ids[a], ids[b], count) for (a, b), count in kept.items())
+    return {'teams': teams, 'matches': [played[team] for team in teams],
+            'source': [a for a, _, _ in edges], 'target': [b for _, b, _ in edges],
+            'weight': [count for _, _, count in edges]}
+
+def rivalry_link_distance(weight, min_matches=RIVALRY_MIN_MATCHES):
+    """Rest length of a rivalry edge; frequent opponents sit closer."""
+    return max(15.0, 60.0 / (weight / min_matches) ** 0.5)
+
+def _quadtree(points, x0, y0, size):
+    """Barnes-Hut cell: [x0, y0, size, mass, cx, cy, children or point indices]."""
+    mass = len(points)
+    cx = sum(p[1] for p in points) / mass
+    cy = sum(p[2] for p in points) / mass
+    if mass == 1 or size < 1e-6:
+        return [x0, y0, size, mass, cx, cy, None, [p[0] for p in points]]
+    half = size / 2
+    quadrants = ([], [], [], [])
+    for p in points:
+        quadrants[(p[1] >= x0 + half) + 2 * (p[2] >= y0 + half)].append(p)
+    children = [_quadtree(quad, x0 + half * (q & 1), y0 + half * (q >> 1), half)
+                for q, quad in enumerate(quadrants) if quad]
+    return [x0, y0, size, mass, cx, cy, children, None]
+
+def force_layout(node_count, source, target, distances, iterations=LAYOUT_ITERATIONS,
+                 theta=LAYOUT_THETA, charge=LAYOUT_CHARGE, gravity=LAYOUT_GRAVITY):
+    """Positions from a d3-force style simulation with Barnes-Hut repulsion.
+
+    Mirrors d3.forceSimulation defaults (phyllotaxis start, alpha decaying
+    to 0.001, velocity decay 0.4, link strength 1 / min degree) so the page
+    can resume the same simulation when a node is dragged; gravity is a
+    forceX/forceY pull towards the origin that keeps components together.
+    Repulsion walks a quadtree, treating any cell whose size / distance is
+    below theta as a single mass: O(n log n) per tick instead of O(n^2).
+    """
+    angle = math.pi * (3 - math.sqrt(5))
+    xs = [10 * math.sqrt(0.5 + i) * math.cos(i * angle) for i in range(node_count)]
+    ys = [10 * math.sqrt(0.5 + i) * math.sin(i * angle) for i in range(node_count)]
+    vx, vy = [0.0] * node_count, [0.0] * node_count
+    degree = [0] * node_count
+    for a, b in zip(source, target):
+        degree[a] += 1
+        degree[b] += 1
+    links = [(a, b, distance, 1 / min(degree[a], degree[b]), degree[a] / (degree[a] + degree[b]))
+             for a, b, distance in zip(source, target, distances)]
+    theta2 = theta * theta
+    alpha, alpha_min = 1.0, 0.001
+    alpha_decay = 1 - alpha_min ** (1 / iterations)
+    for _ in range(iterations):
+        alpha += (0 - alpha) * alpha_decay
+        for a, b, distance, strength, bias in links:
+            dx = xs[b] + vx[b] - xs[a] - vx[a] or 1e-6
+            dy = ys[b] + vy[b] - ys[a] - vy[a] or 1e-6
+            length = (dx * dx + dy * dy) ** 0.5
+            scale = (length - distance) / length * alpha * strength
+            dx, dy = dx * scale, dy * scale
+            vx[b] -= dx * bias
+            vy[b] -= dy * bias
+            vx[a] += dx * (1 - bias)
+            vy[a] += dy * (1 - bias)
+        if node_count > 1:
+            x0, y0 = min(xs), min(ys)
+            size = max(max(xs) - x0, max(ys) - y0) + 1e-6
+            root = _quadtree([(i, xs[i], ys[i]) for i in range(node_count)], x0, y0, size)
+            for i in range(node_count):
+                x, y = xs[i], ys[i]
+                fx = fy = 0.0
+                stack = [root]
+                while stack:
+                    cell = stack.pop()
+                    dx, dy = cell[4] - x, cell[5] - y
+                    l2 = dx * dx + dy * dy
+                    children = cell[6]
+                    if children is not None and cell[2] * cell[2] / theta2 >= l2:
+                        stack.extend(children)
+                        continue
+                    mass = cell[3]
+                    if children is None and i in cell[7]:
+                        mass -= 1
+                        if not mass:
+                            continue
+                    if l2 < 1:
+                        l2 = l2 ** 0.5 if l2 else 1
+                    fx += dx * mass * charge / l2
+                    fy += dy * mass * charge / l2
+                vx[i] += fx * alpha
+                vy[i] += fy * alpha
+        for i in range(node_count):
+            vx[i] -= xs[i] * gravity * alpha
+            vy[i] -= ys[i] * gravity * alpha
+        for i in range(node_count):
+            vx[i] *= 0.6
+            vy[i] *= 0.6
+            xs[i] += vx[i]
+            ys[i] += vy[i]
+    return [round(x, 2) for x in xs], [round(y, 2) for y in ys]
+
+def layout_rivalry_graph(graph, cache_dir=None):
+    """Add x/y node positions, reusing a layout cached under the edge list's hash."""
+    distances = [rivalry_link_distance(weight) for weight in graph['weight']]
+    key = hashlib.sha256(json.dumps([LAYOUT_VERSION, LAYOUT_ITERATIONS, len(graph['teams']), graph['source'],
+                                     graph['target'], graph['weight']]).encode()).hexdigest()[:20]
+    cache_path = Path(cache_dir) / f'rivalry-{key}.json' if cache_dir else None
+    if cache_path and cache_path.exists():
+        with open(cache_path, encoding='utf-8') as f:
+            positions = json.load(f)
+    else:
+        xs, ys = force_layout(len(graph['teams']), graph['source'], graph['target'], distances)
+        positions = {'x': xs, 'y': ys}
+        if cache_path:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            partial = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+            with open(partial, 'w', encoding='utf-8') as f:
+                json.dump(positions, f)
+            os.replace(partial, cache_path)
+    return dict(graph, x=positions['x'], y=positions['y'], distance=[round(d, 2) for d in distances])
+
+RIVALRY_COLUMN_TYPES = {'matches': 'Int32Array', 'source': 'Int16Array', 'target': 'Int16Array',
+                        'weight': 'Int16Array', 'x': 'Float32Array', 'y': 'Float32Array',
+                        'distance': 'Float32Array'}
+
+def build_row_index(datasets):
+    """Group row positions by team and tournament so filters skip full scans."""
+    index = {'team_results': {}, 'tournament_results': {},
+             'team_goals': {}, 'tournament_goals': {},
+             'team_shootouts': {}, 'tournament_shootouts': {}}
+    tournament_of = {}
+    for i, row in enumerate(datasets['results']):
+        tournament_of[match_key(row)] = row['tournament']
+        index['tournament_results'].setdefault(row['tournament'], []).append(i)
+        index['team_results'].setdefault(row['home_team'], []).append(i)
+        if row['away_team'] != row['home_team']:
+            index['team_results'].setdefault(row['away_team'], []).append(i)
+    for name in ('goals', 'shootouts'):
+        rows = datasets['goalscorers' if name == 'goals' else 'shootouts']
+        for i, row in enumerate(rows):
+            index[f'team_{name}'].setdefault(row['home_team'], []).append(i)
+            index[f'team_{name}'].setdefault(row['away_team'], []).append(i)
+            tournament = tournament_of.get(match_key(row))
+            if tournament is not None:
+                index[f'tournament_{name}'].setdefault(tournament, []).append(i)
+    return index
+
+def filter_datasets(datasets, index, team=None, tournament=None):
+    """Return the datasets restricted to one team and/or one tournament."""
+    filtered = {'former_names': datasets['former_names']}
+    for name, key in (('results', 'results'), ('goalscorers', 'goals'), ('shootouts', 'shootouts')):
+        positions = None
+        if team is not None:
+            positions = set(index[f'team_{key}'].get(team, ()))
+        if tournament is not None:
+            selected = set(index[f'tournament_{key}'].get(tournament, ()))
+            positions = selected if positions is None else positions & selected
+        rows = datasets[name]
+        filtered[name] = rows if positions is None else [rows[i] for i in sorted(positions)]
+    return filtered
+
+def summary_stats(results, goalscorers):
+    """Headline counts for the stats bar."""
+    teams = {row['home_team'] for row in results} | {row['away_team'] for row in results}
+    return {'matches': len(results), 'goals': len(goalscorers), 'teams': len(teams),
+            'scorers': len({row['scorer'] for row in goalscorers}),
+            'tournaments': len({row['tournament'] for row in results})}
+
+# Build DAG. Sources are the CSV stems; every other node is
+# name -> (dependencies, compute(options, *dependency values)).
+# camelCase nodes render the JS constant of the same name.
+SOURCES = ('results', 'goalscorers', 'shootouts', 'former_names')
+AGGREGATES = {
+    # The match browser binary-searches dates within row positions, so
+    # results must be in date order (already-sorted input sorts in linear time)
+    'sorted results': (('results',), lambda options, results: sorted(results, key=lambda row: row['date'])),
+    'results dates': (('sorted results',), lambda options, results: date_columns(results)),
+    'scorer table': (('goalscorers',), lambda options, goals: build_scorer_table(goals)),
+    'goal tournaments': (('sorted results', 'goalscorers'),
+                         lambda options, results, goals: goal_tournaments(results, goals)),
+    'scorer leaderboard': (('goalscorers', 'scorer table', 'goal tournaments'),
+                           lambda options, goals, table, tournaments: ScorerLeaderboard(goals, table[1], tournaments)),
+    'match index': (('sorted results',), lambda options, results: build_match_index(results)),
+    'goal index': (('match index', 'goalscorers'),
+                   lambda options, index, goals: build_goal_index(index['teams'], goals)),
+    'time pyramid': (('sorted results', 'results dates'),
+                     lambda options, results, dates: build_time_pyramid(results, dates)),
+    'streak tracker': (('sorted results', 'results dates'),
+                       lambda options, results, dates: build_streaks(results, dates)),
+    'rivalry graph': (('sorted results',), lambda options, results: build_rivalry_graph(results)),
+    'score grid': (('sorted results',), lambda options, results: build_score_grid(results)),
+    'goal timing grid': (('sorted results', 'goalscorers'),
+                         lambda options, results, goals: build_goal_timing_grid(results, goals)),
+
+    'summaryStats': (('results', 'goalscorers'),
+                     lambda options, results, goals: json.dumps(summary_stats(results, goals))),
+    'resultsData': (('sorted results',), lambda options, results: json.dumps(result_rows_for_embedding(results))),
+    'goalscorersData': (('goalscorers', 'scorer table'),
+                        lambda options, goals, table: json.dumps(goal_rows_for_embedding(
+                            goals, table[1], table[0]['teamNames']))),
+    'shootoutsData': (('shootouts',), lambda options, shootouts: json.dumps(without_dates(shootouts))),
+    'formerNamesData': (('former_names',), lambda options, former_names: json.dumps(former_names)),
+    # Dates travel as integer day numbers plus year/month/weekday columns
+    'resultsDates': (('results dates',), lambda options, dates: typed_columns_js(
+        dates, packed=options['packed'])),
+    'goalscorersDates': (('goalscorers',), lambda options, goals: typed_columns_js(
+        date_columns(goals), packed=options['packed'])),
+    'shootoutsDates': (('shootouts',), lambda options, shootouts: typed_columns_js(
+        date_columns(shootouts), packed=options['packed'])),
+    'scorerTable': (('scorer table',), lambda options, table: typed_columns_js(
+        table[0], SCORER_COLUMN_TYPES, options['packed'])),
+    'scorerLeaderboard': (('scorer leaderboard',),
+                          lambda options, leaderboard: typed_columns_js(leaderboard.to_columns(),
+                                                                        LEADERBOARD_COLUMN_TYPES, options['packed'])),
+    'minuteSketches': (('goalscorers', 'goal tournaments'),
+                       lambda options, goals, tournaments: json.dumps(sketches_for_embedding(
+                           build_minute_sketches(goals, tournaments)), separators=(',', ':'))),
+    'matchIndex': (('match index',), lambda options, index: typed_columns_js(
+        index, MATCH_INDEX_COLUMN_TYPES, options['packed'])),
+    'goalIndex': (('goal index',), lambda options, index: typed_columns_js(
+        index, GOAL_INDEX_COLUMN_TYPES, options['packed'])),
+    'matchGoals': (('sorted results', 'goalscorers', 'scorer table'),
+                   lambda options, results, goals, table: typed_columns_js(
+                       build_match_goals(results, goals, table[1]), MATCH_GOALS_COLUMN_TYPES, options['packed'])),
+    # Always packed: the largest aggregate, and only a drill-down decodes it
+    'teamForm': (('sorted results', 'results dates', 'match index'),
+                 lambda options, results, dates, index: typed_columns_js(
+                     build_team_form(results, dates['day'], index), team_form_column_types(), packed=True)),
+    'streaks': (('streak tracker', 'match index'),
+                lambda options, tracker, index: typed_columns_js(tracker.to_columns(index['teams']),
+                                                                 streak_column_types(), options['packed'])),
+    'timePyramid': (('time pyramid',), lambda options, pyramid: time_pyramid_js(
+        pyramid, options['packed'], PYRAMID_COARSE_LEVELS)),
+    'timePyramidFine': (('time pyramid',), lambda options, pyramid: time_pyramid_js(
+        pyramid, options['packed'], PYRAMID_FINE_LEVELS)),
+    'lineSeries': (('time pyramid',),
+                   lambda options, pyramid: line_series_js(build_line_series(pyramid['year'],
+                                                                             options['line_points']),
+                                                           options['packed'])),
+    'rivalryGraph': (('rivalry graph',),
+                     lambda options, graph: typed_columns_js(layout_rivalry_graph(
+                         graph, options['layout_cache']), RIVALRY_COLUMN_TYPES, options['packed'])),
+    'densityGrids': (('score grid', 'goal timing grid'),
+                     lambda options, score, timing: density_grids_js({'score': score, 'goalTiming': timing},
+                                                                     options['packed'])),
+    'searchIndex': (('match index', 'scorer table', 'former_names'),
+                    lambda options, index, table, former_names: typed_columns_js(build_search_index(
+                        index['teams'], table[0]['name'], former_names), SEARCH_INDEX_COLUMN_TYPES,
+                        options['packed'])),
+}
+
+# JS constants every page embeds, whatever charts it draws
+PAGE_EMBEDS = ('summaryStats',)
+RESULT_ROWS = ('resultsData', 'resultsDates')
+GOAL_ROWS = ('goalscorersData', 'goalscorersDates')
+# Per-team groups of the goal rows, which only the drill-down reads
+GOAL_INDEX = ('goalIndex',)
+# What GOAL_ROWS and GOAL_INDEX stand for with --goal-encoding nested
+MATCH_GOALS = ('matchGoals', 'resultsDates')
+
+# Chart name -> (render function, element removed when the chart is left
+# out, JS constants it reads)
+CHARTS = {
+    'streamgraph': ('renderStreamgraph', 'chart-streamgraph', ('lineSeries',)),
+    'timeline': ('renderTimeline', 'chart-timeline', ('timePyramid', 'timePyramidFine')),
+    'calendar': ('renderCalendarHeatmap', 'chart-calendar', RESULT_ROWS),
+    'scoring-trend': ('renderScoringTrend', 'chart-scoring-trend', ('lineSeries',)),
+    'home-away': ('renderHomeAway', 'chart-home-away', RESULT_ROWS),
+    'monthly': ('renderMonthly', 'chart-monthly', GOAL_ROWS),
+    'rivalry': ('renderRivalry', 'chart-rivalry', ('rivalryGraph',)),
+    'tournaments': ('renderTournamentDist', 'chart-tournament-dist', RESULT_ROWS),
+    'neutral': ('renderNeutral', 'chart-neutral', RESULT_ROWS),
+    'score-dist': ('renderScoreDist', 'chart-score-dist', RESULT_ROWS),
+    'minute': ('renderMinute', 'chart-minute', GOAL_ROWS + ('minuteSketches',)),
+    'minute-groups': ('renderMinuteGroups', 'chart-minute-groups', ('minuteSketches',)),
+    'goal-types': ('renderGoalTypes', 'chart-goal-types', GOAL_ROWS),
+    'top-scorers': ('renderTopScorers', 'chart-top-scorers', ('scorerTable', 'scorerLeaderboard')),
+    'top-teams': ('renderTopTeams', 'chart-top-teams', RESULT_ROWS),
+    'streaks': ('renderStreaks', 'chart-streaks', ('streaks', 'matchIndex')),
+    'win-rate': ('renderWinRate', 'chart-win-rate', RESULT_ROWS),
+    'goals-balance': ('renderGoalsBalance', 'chart-goals-balance', RESULT_ROWS),
+    'hexbin': ('renderHexbin', 'chart-hexbin', ('densityGrids',)),
+    'goal-timing': ('renderGoalTiming', 'chart-goal-timing', ('densityGrids',)),
+    'shootouts': ('renderShootouts', 'chart-shootouts', ('shootoutsDates',)),
+    'decades': ('renderDecades', 'chart-decades', RESULT_ROWS),
+    'matches': ('renderMatchBrowser', 'match-viewport', RESULT_ROWS + ('matchIndex',)),
+    'search': ('initSearch', 'search-input', ('searchIndex', 'scorerTable', 'matchIndex', 'formerNamesData')),
+    'drilldown': (None, 'drilldown', RESULT_ROWS + GOAL_ROWS + GOAL_INDEX
+                  + ('matchIndex', 'scorerTable', 'teamForm')),
+}
+
+def aggregate_waves(targets):
+    """Split the targets and everything they depend on into dependency levels.
+
+    Wave n only depends on earlier waves, so the nodes inside one wave can
+    be computed in any order or at the same time.
+    """
+    levels = {}
+
+    def level(name):
+        if name not in levels:
+            deps = () if name in SOURCES else AGGREGATES[name][0]
+            levels[name] = 1 + max((level(dep) for dep in deps), default=-1)
+        return levels[name]
+
+    for name in targets:
+        level(name)
+    waves = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+    for name, n in levels.items():
+        waves[n].append(name)
+    return waves[1:]
+
+# Values of the finished nodes, read by forked wave workers copy-on-write
+_aggregate_values = {}
+_aggregate_options = {}
+
+def _compute_aggregate(name):
+    """Compute one node from the values of its dependencies."""
+    deps, compute = AGGREGATES[name]
+    start = time.perf_counter()
+    value = compute(_aggregate_options, *(_aggregate_values[dep] for dep in deps))
+    return name, value, time.perf_counter() - start
+
+def compute_aggregates(datasets, targets, options, profiler=NO_PROFILE, jobs=1, values=None):
+    """Compute every target node, each shared dependency exactly once.
+
+    values may hold the sources and nodes of an earlier build. A kept node
+    is reused unless one of its dependencies changed; a recomputed node
+    that comes out equal to its kept value does not count as changed, so
+    its dependents are reused too. With jobs > 1 (and fork available)
+    every wave with more than one pending node runs on a process pool
+    forked after the previous wave, so workers inherit its inputs instead
+    of receiving them pickled.
+    """
+    global _aggregate_values, _aggregate_options
+    kept = values or {}
+    values = {name: datasets[name] for name in SOURCES}
+    changed = {name for name in SOURCES if name not in kept or kept[name] != values[name]}
+    _aggregate_values, _aggregate_options = values, options
+    parallel = jobs > 1 and 'fork' in multiprocessing.get_all_start_methods()
+    try:
+        for wave in aggregate_waves(targets):
+            pending = []
+            for name in wave:
+                if name in kept and not changed.intersection(AGGREGATES[name][0]):
+                    values[name] = kept[name]
+                else:
+                    pending.append(name)
+            if parallel and len(pending) > 1:
+                with profiler.stage(f"aggregates: {', '.join(pending)}"):
+                    with multiprocessing.get_context('fork').Pool(min(jobs, len(pending))) as pool:
+                        for name, value, _ in pool.imap_unordered(_compute_aggregate, pending):
+                            values[name] = value
+            else:
+                for name in pending:
+                    with profiler.stage(name):
+                        values[name] = _compute_aggregate(name)[1]
+            for name in pending:
+                if name in kept and kept[name] == values[name]:
+                    values[name] = kept[name]
+                else:
+                    changed.add(name)
+    finally:
+        _aggregate_values, _aggregate_options = {}, {}
+    return values
+
+def team_cube_rows(results, dates):
+    """(team, year, venue) cells of matches played, won/drawn/lost and goals."""
+    cube = {}
+    for row, year in zip(results, dates['year']):
+        home, away = int(row['home_score']), int(row['away_score'])
+        neutral = parse_flag(row['neutral'])
+        for team, venue, scored, conceded in ((row['home_team'], 'neutral' if neutral else 'home', home, away),
+                                              (row['away_team'], 'neutral' if neutral else 'away', away, home)):
+            cell = cube.setdefault((team, year, venue), [0, 0, 0, 0, 0, 0])
+            cell[0] += 1
+            cell[1 if scored > conceded else 2 if scored == conceded else 3] += 1
+            cell[4] += scored
+            cell[5] += conceded
+    for key in sorted(cube):
+        yield key + tuple(cube[key])
+
+def year_series_rows(pyramid):
+    """Match, goal and home-win counts for every year in the time pyramid."""
+    level = pyramid['year']
+    for i, matches in enumerate(level['matches']):
+        yield level['origin'] + i, matches, level['goals'][i], level['homeWins'][i]
+
+def scorer_rows(table):
+    """One row per interned scorer, in id (goal rank) order."""
+    columns = table[0]
+    for i, name in enumerate(columns['name']):
+        yield (i, name, columns['goals'][i], columns['penalties'][i], columns['ownGoals'][i],
+               '|'.join(columns['teamNames'][team]
+                        for team in columns['teamIds'][columns['teamOffsets'][i]:columns['teamOffsets'][i + 1]]),
+               date.fromordinal(columns['firstDay'][i] + EPOCH_ORDINAL).isoformat(),
+               date.fromordinal(columns['lastDay'][i] + EPOCH_ORDINAL).isoformat())
+
+def head_to_head_rows(results):
+    """Every pair of teams that met, seen from the alphabetically first team."""
+    pairs = {}
+    for row in results:
+        home, away = int(row['home_score']), int(row['away_score'])
+        if row['home_team'] < row['away_team']:
+            pair, first, second = (row['home_team'], row['away_team']), home, away
+        else:
+            pair, first, second = (row['away_team'], row['home_team']), away, home
+        cell = pairs.setdefault(pair, [0, 0, 0, 0, 0, 0])
+        cell[0] += 1
+        cell[1 if first > second else 2 if first == second else 3] += 1
+        cell[4] += first
+        cell[5] += second
+    for pair in sorted(pairs):
+        yield pair + tuple(pairs[pair])
+
+# Tables the export command writes: name -> (dependencies, fields,
+# rows(*dependency values) yielding tuples in field order)
+EXPORTS = {
+    'team_cube': (('sorted results', 'results dates'),
+                  ('team', 'year', 'venue', 'played', 'won', 'drawn', 'lost', 'scored', 'conceded'),
+                  team_cube_rows),
+    'year_series': (('time pyramid',), ('year', 'matches', 'goals', 'home_wins'), year_series_rows),
+    'scorers': (('scorer table',),
+                ('id', 'scorer', 'goals', 'penalties', 'own_goals', 'teams', 'first_date', 'last_date'),
+                scorer_rows),
+    'head_to_head': (('sorted results',),
+                     ('team_a', 'team_b', 'matches', 'team_a_wins', 'draws', 'team_b_wins',
+                      'team_a_goals', 'team_b_goals'),
+                     head_to_head_rows),
+}
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+def chart_embeds(charts, goal_encoding='rows'):
+    """The JS constants a page drawing these charts needs."""
+    embeds = list(PAGE_EMBEDS)
+    for chart in charts:
+        for need in CHARTS[chart][2]:
+            names = MATCH_GOALS if goal_encoding == 'nested' and need in GOAL_ROWS + GOAL_INDEX else (need,)
+            embeds.extend(name for name in names if name not in embeds)
+    return embeds
+
+# Charts on the tab the page opens on
+DEFAULT_TAB_CHARTS = ('streamgraph', 'timeline', 'calendar', 'scoring-trend', 'home-away', 'monthly')
+# Per-row tables, too large for the critical chunk even on the default tab
+ROW_EMBEDS = RESULT_ROWS + GOAL_ROWS + MATCH_GOALS
+# Deferred constants only a click reads; their chunks run on first use
+# instead of at idle time
+ON_DEMAND_EMBEDS = ('teamForm',)
+# Always deferred, and never waited for: the chart draws without them and
+# refines itself when their chunk runs
+REFINEMENT_EMBEDS = ('timePyramidFine',)
+
+def split_embeds(charts, goal_encoding='rows'):
+    """(critical, deferred) JS constants of a progressively loaded page.
+
+    The critical chunk holds PAGE_EMBEDS plus the default tab's aggregates,
+    less REFINEMENT_EMBEDS; everything else is deferred, the default tab's
+    first.
+    """
+    first = [chart for chart in DEFAULT_TAB_CHARTS if chart in charts]
+    critical = [name for name in chart_embeds(first, goal_encoding)
+                if name in PAGE_EMBEDS or name not in ROW_EMBEDS + REFINEMENT_EMBEDS]
+    ordered = first + [chart for chart in charts if chart not in first]
+    return critical, [name for name in chart_embeds(ordered, goal_encoding) if name not in critical]
+
+# Polls the watch server and reloads when a newer build is written
+LIVE_RELOAD_JS = '''
+    <script>
+        (() => {
+            let build = null;
+            setInterval(() => fetch('/__build', {cache: 'no-store'})
+                .then(response => response.text())
+                .then(current => {
+                    if (build !== null && current !== build) location.reload();
+                    build = current;
+                })
+                .catch(() => {}), 500);
+        })();
+    </script>'''
+
+def build_dashboard_html(datasets, subtitle=DEFAULT_SUBTITLE, profiler=NO_PROFILE, line_points=LINE_POINTS,
+                         layout_cache=None, charts=None, jobs=1, values=None, live_reload=False,
+                         goal_encoding='rows', packed=False, progressive=True):
+    """Render the dashboard page, computing only what the selected charts need.
+
+    charts defaults to every chart in CHARTS; JS constants no selected chart
+    reads are embedded as null. values is updated in place with the
+    computed nodes when given, so callers can reuse them. live_reload adds
+    a script that reloads the page when LiveReloadServer's build changes.
+    goal_encoding 'nested' embeds goals as matchGoals instead of goal rows;
+    packed embeds typed columns with pack_column instead of as JSON arrays.
+    progressive inlines only split_embeds' critical chunk in the main script;
+    the rest follow in deferred-data blocks the page runs at idle time.
+    """
+    charts = list(CHARTS) if charts is None else charts
+    options = {'line_points': line_points, 'layout_cache': layout_cache, 'packed': packed}
+    computed = compute_aggregates(datasets, chart_embeds(charts, goal_encoding), options, profiler, jobs, values)
+    if values is not None:
+        values.update(computed)
+    deferred = split_embeds(charts, goal_encoding)[1] if progressive else []
+    embeds = {name: 'null' if name in deferred else computed.get(name, 'null')
+              for name in AGGREGATES if name.isidentifier()}
+    deferred_chunks = ''.join(f'\n    <script type="text/deferred-data" data-name="{name}"'
+                              f'{" data-on-demand" if name in ON_DEMAND_EMBEDS else ""}>'
+                              f'{name} = {computed[name]};</script>' for name in deferred)
+    chart_needs = json.dumps({chart: [name for name in chart_embeds([chart], goal_encoding)
+                                      if name in deferred and name not in REFINEMENT_EMBEDS]
+                              for chart in charts})
+    render_calls = '\n'.join(f"        whenLoaded(chartNeeds['{chart}'], () => measure('{CHARTS[chart][0]}', "
+                             f"() => {CHARTS[chart][0]}()));"
+                             for chart in charts if CHARTS[chart][0])
+    live_reload_js = LIVE_RELOAD_JS if live_reload else ''
+    removed_elements = json.dumps([element for chart, (_, element, _) in CHARTS.items() if chart not in charts])
+
+    with profiler.stage('render template'):
+        html_content = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -253,11 +2075,220 @@ def main():
             max-width: 250px;
         }}
 
+        .chart-controls {{
+            display: flex;
+            gap: 0.5rem;
+            align-items: center;
+            margin-bottom: 0.75rem;
+            font-size: 0.75rem;
+            color: var(--text-tertiary);
+        }}
+
+        .chart-controls select,
+        .chart-controls input {{
+            background: var(--bg-accent);
+            border: 1px solid var(--border-light);
+            border-radius: 4px;
+            color: var(--text-primary);
+            font-family: var(--font-family);
+            font-size: 0.75rem;
+            padding: 0.25rem 0.5rem;
+            width: 5.5rem;
+        }}
+
+        .drilldown {{
+            position: fixed;
+            top: 0;
+            right: 0;
+            width: min(760px, 95vw);
+            height: 100vh;
+            overflow-y: auto;
+            z-index: 900;
+            background: var(--bg-main);
+            border-left: 1px solid var(--border-light);
+            padding: 1.5rem;
+        }}
+
+        .drilldown-grid {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
+            gap: 1rem;
+        }}
+
+        .drilldown-list {{
+            list-style: none;
+            font-size: 0.75rem;
+        }}
+
+        .drilldown-list li {{
+            display: flex;
+            justify-content: space-between;
+            padding: 0.2rem 0;
+            border-bottom: 1px solid var(--border);
+        }}
+
+        .drilldown-list li span:last-child {{
+            color: var(--text-tertiary);
+        }}
+
+        .drilldown-list li.highlight {{
+            color: var(--lime);
+            font-weight: 600;
+        }}
+
+        .search-box {{
+            position: relative;
+            margin-bottom: 1.5rem;
+        }}
+
+        .search-box input {{
+            width: 100%;
+            background: var(--bg-elevated);
+            border: 1px solid var(--border);
+            border-radius: 6px;
+            color: var(--text-primary);
+            font-family: var(--font-family);
+            font-size: 0.875rem;
+            padding: 0.75rem 1rem;
+        }}
+
+        .search-box input:focus {{
+            outline: none;
+            border-color: var(--lime);
+        }}
+
+        .search-results {{
+            position: absolute;
+            left: 0;
+            right: 0;
+            top: 100%;
+            z-index: 500;
+            background: var(--bg-accent);
+            border: 1px solid var(--border-light);
+            border-radius: 6px;
+            margin-top: 0.25rem;
+        }}
+
+        .search-hit {{
+            display: flex;
+            justify-content: space-between;
+            gap: 1rem;
+            padding: 0.5rem 1rem;
+            font-size: 0.8rem;
+            cursor: pointer;
+        }}
+
+        .search-hit:hover {{
+            background: var(--bg-elevated);
+        }}
+
+        .search-hit .detail {{
+            color: var(--text-tertiary);
+            font-size: 0.7rem;
+        }}
+
+        .match-filters {{
+            display: flex;
+            flex-wrap: wrap;
+            gap: 0.75rem;
+            align-items: center;
+            margin-bottom: 1rem;
+            font-size: 0.75rem;
+            color: var(--text-tertiary);
+        }}
+
+        .match-filters input,
+        .match-filters select {{
+            background: var(--bg-accent);
+            border: 1px solid var(--border-light);
+            border-radius: 4px;
+            color: var(--text-primary);
+            font-family: var(--font-family);
+            font-size: 0.75rem;
+            padding: 0.35rem 0.5rem;
+        }}
+
+        .match-viewport {{
+            height: 480px;
+            overflow-y: auto;
+            position: relative;
+            border-top: 1px solid var(--border);
+        }}
+
+        .match-row {{
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            height: 28px;
+            display: grid;
+            grid-template-columns: 6.5rem 1fr 4rem 1fr 1.2fr 1fr;
+            gap: 0.75rem;
+            align-items: center;
+            padding: 0 0.5rem;
+            font-size: 0.75rem;
+            border-bottom: 1px solid var(--border);
+            white-space: nowrap;
+        }}
+
+        .match-row span {{
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }}
+
+        .match-row .score {{
+            text-align: center;
+            color: var(--lime);
+            font-weight: 600;
+        }}
+
+        .match-row .muted {{
+            color: var(--text-tertiary);
+        }}
+
         .loading {{
             color: var(--text-tertiary);
             font-style: italic;
         }}
 
+        .perf-panel {{
+            background: var(--bg-elevated);
+            border: 1px solid var(--border);
+            border-radius: 12px;
+            padding: 1.5rem;
+            margin-top: 2rem;
+        }}
+
+        .perf-header {{
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 0.5rem;
+        }}
+
+        .perf-table {{
+            width: 100%;
+            border-collapse: collapse;
+            font-size: 0.75rem;
+        }}
+
+        .perf-table th,
+        .perf-table td {{
+            text-align: left;
+            padding: 0.25rem 0.5rem;
+            border-bottom: 1px solid var(--border);
+        }}
+
+        .perf-table th {{
+            color: var(--text-tertiary);
+            font-weight: 500;
+        }}
+
+        .perf-table td.num {{
+            text-align: right;
+            color: var(--cyan);
+        }}
+
         footer {{
             text-align: center;
             padding: 2rem 0;
@@ -281,7 +2312,7 @@ def main():
     <div class="container">
         <header>
             <h1>FIFA International Football Analytics</h1>
-            <p class="subtitle">153 years of international football data (1872-2025)</p>
+            <p class="subtitle">{escape(subtitle)}</p>
         </header>
 
         <div class="stats-bar" id="stats-bar">
@@ -307,12 +2338,18 @@ def main():
             </div>
         </div>
 
+        <div class="search-box">
+            <input type="search" id="search-input" placeholder="Search teams and scorers" autocomplete="off" aria-label="Search teams and scorers">
+            <div class="search-results" id="search-results" style="display: none;"></div>
+        </div>
+
         <nav class="nav-tabs">
             <button class="tab-btn active" data-tab="temporal">Temporal</button>
             <button class="tab-btn" data-tab="network">Network</button>
             <button class="tab-btn" data-tab="distribution">Distribution</button>
             <button class="tab-btn" data-tab="comparative">Comparative</button>
             <button class="tab-btn" data-tab="statistical">Statistical</button>
+            <button class="tab-btn" data-tab="matches">Matches</button>
         </nav>
 
         <!-- Temporal Analysis -->
@@ -323,6 +2360,19 @@ def main():
                     <p class="chart-description">Evolution of goal scoring across decades by tournament type</p>
                     <div class="chart-container" id="chart-streamgraph"></div>
                 </div>
+                <div class="chart-card full-width">
+                    <h3 class="chart-title">Match Timeline</h3>
+                    <p class="chart-description" id="timeline-description">Scroll to zoom, drag to pan; resolution follows the zoom level</p>
+                    <div class="chart-controls">
+                        <select id="timeline-metric" aria-label="Timeline metric">
+                            <option value="matches">Matches</option>
+                            <option value="goals">Goals</option>
+                            <option value="avgGoals">Goals per match</option>
+                            <option value="homeWinRate">Home win rate</option>
+                        </select>
+                    </div>
+                    <div class="chart-container" id="chart-timeline"></div>
+                </div>
                 <div class="chart-card">
                     <h3 class="chart-title">Match Frequency Heatmap</h3>
                     <p class="chart-description">Matches by month and day of week</p>
@@ -354,6 +2404,11 @@ def main():
                     <p class="chart-description">Frequency of matches between top teams</p>
                     <div class="chart-container" id="chart-matrix"></div>
                 </div>
+                <div class="chart-card full-width">
+                    <h3 class="chart-title">Rivalry Network</h3>
+                    <p class="chart-description">Teams that met 10+ times; drag a team to pull its neighbours</p>
+                    <div class="chart-container" id="chart-rivalry"></div>
+                </div>
                 <div class="chart-card">
                     <h3 class="chart-title">Tournament Distribution</h3>
                     <p class="chart-description">Breakdown of match types</p>
@@ -387,9 +2442,29 @@ def main():
                 </div>
                 <div class="chart-card">
                     <h3 class="chart-title">Top Scorers</h3>
-                    <p class="chart-description">All-time leading goal scorers</p>
+                    <p class="chart-description">Leading goal scorers in the selected years and tournament</p>
+                    <div class="chart-controls">
+                        <input type="number" id="top-scorers-from" aria-label="From year">
+                        <span>to</span>
+                        <input type="number" id="top-scorers-to" aria-label="To year">
+                        <select id="top-scorers-tournament" aria-label="Tournament">
+                            <option value="">All tournaments</option>
+                        </select>
+                    </div>
                     <div class="chart-container" id="chart-top-scorers"></div>
                 </div>
+                <div class="chart-card full-width">
+                    <h3 class="chart-title">Goal Minute Spread by Group</h3>
+                    <p class="chart-description">Median, middle 50% and 10th-90th percentile of goal minutes, from each group's quantile sketch</p>
+                    <div class="chart-controls">
+                        <select id="minute-groups-kind" aria-label="Group by">
+                            <option value="decade">Decade</option>
+                            <option value="tournament">Tournament</option>
+                            <option value="team">Team</option>
+                        </select>
+                    </div>
+                    <div class="chart-container" id="chart-minute-groups"></div>
+                </div>
             </div>
         </div>
 
@@ -401,6 +2476,20 @@ def main():
                     <p class="chart-description">Most successful international teams</p>
                     <div class="chart-container" id="chart-top-teams"></div>
                 </div>
+                <div class="chart-card full-width">
+                    <h3 class="chart-title">Streak Records</h3>
+                    <p class="chart-description">Longest runs of consecutive results</p>
+                    <div class="chart-controls">
+                        <select id="streak-kind" aria-label="Streak type">
+                            <option value="win">Wins</option>
+                            <option value="unbeaten">Unbeaten</option>
+                            <option value="losing">Defeats</option>
+                            <option value="scoring">Scoring</option>
+                        </select>
+                        <select id="streak-period" aria-label="Streak period"></select>
+                    </div>
+                    <div class="chart-container" id="chart-streaks"></div>
+                </div>
                 <div class="chart-card">
                     <h3 class="chart-title">Win Rate Comparison</h3>
                     <p class="chart-description">Home vs Away performance</p>
@@ -422,6 +2511,11 @@ def main():
                     <p class="chart-description">Home score vs Away score hexbin</p>
                     <div class="chart-container" id="chart-hexbin"></div>
                 </div>
+                <div class="chart-card full-width">
+                    <h3 class="chart-title">Goal Timing by Scoreline</h3>
+                    <p class="chart-description">Goal minute vs the scoring side's margin before the goal</p>
+                    <div class="chart-container" id="chart-goal-timing"></div>
+                </div>
                 <div class="chart-card">
                     <h3 class="chart-title">Penalty Shootout Trends</h3>
                     <p class="chart-description">Shootouts over time</p>
@@ -435,6 +2529,76 @@ def main():
             </div>
         </div>
 
+        <!-- Match Explorer -->
+        <div class="tab-content" id="matches">
+            <div class="chart-card">
+                <h3 class="chart-title">Match Explorer</h3>
+                <p class="chart-description" id="match-count">Every international result</p>
+                <div class="match-filters">
+                    <input type="text" id="match-team" list="match-team-options" placeholder="Team or part of a name" aria-label="Team">
+                    <datalist id="match-team-options"></datalist>
+                    <select id="match-tournament" aria-label="Tournament">
+                        <option value="">All tournaments</option>
+                    </select>
+                    <input type="date" id="match-from" aria-label="From date">
+                    <span>to</span>
+                    <input type="date" id="match-to" aria-label="To date">
+                </div>
+                <div class="match-viewport" id="match-viewport">
+                    <div id="match-spacer"></div>
+                </div>
+            </div>
+        </div>
+
+        <!-- Team drill-down (opened by clicking a team in the comparative charts) -->
+        <div class="drilldown" id="drilldown" style="display: none;">
+            <div class="perf-header">
+                <h3 class="chart-title" id="drilldown-title"></h3>
+                <button class="tab-btn" id="drilldown-close">Close</button>
+            </div>
+            <p class="chart-description" id="drilldown-summary"></p>
+            <div class="drilldown-grid">
+                <div class="chart-card full-width">
+                    <h3 class="chart-title">Results by Year</h3>
+                    <div class="chart-container" id="drilldown-timeline"></div>
+                </div>
+                <div class="chart-card full-width">
+                    <h3 class="chart-title">Rolling Form</h3>
+                    <div class="chart-controls">
+                        <select id="drilldown-form-window" aria-label="Form window"></select>
+                        <select id="drilldown-form-metric" aria-label="Form metric">
+                            <option value="points">Points per match</option>
+                            <option value="goalDiff">Goal difference per match</option>
+                            <option value="winRate">Win rate</option>
+                        </select>
+                    </div>
+                    <div class="chart-container" id="drilldown-form"></div>
+                </div>
+                <div class="chart-card">
+                    <h3 class="chart-title">Most Played Opponents</h3>
+                    <ul class="drilldown-list" id="drilldown-opponents"></ul>
+                </div>
+                <div class="chart-card">
+                    <h3 class="chart-title">Top Scorers</h3>
+                    <ul class="drilldown-list" id="drilldown-scorers"></ul>
+                </div>
+                <div class="chart-card full-width">
+                    <h3 class="chart-title">Goal Minutes</h3>
+                    <div class="chart-container" id="drilldown-minutes"></div>
+                </div>
+            </div>
+        </div>
+
+        <!-- Render diagnostics (open with ?perf in the URL) -->
+        <div class="perf-panel" id="perf-panel" style="display: none;">
+            <div class="perf-header">
+                <h3 class="chart-title">Render Diagnostics</h3>
+                <button class="tab-btn" id="perf-export">Export JSON</button>
+            </div>
+            <p class="chart-description" id="perf-summary"></p>
+            <table class="perf-table" id="perf-table"></table>
+        </div>
+
         <footer>
             <p>Data source: International Football Results from 1872 to 2025</p>
             <p>Built with D3.js and Observable Plot</p>
@@ -445,11 +2609,203 @@ def main():
     <div class="tooltip" id="tooltip" style="display: none;"></div>
 
     <script>
-        // Embedded data
-        const resultsData = {results_json};
-        const goalscorersData = {goalscorers_json};
-        const shootoutsData = {shootouts_json};
-        const formerNamesData = {former_names_json};
+        // Render performance instrumentation. Runs before the data script is
+        // compiled so the long-task observer also sees the inline JSON parse.
+        const perfLog = {{measures: [], longTasks: [], memory: []}};
+
+        function sampleMemory(label) {{
+            if (performance.memory) {{
+                perfLog.memory.push({{
+                    label,
+                    time: performance.now(),
+                    usedJSHeapSize: performance.memory.usedJSHeapSize,
+                    totalJSHeapSize: performance.memory.totalJSHeapSize
+                }});
+            }}
+        }}
+
+        function measure(name, fn) {{
+            performance.mark(`${{name}}:start`);
+            try {{
+                return fn();
+            }} finally {{
+                performance.mark(`${{name}}:end`);
+                performance.measure(name, `${{name}}:start`, `${{name}}:end`);
+                const entry = performance.getEntriesByName(name, 'measure').pop();
+                perfLog.measures.push({{name, start: entry.startTime, duration: entry.duration}});
+            }}
+        }}
+
+        if (window.PerformanceObserver && PerformanceObserver.supportedEntryTypes?.includes('longtask')) {{
+            new PerformanceObserver(list => {{
+                list.getEntries().forEach(e => perfLog.longTasks.push({{start: e.startTime, duration: e.duration}}));
+            }}).observe({{type: 'longtask', buffered: true}});
+        }}
+
+        performance.mark('data:start');
+        sampleMemory('before data');
+    </script>
+
+    <script>
+        performance.mark('data:end');
+        performance.measure('embedded data parse', 'data:start', 'data:end');
+        perfLog.measures.push({{
+            name: 'embedded data parse',
+            start: performance.getEntriesByName('data:start', 'mark')[0].startTime,
+            duration: performance.getEntriesByName('embedded data parse', 'measure')[0].duration
+        }});
+
+        // Expands a pack_column payload (--packed) into a typed array:
+        // [codec][varint count][body], LEB128 varints, signed values zigzagged
+        function unpackColumn(ArrayType, payload) {{
+            const binary = atob(payload);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+            let pos = 1;
+            const varint = () => {{
+                let value = 0, scale = 1, byte;
+                do {{
+                    byte = bytes[pos++];
+                    value += (byte & 0x7f) * scale;
+                    scale *= 128;
+                }} while (byte & 0x80);
+                return value;
+            }};
+            const signed = () => {{
+                const value = varint();
+                return value % 2 ? -(value + 1) / 2 : value / 2;
+            }};
+
+            const count = varint();
+            if (bytes[0] === {PACK_FLOAT}) {{
+                return new ArrayType(bytes.buffer.slice(pos, pos + count * ArrayType.BYTES_PER_ELEMENT));
+            }}
+            const out = new ArrayType(count);
+            if (bytes[0] === {PACK_VARINT}) {{
+                for (let i = 0; i < count; i++) out[i] = signed();
+            }} else if (bytes[0] === {PACK_DELTA}) {{
+                for (let i = 0, value = 0; i < count; i++) out[i] = value += signed();
+            }} else if (bytes[0] === {PACK_RLE}) {{
+                for (let i = 0; i < count;) {{
+                    const value = signed();
+                    const length = varint();
+                    out.fill(value, i, i + length);
+                    i += length;
+                }}
+            }} else {{
+                // {PACK_BITS}: fixed-width offsets from the minimum, LSB first;
+                // widths up to {PACK_MAX_BITS} bits keep the buffer inside 31 bits
+                const low = signed();
+                const width = bytes[pos++];
+                const mask = (1 << width) - 1;
+                let buffer = 0, filled = 0;
+                for (let i = 0; i < count; i++) {{
+                    while (filled < width) {{
+                        buffer |= bytes[pos++] << filled;
+                        filled += 8;
+                    }}
+                    out[i] = low + (buffer & mask);
+                    buffer >>>= width;
+                    filled -= width;
+                }}
+            }}
+            return out;
+        }}
+
+        // Embedded data; constants no chart on this page reads are null.
+        // Those in deferredData stay null until their deferred chunk runs
+        // after the first paint, or for ON_DEMAND_EMBEDS when first needed;
+        // chartNeeds lists what each chart waits for.
+        const enabledCharts = new Set({json.dumps(charts)});
+        const deferredData = new Set({json.dumps(deferred)});
+        const chartNeeds = {chart_needs};
+        let dataCallbacks = [];
+
+        function dataReady(names) {{
+            return names.every(name => !deferredData.has(name));
+        }}
+
+        // Run callback once every named constant has loaded
+        function whenLoaded(names, callback) {{
+            if (dataReady(names)) callback();
+            else dataCallbacks.push([names, callback]);
+        }}
+
+        let summaryStats = {embeds["summaryStats"]};
+        let resultsData = {embeds["resultsData"]};
+        let goalscorersData = {embeds["goalscorersData"]};
+        let shootoutsData = {embeds["shootoutsData"]};
+        let formerNamesData = {embeds["formerNamesData"]};
+
+        // Dates as epoch-day numbers with precomputed calendar columns
+        let resultsDates = {embeds["resultsDates"]};
+        let goalscorersDates = {embeds["goalscorersDates"]};
+        let shootoutsDates = {embeds["shootoutsDates"]};
+        const MS_PER_DAY = 86400000;
+
+        // Scorer dimension: goal rows carry scorer_id into these columns and
+        // home_team_id/away_team_id/team_id into teamNames. Ids are ranked by
+        // goals, so id 0 is the all-time top scorer; its teams are
+        // teamIds[teamOffsets[0]..teamOffsets[1]].
+        let scorerTable = {embeds["scorerTable"]};
+
+        // With --goal-encoding nested, goals instead live under their match:
+        // offsets[i]..offsets[i + 1] of scorer/minute/flags are the goals of
+        // resultsData[i], flags packing the flagBits (away = away side's goal)
+        let matchGoals = {embeds["matchGoals"]};
+
+        // Per (tournament, year) scorer counts, sorted descending within each
+        // bucket; bucketTournament -1 holds all tournaments for that year.
+        let scorerLeaderboard = {embeds["scorerLeaderboard"]};
+
+        // KLL goal-minute sketches by tournament, decade and team. Each sketch
+        // is a list of levels; an item on level h stands for 2^h goals.
+        let minuteSketches = {embeds["minuteSketches"]};
+
+        // Match browser index: resultsData positions grouped by team and by
+        // tournament (CSR). Rows are date-sorted, so every group is too.
+        let matchIndex = {embeds["matchIndex"]};
+
+        // goalscorersData positions grouped by scoring team, with matchIndex
+        // team ids (rows encoding only)
+        let goalIndex = {embeds["goalIndex"]};
+
+        // Rolling form per team: for each window (last N matches or last N
+        // days), points/goal difference/wins summed over the window after
+        // every match, aligned with matchIndex.teamRows
+        let teamForm = {embeds["teamForm"]};
+
+        // Longest win/unbeaten/losing/scoring runs: per-team best and current
+        // runs aligned with matchIndex.teams, plus the top runs of each decade
+        let streaks = {embeds["streaks"]};
+
+        // Match/goal/home-win counts at month, year and decade resolution;
+        // index i of a level is bucket origin + i. The day and week levels
+        // come later in timePyramidFine.
+        let timePyramid = {embeds["timePyramid"]};
+        let timePyramidFine = {embeds["timePyramidFine"]};
+
+        // Year-resolution line series as typed x/y columns, already capped at
+        // --line-points by LTTB; charts re-sample them to their drawn width
+        let lineSeries = {embeds["lineSeries"]};
+
+        // Rivalry network: teams that met at least 10 times, with edge
+        // weights (matches) and node positions laid out by the generator
+        let rivalryGraph = {embeds["rivalryGraph"]};
+
+        // 2D count grids: score holds matches per final score (home * size +
+        // away); goalTiming holds goals per minute bin (column) and scoring
+        // side's margin before the goal (row, -marginLimit..marginLimit)
+        let densityGrids = {embeds["densityGrids"]};
+
+        // Type-ahead index: front-coded sorted keys (diacritics folded), with
+        // refs = id * 4 + kind (0 team, 1 scorer, 2 former team name)
+        let searchIndex = {embeds["searchIndex"]};
+
+        // Only axis ticks and tooltips need real Date objects
+        function dayToDate(day) {{
+            return new Date(day * MS_PER_DAY);
+        }}
 
         // Color palette based on theme
         const colors = {{
@@ -468,41 +2824,12 @@ def main():
 
         const colorScale = [colors.lime, colors.cyan, colors.amber, colors.emerald, colors.coral];
 
-        // Parse dates and numbers
-        resultsData.forEach(d => {{
-            d.date = new Date(d.date);
-            d.home_score = +d.home_score;
-            d.away_score = +d.away_score;
-            d.year = d.date.getFullYear();
-            d.month = d.date.getMonth();
-            d.decade = Math.floor(d.year / 10) * 10;
-            d.total_goals = d.home_score + d.away_score;
-        }});
-
-        goalscorersData.forEach(d => {{
-            d.date = new Date(d.date);
-            d.minute = +d.minute || null;
-            d.own_goal = d.own_goal === 'True' || d.own_goal === true;
-            d.penalty = d.penalty === 'True' || d.penalty === true;
-            d.year = d.date.getFullYear();
-        }});
-
-        shootoutsData.forEach(d => {{
-            d.date = new Date(d.date);
-            d.year = d.date.getFullYear();
-        }});
-
-        // Calculate statistics
-        const uniqueTeams = new Set([...resultsData.map(d => d.home_team), ...resultsData.map(d => d.away_team)]);
-        const uniqueScorers = new Set(goalscorersData.map(d => d.scorer));
-        const uniqueTournaments = new Set(resultsData.map(d => d.tournament));
-
         // Update stats bar
-        document.getElementById('stat-matches').textContent = resultsData.length.toLocaleString();
-        document.getElementById('stat-goals').textContent = goalscorersData.length.toLocaleString();
-        document.getElementById('stat-teams').textContent = uniqueTeams.size.toLocaleString();
-        document.getElementById('stat-scorers').textContent = uniqueScorers.size.toLocaleString();
-        document.getElementById('stat-tournaments').textContent = uniqueTournaments.size.toLocaleString();
+        document.getElementById('stat-matches').textContent = summaryStats.matches.toLocaleString();
+        document.getElementById('stat-goals').textContent = summaryStats.goals.toLocaleString();
+        document.getElementById('stat-teams').textContent = summaryStats.teams.toLocaleString();
+        document.getElementById('stat-scorers').textContent = summaryStats.scorers.toLocaleString();
+        document.getElementById('stat-tournaments').textContent = summaryStats.tournaments.toLocaleString();
 
         // Tab navigation
         document.querySelectorAll('.tab-btn').forEach(btn => {{
@@ -511,6 +2838,7 @@ def main():
                 document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
                 btn.classList.add('active');
                 document.getElementById(btn.dataset.tab).classList.add('active');
+                resizeCharts();
             }});
         }});
 
@@ -529,83 +2857,502 @@ def main():
             tooltip.style('display', 'none');
         }}
 
-        // Chart 1: Goals per year area chart
-        function renderStreamgraph() {{
-            const container = d3.select('#chart-streamgraph');
-            const width = container.node().clientWidth || 800;
-            const height = 350;
-            const margin = {{top: 20, right: 30, bottom: 40, left: 50}};
+        // Largest-Triangle-Three-Buckets: indices of the points to keep from
+        // an x-sorted line (same algorithm as the generator's lttb)
+        function lttb(xs, ys, threshold) {{
+            const n = xs.length;
+            if (threshold >= n || threshold < 3) return Array.from({{length: n}}, (_, i) => i);
+            const every = (n - 2) / (threshold - 2);
+            const picked = [0];
+            let a = 0;
+            for (let bucket = 0; bucket < threshold - 2; bucket++) {{
+                const start = Math.floor(bucket * every) + 1;
+                const end = Math.floor((bucket + 1) * every) + 1;
+                const nextEnd = Math.min(Math.floor((bucket + 2) * every) + 1, n);
+                let avgX = 0, avgY = 0;
+                for (let i = end; i < nextEnd; i++) {{ avgX += xs[i]; avgY += ys[i]; }}
+                avgX /= nextEnd - end;
+                avgY /= nextEnd - end;
+                const ax = xs[a], ay = ys[a];
+                let best = start, bestArea = -1;
+                for (let i = start; i < end; i++) {{
+                    const area = Math.abs((ax - avgX) * (ys[i] - ay) - (ax - xs[i]) * (avgY - ay));
+                    if (area > bestArea) {{ best = i; bestArea = area; }}
+                }}
+                picked.push(best);
+                a = best;
+            }}
+            picked.push(n - 1);
+            return picked;
+        }}
 
-            // Aggregate goals by year
-            const goalsByYear = d3.rollup(resultsData,
-                v => d3.sum(v, d => d.total_goals),
-                d => d.year
-            );
+        // At most one point per LINE_PIXELS_PER_POINT pixels of plot width
+        const LINE_PIXELS_PER_POINT = 2;
 
-            const data = Array.from(goalsByYear, ([year, goals]) => ({{year, goals}}))
-                .filter(d => d.year >= 1900)
-                .sort((a, b) => a.year - b.year);
+        function downsampleSeries(series, plotWidth) {{
+            const threshold = Math.max(3, Math.floor(plotWidth / LINE_PIXELS_PER_POINT));
+            return lttb(series.x, series.y, threshold).map(i => ({{x: series.x[i], y: series.y[i]}}));
+        }}
 
-            const svg = container.append('svg')
-                .attr('width', width)
-                .attr('height', height);
+        // Charts re-lay out when their container width changes: a chart's
+        // layout(width) keeps its data and joined nodes and only updates
+        // scale ranges and positional attributes. Keyed by container, so a
+        // chart re-rendered by its controls replaces its old layout.
+        const chartLayouts = new Map();
+        let resizeTimer = null;
 
-            const x = d3.scaleLinear()
-                .domain(d3.extent(data, d => d.year))
-                .range([margin.left, width - margin.right]);
+        function onResize(container, layout) {{
+            const node = container.node();
+            chartLayouts.set(node, {{layout, width: node.clientWidth}});
+        }}
 
-            const y = d3.scaleLinear()
-                .domain([0, d3.max(data, d => d.goals)])
-                .range([height - margin.bottom, margin.top]);
+        // Hidden tabs report width 0 and are skipped until shown
+        function resizeCharts() {{
+            for (const [node, entry] of chartLayouts) {{
+                const width = node.clientWidth;
+                if (width && width !== entry.width) {{
+                    entry.width = width;
+                    entry.layout(width);
+                }}
+            }}
+        }}
 
-            const area = d3.area()
-                .x(d => x(d.year))
-                .y0(y(0))
-                .y1(d => y(d.goals))
-                .curve(d3.curveMonotoneX);
+        window.addEventListener('resize', () => {{
+            clearTimeout(resizeTimer);
+            resizeTimer = setTimeout(() => measure('resizeCharts', resizeCharts), 150);
+        }});
 
-            // Gradient
-            const gradient = svg.append('defs')
-                .append('linearGradient')
-                .attr('id', 'area-gradient')
-                .attr('x1', '0%').attr('y1', '0%')
-                .attr('x2', '0%').attr('y2', '100%');
+        // One pass over resultsData fills the accumulators of every
+        // results-based chart; run on first use and shared by all of them
+        let resultsAggregateCache = null;
+
+        function resultsAggregates() {{
+            if (resultsAggregateCache) return resultsAggregateCache;
+            resultsAggregateCache = measure('aggregate resultsData', () => {{
+                const calendar = new Int32Array(7 * 12);
+                const decades = new Map();
+                const tournaments = new Map();
+                const scores = new Map();
+                const teams = new Map();
+                let neutral = 0;
+                const teamRecord = name => {{
+                    let record = teams.get(name);
+                    if (!record) {{
+                        record = {{wins: 0, homeGames: 0, homeWins: 0, awayGames: 0, awayWins: 0, scored: 0, conceded: 0}};
+                        teams.set(name, record);
+                    }}
+                    return record;
+                }};
+
+                for (let i = 0; i < resultsData.length; i++) {{
+                    const d = resultsData[i];
+                    calendar[resultsDates.dow[i] * 12 + resultsDates.month[i]]++;
+                    tournaments.set(d.tournament, (tournaments.get(d.tournament) || 0) + 1);
+                    const score = `${{d.home_score}}-${{d.away_score}}`;
+                    scores.set(score, (scores.get(score) || 0) + 1);
+                    if (d.neutral === 'TRUE' || d.neutral === true) neutral++;
+
+                    const home = teamRecord(d.home_team);
+                    const away = teamRecord(d.away_team);
+                    home.homeGames++;
+                    away.awayGames++;
+                    home.scored += d.home_score;
+                    home.conceded += d.away_score;
+                    away.scored += d.away_score;
+                    away.conceded += d.home_score;
+                    if (d.home_score > d.away_score) {{
+                        home.wins++;
+                        home.homeWins++;
+                    }} else if (d.away_score > d.home_score) {{
+                        away.wins++;
+                        away.awayWins++;
+                    }}
 
-            gradient.append('stop')
-                .attr('offset', '0%')
-                .attr('stop-color', colors.lime)
-                .attr('stop-opacity', 0.8);
+                    const decadeStart = Math.floor(resultsDates.year[i] / 10) * 10;
+                    if (decadeStart >= 1900) {{
+                        let decade = decades.get(decadeStart);
+                        if (!decade) {{
+                            decade = {{matches: 0, homeGoals: 0, awayGoals: 0, homeWins: 0}};
+                            decades.set(decadeStart, decade);
+                        }}
+                        decade.matches++;
+                        decade.homeGoals += d.home_score;
+                        decade.awayGoals += d.away_score;
+                        if (d.home_score > d.away_score) decade.homeWins++;
+                    }}
+                }}
+                return {{matches: resultsData.length, calendar, decades, tournaments, scores, teams, neutral}};
+            }});
+            return resultsAggregateCache;
+        }}
 
-            gradient.append('stop')
-                .attr('offset', '100%')
-                .attr('stop-color', colors.lime)
-                .attr('stop-opacity', 0.1);
+        // Same for goalscorersData: one pass for every goal-based chart
+        let goalAggregateCache = null;
+
+        function goalAggregates() {{
+            if (goalAggregateCache) return goalAggregateCache;
+            goalAggregateCache = measure('aggregate goalscorersData', () => {{
+                const months = new Int32Array(12);
+                // Five-minute bins from 0 (minutes 1-4) to 120
+                const minutes = new Int32Array(25);
+                let penalties = 0, ownGoals = 0;
+                if (matchGoals) {{
+                    const {{offsets, minute, flags, flagBits}} = matchGoals;
+                    for (let i = 0; i < resultsDates.month.length; i++) {{
+                        for (let j = offsets[i]; j < offsets[i + 1]; j++) {{
+                            months[resultsDates.month[i]]++;
+                            if (minute[j] > 0 && minute[j] <= 120) minutes[Math.floor(minute[j] / 5)]++;
+                            if (flags[j] & flagBits.penalty) penalties++;
+                            if (flags[j] & flagBits.ownGoal) ownGoals++;
+                        }}
+                    }}
+                    return {{goals: matchGoals.scorer.length, months, minutes, penalties, ownGoals}};
+                }}
+                for (let i = 0; i < goalscorersData.length; i++) {{
+                    const d = goalscorersData[i];
+                    months[goalscorersDates.month[i]]++;
+                    if (d.minute > 0 && d.minute <= 120) minutes[Math.floor(d.minute / 5)]++;
+                    if (d.penalty) penalties++;
+                    if (d.own_goal) ownGoals++;
+                }}
+                return {{goals: goalscorersData.length, months, minutes, penalties, ownGoals}};
+            }});
+            return goalAggregateCache;
+        }}
 
-            svg.append('path')
-                .datum(data)
-                .attr('fill', 'url(#area-gradient)')
-                .attr('d', area);
+        // Binary heap; compare(a, b) < 0 puts a nearer the top
+        class Heap {{
+            constructor(compare) {{
+                this.compare = compare;
+                this.items = [];
+            }}
 
-            svg.append('path')
-                .datum(data)
+            get size() {{
+                return this.items.length;
+            }}
+
+            peek() {{
+                return this.items[0];
+            }}
+
+            push(item) {{
+                const items = this.items;
+                items.push(item);
+                let i = items.length - 1;
+                while (i > 0) {{
+                    const parent = (i - 1) >> 1;
+                    if (this.compare(items[i], items[parent]) >= 0) break;
+                    [items[i], items[parent]] = [items[parent], items[i]];
+                    i = parent;
+                }}
+            }}
+
+            pop() {{
+                const items = this.items;
+                const top = items[0];
+                const last = items.pop();
+                if (items.length) {{
+                    items[0] = last;
+                    let i = 0;
+                    for (;;) {{
+                        const left = 2 * i + 1, right = left + 1;
+                        let next = i;
+                        if (left < items.length && this.compare(items[left], items[next]) < 0) next = left;
+                        if (right < items.length && this.compare(items[right], items[next]) < 0) next = right;
+                        if (next === i) break;
+                        [items[i], items[next]] = [items[next], items[i]];
+                        i = next;
+                    }}
+                }}
+                return top;
+            }}
+        }}
+
+        // Top-k scorers for a year range (and optional tournaments), merging
+        // the sorted leaderboard buckets with the threshold algorithm
+        const leaderboardLookups = new Map();
+
+        function leaderboardLookup(bucket) {{
+            let lookup = leaderboardLookups.get(bucket);
+            if (!lookup) {{
+                const lb = scorerLeaderboard;
+                lookup = new Map();
+                for (let j = lb.offsets[bucket]; j < lb.offsets[bucket + 1]; j++) {{
+                    lookup.set(lb.ids[j], lb.counts[j]);
+                }}
+                leaderboardLookups.set(bucket, lookup);
+            }}
+            return lookup;
+        }}
+
+        function topScorersInRange(k, fromYear, toYear, tournaments = null) {{
+            const lb = scorerLeaderboard;
+            // Unknown names match no bucket; -1 is the all-tournaments bucket
+            const wanted = tournaments && new Set(tournaments.map(t => lb.tournaments.indexOf(t)).filter(id => id >= 0));
+            const buckets = [];
+            for (let b = 0; b < lb.bucketYear.length; b++) {{
+                if (lb.bucketYear[b] < fromYear || lb.bucketYear[b] > toYear) continue;
+                if (wanted ? wanted.has(lb.bucketTournament[b]) : lb.bucketTournament[b] === -1) buckets.push(b);
+            }}
+
+            const cursors = new Heap((a, b) => lb.counts[b.pos] - lb.counts[a.pos]);
+            let threshold = 0;
+            buckets.forEach(b => {{
+                cursors.push({{bucket: b, pos: lb.offsets[b]}});
+                threshold += lb.counts[lb.offsets[b]];
+            }});
+
+            const best = new Heap((a, b) => a.goals - b.goals || b.id - a.id);
+            const seen = new Set();
+            while (cursors.size && !(best.size === k && best.peek().goals >= threshold)) {{
+                const cursor = cursors.pop();
+                const id = lb.ids[cursor.pos];
+                threshold -= lb.counts[cursor.pos];
+                if (cursor.pos + 1 < lb.offsets[cursor.bucket + 1]) {{
+                    cursor.pos++;
+                    threshold += lb.counts[cursor.pos];
+                    cursors.push(cursor);
+                }}
+                if (seen.has(id)) continue;
+                seen.add(id);
+
+                let goals = 0;
+                buckets.forEach(b => {{ goals += leaderboardLookup(b).get(id) || 0; }});
+                if (best.size < k) {{
+                    best.push({{id, goals}});
+                }} else if (best.compare({{id, goals}}, best.peek()) > 0) {{
+                    best.pop();
+                    best.push({{id, goals}});
+                }}
+            }}
+            return best.items.sort((a, b) => b.goals - a.goals || a.id - b.id);
+        }}
+
+        // Quantiles of the union of several sketches: merging KLL sketches for a
+        // query is just pooling their weighted items
+        function sketchQuantiles(sketches, qs) {{
+            const weighted = [];
+            sketches.forEach(levels => levels.forEach((items, h) => {{
+                items.forEach(value => weighted.push([value, 2 ** h]));
+            }}));
+            weighted.sort((a, b) => a[0] - b[0]);
+            const total = d3.sum(weighted, d => d[1]);
+            return qs.map(q => {{
+                let seen = 0;
+                for (const [value, weight] of weighted) {{
+                    seen += weight;
+                    if (seen >= q * total) return value;
+                }}
+                return null;
+            }});
+        }}
+
+        // Chart 1: Goals per year area chart
+        function renderStreamgraph() {{
+            const container = d3.select('#chart-streamgraph');
+            const width = container.node().clientWidth || 800;
+            const height = 350;
+            const margin = {{top: 20, right: 30, bottom: 40, left: 50}};
+
+            // Goals per year, LTTB-capped by the generator
+            const series = lineSeries.goalsByYear;
+
+            const svg = container.append('svg')
+                .attr('height', height);
+
+            const x = d3.scaleLinear()
+                .domain(d3.extent(series.x));
+
+            const y = d3.scaleLinear()
+                .domain([0, d3.max(series.y)])
+                .range([height - margin.bottom, margin.top]);
+
+            const area = d3.area()
+                .x(d => x(d.x))
+                .y0(y(0))
+                .y1(d => y(d.y))
+                .curve(d3.curveMonotoneX);
+
+            const line = d3.line()
+                .x(d => x(d.x))
+                .y(d => y(d.y))
+                .curve(d3.curveMonotoneX);
+
+            // Gradient
+            const gradient = svg.append('defs')
+                .append('linearGradient')
+                .attr('id', 'area-gradient')
+                .attr('x1', '0%').attr('y1', '0%')
+                .attr('x2', '0%').attr('y2', '100%');
+
+            gradient.append('stop')
+                .attr('offset', '0%')
+                .attr('stop-color', colors.lime)
+                .attr('stop-opacity', 0.8);
+
+            gradient.append('stop')
+                .attr('offset', '100%')
+                .attr('stop-color', colors.lime)
+                .attr('stop-opacity', 0.1);
+
+            const areaPath = svg.append('path')
+                .attr('fill', 'url(#area-gradient)');
+
+            const linePath = svg.append('path')
                 .attr('fill', 'none')
                 .attr('stroke', colors.lime)
-                .attr('stroke-width', 2)
-                .attr('d', d3.line()
-                    .x(d => x(d.year))
-                    .y(d => y(d.goals))
-                    .curve(d3.curveMonotoneX));
+                .attr('stroke-width', 2);
 
             // Axes
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).tickFormat(d3.format('d')));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(5));
+
+            // The series is re-sampled to the new width
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                const data = downsampleSeries(series, width - margin.left - margin.right);
+                areaPath.datum(data).attr('d', area);
+                linePath.datum(data).attr('d', line);
+                xAxis.call(d3.axisBottom(x).tickFormat(d3.format('d')));
+            }}
+            layout(width);
+            onResize(container, layout);
+        }}
+
+        // Chart 1b: Zoomable timeline over the time pyramid
+        const PYRAMID_LEVELS = ['day', 'week', 'month', 'year', 'decade'];
+
+        // Bucket number containing an epoch day (mirrors pyramid_bucket in the generator)
+        function pyramidBucket(level, day) {{
+            if (level === 'day') return day;
+            if (level === 'week') return Math.floor((day + 3) / 7);
+            const date = dayToDate(day);
+            const year = date.getUTCFullYear();
+            if (level === 'month') return year * 12 + date.getUTCMonth();
+            if (level === 'year') return year;
+            return Math.floor(year / 10);
+        }}
+
+        function pyramidBucketStart(level, bucket) {{
+            if (level === 'day') return bucket;
+            if (level === 'week') return bucket * 7 - 3;
+            const [year, month] = level === 'month' ? [Math.floor(bucket / 12), bucket % 12]
+                : level === 'year' ? [bucket, 0] : [bucket * 10, 0];
+            return Date.UTC(year, month, 1) / MS_PER_DAY;
+        }}
+
+        const timelineMetrics = {{
+            matches: (level, i) => level.matches[i],
+            goals: (level, i) => level.goals[i],
+            avgGoals: (level, i) => level.matches[i] ? level.goals[i] / level.matches[i] : null,
+            homeWinRate: (level, i) => level.matches[i] ? level.homeWins[i] / level.matches[i] : null
+        }};
+
+        function renderTimeline() {{
+            const container = d3.select('#chart-timeline');
+            let width = container.node().clientWidth || 800;
+            const height = 280;
+            const margin = {{top: 20, right: 30, bottom: 40, left: 50}};
+            let innerWidth = width - margin.left - margin.right;
+            const metricSelect = document.getElementById('timeline-metric');
+            const description = document.getElementById('timeline-description');
+
+            const {{firstDay, lastDay}} = timePyramid;
+            const x = d3.scaleUtc()
+                .domain([dayToDate(firstDay), dayToDate(lastDay)])
+                .range([margin.left, width - margin.right]);
+
+            const svg = container.append('svg')
+                .attr('width', width)
+                .attr('height', height);
+            const clipRect = svg.append('clipPath')
+                .attr('id', 'timeline-clip')
+                .append('rect')
+                .attr('x', margin.left)
+                .attr('y', margin.top)
+                .attr('width', innerWidth)
+                .attr('height', height - margin.top - margin.bottom);
+
+            const path = svg.append('path')
+                .attr('clip-path', 'url(#timeline-clip)')
+                .attr('fill', colors.cyan)
+                .attr('fill-opacity', 0.35)
+                .attr('stroke', colors.cyan)
+                .attr('stroke-width', 1.5);
+            const xAxis = svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
+            const yAxis = svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(${{margin.left}},0)`);
+
+            let currentX = x;
+
+            function draw() {{
+                const [d0, d1] = currentX.domain().map(date => Math.floor(date / MS_PER_DAY));
+                // Finest loaded level that still fits one bucket per pixel
+                const loaded = name => timePyramid[name] || (timePyramidFine && timePyramidFine[name]);
+                const levelName = PYRAMID_LEVELS.find(name =>
+                    loaded(name) && pyramidBucket(name, d1) - pyramidBucket(name, d0) + 1 <= innerWidth) || 'decade';
+                const level = loaded(levelName);
+                const metric = timelineMetrics[metricSelect.value];
+                const start = Math.max(0, pyramidBucket(levelName, d0) - level.origin - 1);
+                const end = Math.min(level.matches.length - 1, pyramidBucket(levelName, d1) - level.origin + 1);
+
+                const points = [];
+                for (let i = start; i <= end; i++) {{
+                    points.push({{date: dayToDate(pyramidBucketStart(levelName, level.origin + i)), value: metric(level, i)}});
+                }}
+                const y = d3.scaleLinear()
+                    .domain([0, d3.max(points, d => d.value) || 1])
+                    .nice()
+                    .range([height - margin.bottom, margin.top]);
+
+                path.datum(points)
+                    .attr('d', d3.area()
+                        .defined(d => d.value !== null)
+                        .x(d => currentX(d.date))
+                        .y0(y(0))
+                        .y1(d => y(d.value))
+                        .curve(levelName === 'day' ? d3.curveStepAfter : d3.curveMonotoneX));
+                xAxis.call(d3.axisBottom(currentX).ticks(width / 100));
+                yAxis.call(d3.axisLeft(y).ticks(5).tickFormat(metricSelect.value === 'homeWinRate' ? d3.format('.0%') : null));
+                description.textContent = `${{points.length.toLocaleString()}} ${{levelName}} buckets shown · scroll to zoom, drag to pan`;
+            }}
+
+            const zoom = d3.zoom()
+                .scaleExtent([1, (lastDay - firstDay) / 30])
+                .translateExtent([[margin.left, 0], [width - margin.right, height]])
+                .extent([[margin.left, 0], [width - margin.right, height]])
+                .on('zoom', event => {{
+                    currentX = event.transform.rescaleX(x);
+                    draw();
+                }});
+            svg.call(zoom);
+            metricSelect.addEventListener('change', draw);
+            draw();
+            // A zoomed-in view switches to day or week buckets once they load
+            whenLoaded(['timePyramidFine'], draw);
+
+            // Keeps the current zoom: the transform is re-applied to the new range
+            onResize(container, newWidth => {{
+                width = newWidth;
+                innerWidth = width - margin.left - margin.right;
+                svg.attr('width', width);
+                clipRect.attr('width', innerWidth);
+                x.range([margin.left, width - margin.right]);
+                zoom.translateExtent([[margin.left, 0], [width - margin.right, height]])
+                    .extent([[margin.left, 0], [width - margin.right, height]]);
+                currentX = d3.zoomTransform(svg.node()).rescaleX(x);
+                draw();
+            }});
         }}
 
         // Chart 2: Calendar heatmap
@@ -615,25 +3362,18 @@ def main():
             const height = 250;
             const margin = {{top: 30, right: 20, bottom: 30, left: 60}};
 
-            const matchesByDayMonth = d3.rollup(resultsData,
-                v => v.length,
-                d => d.date.getDay(),
-                d => d.date.getMonth()
-            );
+            const counts = resultsAggregates().calendar;
 
             const data = [];
             for (let day = 0; day < 7; day++) {{
                 for (let month = 0; month < 12; month++) {{
-                    const count = matchesByDayMonth.get(day)?.get(month) || 0;
-                    data.push({{day, month, count}});
+                    data.push({{day, month, count: counts[day * 12 + month]}});
                 }}
             }}
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
-            const cellWidth = (width - margin.left - margin.right) / 12;
             const cellHeight = (height - margin.top - margin.bottom) / 7;
 
             const colorScale = d3.scaleSequential(d3.interpolate(colors.bgElevated, colors.cyan))
@@ -646,9 +3386,7 @@ def main():
                 .data(data)
                 .enter()
                 .append('rect')
-                .attr('x', d => margin.left + d.month * cellWidth)
                 .attr('y', d => margin.top + d.day * cellHeight)
-                .attr('width', cellWidth - 2)
                 .attr('height', cellHeight - 2)
                 .attr('fill', d => colorScale(d.count))
                 .attr('rx', 2)
@@ -670,16 +3408,25 @@ def main():
                 .style('font-size', '9px')
                 .text(d => d);
 
-            svg.selectAll('.month-label')
+            const monthLabels = svg.selectAll('.month-label')
                 .data(months)
                 .enter()
                 .append('text')
                 .attr('class', 'axis')
-                .attr('x', (d, i) => margin.left + i * cellWidth + cellWidth / 2)
                 .attr('y', margin.top - 10)
                 .attr('text-anchor', 'middle')
                 .style('font-size', '9px')
                 .text(d => d);
+
+            function layout(width) {{
+                const cellWidth = (width - margin.left - margin.right) / 12;
+                svg.attr('width', width);
+                cells.attr('x', d => margin.left + d.month * cellWidth)
+                    .attr('width', cellWidth - 2);
+                monthLabels.attr('x', (d, i) => margin.left + i * cellWidth + cellWidth / 2);
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 3: Scoring trend
@@ -689,46 +3436,47 @@ def main():
             const height = 250;
             const margin = {{top: 20, right: 30, bottom: 40, left: 50}};
 
-            const avgByYear = d3.rollup(resultsData,
-                v => d3.mean(v, d => d.total_goals),
-                d => d.year
-            );
-
-            const data = Array.from(avgByYear, ([year, avg]) => ({{year, avg}}))
-                .filter(d => d.year >= 1900)
-                .sort((a, b) => a.year - b.year);
+            // Goals per match by year, LTTB-capped by the generator
+            const series = lineSeries.avgGoalsByYear;
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleLinear()
-                .domain(d3.extent(data, d => d.year))
-                .range([margin.left, width - margin.right]);
+                .domain(d3.extent(series.x));
 
             const y = d3.scaleLinear()
-                .domain([0, d3.max(data, d => d.avg) * 1.1])
+                .domain([0, d3.max(series.y) * 1.1])
                 .range([height - margin.bottom, margin.top]);
 
-            svg.append('path')
-                .datum(data)
+            const line = d3.line()
+                .x(d => x(d.x))
+                .y(d => y(d.y))
+                .curve(d3.curveMonotoneX);
+
+            const linePath = svg.append('path')
                 .attr('fill', 'none')
                 .attr('stroke', colors.amber)
-                .attr('stroke-width', 2)
-                .attr('d', d3.line()
-                    .x(d => x(d.year))
-                    .y(d => y(d.avg))
-                    .curve(d3.curveMonotoneX));
+                .attr('stroke-width', 2);
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).tickFormat(d3.format('d')));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(5));
+
+            // The series is re-sampled to the new width
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                linePath.datum(downsampleSeries(series, width - margin.left - margin.right)).attr('d', line);
+                xAxis.call(d3.axisBottom(x).tickFormat(d3.format('d')));
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 4: Home vs Away
@@ -738,24 +3486,17 @@ def main():
             const height = 250;
             const margin = {{top: 20, right: 30, bottom: 40, left: 50}};
 
-            const byDecade = d3.rollup(resultsData.filter(d => d.decade >= 1900),
-                v => ({{
-                    home: d3.mean(v, d => d.home_score),
-                    away: d3.mean(v, d => d.away_score)
-                }}),
-                d => d.decade
-            );
-
-            const data = Array.from(byDecade, ([decade, scores]) => ({{decade, ...scores}}))
-                .sort((a, b) => a.decade - b.decade);
+            const data = Array.from(resultsAggregates().decades, ([decade, stats]) => ({{
+                decade,
+                home: stats.homeGoals / stats.matches,
+                away: stats.awayGoals / stats.matches
+            }})).sort((a, b) => a.decade - b.decade);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleBand()
                 .domain(data.map(d => d.decade))
-                .range([margin.left, width - margin.right])
                 .padding(0.3);
 
             const y = d3.scaleLinear()
@@ -763,36 +3504,43 @@ def main():
                 .range([height - margin.bottom, margin.top]);
 
             // Home bars
-            svg.selectAll('.bar-home')
+            const homeBars = svg.selectAll('.bar-home')
                 .data(data)
                 .enter()
                 .append('rect')
-                .attr('x', d => x(d.decade))
                 .attr('y', d => y(d.home))
-                .attr('width', x.bandwidth() / 2 - 2)
                 .attr('height', d => y(0) - y(d.home))
                 .attr('fill', colors.emerald);
 
             // Away bars
-            svg.selectAll('.bar-away')
+            const awayBars = svg.selectAll('.bar-away')
                 .data(data)
                 .enter()
                 .append('rect')
-                .attr('x', d => x(d.decade) + x.bandwidth() / 2)
                 .attr('y', d => y(d.away))
-                .attr('width', x.bandwidth() / 2 - 2)
                 .attr('height', d => y(0) - y(d.away))
                 .attr('fill', colors.coral);
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).tickFormat(d => d + 's'));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(5));
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                homeBars.attr('x', d => x(d.decade))
+                    .attr('width', x.bandwidth() / 2 - 2);
+                awayBars.attr('x', d => x(d.decade) + x.bandwidth() / 2)
+                    .attr('width', x.bandwidth() / 2 - 2);
+                xAxis.call(d3.axisBottom(x).tickFormat(d => d + 's'));
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 5: Monthly distribution
@@ -803,42 +3551,47 @@ def main():
             const margin = {{top: 20, right: 20, bottom: 40, left: 50}};
 
             const months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
-            const goalsByMonth = d3.rollup(goalscorersData, v => v.length, d => d.date.getMonth());
-            const data = months.map((name, i) => ({{name, goals: goalsByMonth.get(i) || 0}}));
+            const goalsByMonth = goalAggregates().months;
+            const data = months.map((name, i) => ({{name, goals: goalsByMonth[i]}}));
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleBand()
                 .domain(months)
-                .range([margin.left, width - margin.right])
                 .padding(0.2);
 
             const y = d3.scaleLinear()
                 .domain([0, d3.max(data, d => d.goals)])
                 .range([height - margin.bottom, margin.top]);
 
-            svg.selectAll('rect')
+            const bars = svg.selectAll('rect')
                 .data(data)
                 .enter()
                 .append('rect')
-                .attr('x', d => x(d.name))
                 .attr('y', d => y(d.goals))
-                .attr('width', x.bandwidth())
                 .attr('height', d => y(0) - y(d.goals))
                 .attr('fill', colors.cyan)
                 .attr('rx', 3);
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(5));
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                bars.attr('x', d => x(d.name))
+                    .attr('width', x.bandwidth());
+                xAxis.call(d3.axisBottom(x));
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 6: Tournament distribution (treemap)
@@ -847,21 +3600,16 @@ def main():
             const width = container.node().clientWidth || 400;
             const height = 300;
 
-            const tournamentCounts = d3.rollup(resultsData, v => v.length, d => d.tournament);
-            const data = Array.from(tournamentCounts, ([name, value]) => ({{name, value}}))
+            const data = Array.from(resultsAggregates().tournaments, ([name, value]) => ({{name, value}}))
                 .sort((a, b) => b.value - a.value)
                 .slice(0, 10);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const root = d3.hierarchy({{children: data}})
                 .sum(d => d.value);
-
-            d3.treemap()
-                .size([width, height])
-                .padding(2)(root);
+            const treemap = d3.treemap().padding(2);
 
             const color = d3.scaleOrdinal()
                 .domain(data.map(d => d.name))
@@ -870,12 +3618,9 @@ def main():
             const nodes = svg.selectAll('g')
                 .data(root.leaves())
                 .enter()
-                .append('g')
-                .attr('transform', d => `translate(${{d.x0}},${{d.y0}})`);
+                .append('g');
 
-            nodes.append('rect')
-                .attr('width', d => d.x1 - d.x0)
-                .attr('height', d => d.y1 - d.y0)
+            const rects = nodes.append('rect')
                 .attr('fill', d => color(d.data.name))
                 .attr('rx', 4)
                 .on('mouseover', (event, d) => {{
@@ -883,17 +3628,135 @@ def main():
                 }})
                 .on('mouseout', hideTooltip);
 
-            nodes.append('text')
+            const labels = nodes.append('text')
                 .attr('x', 5)
                 .attr('y', 15)
-                .text(d => {{
+                .attr('fill', colors.bg)
+                .style('font-size', '10px')
+                .style('font-weight', '600');
+
+            // The tiles are re-laid out over the same summed hierarchy
+            function layout(width) {{
+                svg.attr('width', width);
+                treemap.size([width, height])(root);
+                nodes.attr('transform', d => `translate(${{d.x0}},${{d.y0}})`);
+                rects.attr('width', d => d.x1 - d.x0)
+                    .attr('height', d => d.y1 - d.y0);
+                labels.text(d => {{
                     const width = d.x1 - d.x0;
                     if (width < 60) return '';
                     return d.data.name.length > 15 ? d.data.name.slice(0, 12) + '...' : d.data.name;
+                }});
+            }}
+            layout(width);
+            onResize(container, layout);
+        }}
+
+        // Chart 6b: Rivalry network at the generator's precomputed layout
+        function renderRivalry() {{
+            const container = d3.select('#chart-rivalry');
+            const width = container.node().clientWidth || 800;
+            const height = 500;
+            const margin = 20;
+            const graph = rivalryGraph;
+            if (!graph.teams.length) return;
+
+            const nodes = graph.teams.map((team, i) => ({{
+                team, matches: graph.matches[i], x: graph.x[i], y: graph.y[i]
+            }}));
+            const links = Array.from(graph.weight, (weight, i) => ({{
+                source: nodes[graph.source[i]], target: nodes[graph.target[i]], weight, distance: graph.distance[i]
+            }}));
+
+            const [x0, x1] = d3.extent(graph.x);
+            const [y0, y1] = d3.extent(graph.y);
+            const radius = d3.scaleSqrt()
+                .domain([0, d3.max(graph.matches)])
+                .range([2, 10]);
+            const strokeWidth = d3.scaleSqrt()
+                .domain(d3.extent(graph.weight))
+                .range([0.5, 4]);
+
+            const svg = container.append('svg')
+                .attr('height', height);
+            const view = svg.append('g');
+
+            const link = view.append('g')
+                .attr('stroke', colors.border)
+                .attr('stroke-opacity', 0.8)
+                .selectAll('line')
+                .data(links)
+                .enter()
+                .append('line');
+
+            const node = view.append('g')
+                .selectAll('circle')
+                .data(nodes)
+                .enter()
+                .append('circle')
+                .attr('fill', colors.cyan)
+                .attr('stroke', colors.bg)
+                .style('cursor', 'pointer')
+                .on('mouseover', (event, d) => {{
+                    showTooltip(event, `<strong>${{d.team}}</strong><br>${{d.matches.toLocaleString()}} matches`);
                 }})
-                .attr('fill', colors.bg)
-                .style('font-size', '10px')
-                .style('font-weight', '600');
+                .on('mouseout', hideTooltip)
+                .on('click', (event, d) => {{
+                    if (!event.defaultPrevented) openTeamDrilldown(d.team);
+                }});
+
+            function draw() {{
+                link.attr('x1', d => d.source.x)
+                    .attr('y1', d => d.source.y)
+                    .attr('x2', d => d.target.x)
+                    .attr('y2', d => d.target.y);
+                node.attr('cx', d => d.x)
+                    .attr('cy', d => d.y);
+            }}
+            draw();
+
+            // One scale for both axes keeps the layout's distances; strokes
+            // and radii are divided by it to stay the same size on screen
+            function layout(width) {{
+                const scale = Math.min((width - 2 * margin) / (x1 - x0 || 1), (height - 2 * margin) / (y1 - y0 || 1));
+                const offsetX = (width - (x1 - x0) * scale) / 2 - x0 * scale;
+                const offsetY = (height - (y1 - y0) * scale) / 2 - y0 * scale;
+                svg.attr('width', width);
+                view.attr('transform', `translate(${{offsetX}},${{offsetY}}) scale(${{scale}})`);
+                link.attr('stroke-width', d => strokeWidth(d.weight) / scale);
+                node.attr('r', d => radius(d.matches) / scale)
+                    .attr('stroke-width', 0.5 / scale);
+            }}
+            layout(width);
+            onResize(container, layout);
+
+            // The page never simulates on load: the forces (same as the
+            // generator's) only run while a node is being dragged
+            let simulation = null;
+            node.call(d3.drag()
+                .on('start', (event, d) => {{
+                    if (!simulation) {{
+                        simulation = d3.forceSimulation(nodes)
+                            .force('link', d3.forceLink(links).distance(l => l.distance))
+                            .force('charge', d3.forceManyBody().strength({LAYOUT_CHARGE}).theta({LAYOUT_THETA}))
+                            .force('x', d3.forceX(0).strength({LAYOUT_GRAVITY}))
+                            .force('y', d3.forceY(0).strength({LAYOUT_GRAVITY}))
+                            .alpha(0)
+                            .on('tick', draw);
+                    }}
+                    simulation.alphaTarget(0.1).restart();
+                    d.fx = d.x;
+                    d.fy = d.y;
+                }})
+                .on('drag', (event, d) => {{
+                    d.fx = event.x;
+                    d.fy = event.y;
+                }})
+                .on('end', (event, d) => {{
+                    simulation.alphaTarget(0);
+                    d.fx = null;
+                    d.fy = null;
+                }}));
         }}
 
         // Chart 7: Neutral venues
@@ -902,8 +3765,8 @@ def main():
             const width = container.node().clientWidth || 400;
             const height = 250;
 
-            const neutral = resultsData.filter(d => d.neutral === 'True' || d.neutral === true).length;
-            const nonNeutral = resultsData.length - neutral;
+            const {{matches, neutral}} = resultsAggregates();
+            const nonNeutral = matches - neutral;
 
             const data = [
                 {{label: 'Regular', value: nonNeutral, color: colors.cyan}},
@@ -911,21 +3774,17 @@ def main():
             ];
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
-            const radius = Math.min(width, height) / 2 - 40;
-            const g = svg.append('g')
-                .attr('transform', `translate(${{width/2}},${{height/2}})`);
+            const g = svg.append('g');
 
             const pie = d3.pie().value(d => d.value);
-            const arc = d3.arc().innerRadius(radius * 0.6).outerRadius(radius);
+            const arc = d3.arc();
 
-            g.selectAll('path')
+            const slices = g.selectAll('path')
                 .data(pie(data))
                 .enter()
                 .append('path')
-                .attr('d', arc)
                 .attr('fill', d => d.data.color)
                 .on('mouseover', (event, d) => {{
                     showTooltip(event, `<strong>${{d.data.label}}</strong><br>${{d.data.value.toLocaleString()}} matches (${{(d.data.value / resultsData.length * 100).toFixed(1)}}%)`);
@@ -946,6 +3805,16 @@ def main():
                 .style('fill', colors.textTertiary)
                 .style('font-size', '10px')
                 .text('Type');
+
+            function layout(width) {{
+                const radius = Math.min(width, height) / 2 - 40;
+                svg.attr('width', width);
+                g.attr('transform', `translate(${{width/2}},${{height/2}})`);
+                arc.innerRadius(radius * 0.6).outerRadius(radius);
+                slices.attr('d', arc);
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 8: Score distribution
@@ -955,48 +3824,48 @@ def main():
             const height = 250;
             const margin = {{top: 20, right: 20, bottom: 40, left: 60}};
 
-            const scoreCounts = d3.rollup(resultsData,
-                v => v.length,
-                d => `${{d.home_score}}-${{d.away_score}}`
-            );
-
-            const data = Array.from(scoreCounts, ([score, count]) => ({{score, count}}))
+            const data = Array.from(resultsAggregates().scores, ([score, count]) => ({{score, count}}))
                 .sort((a, b) => b.count - a.count)
                 .slice(0, 15);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleLinear()
-                .domain([0, d3.max(data, d => d.count)])
-                .range([margin.left, width - margin.right]);
+                .domain([0, d3.max(data, d => d.count)]);
 
             const y = d3.scaleBand()
                 .domain(data.map(d => d.score))
                 .range([margin.top, height - margin.bottom])
                 .padding(0.2);
 
-            svg.selectAll('rect')
+            const bars = svg.selectAll('rect')
                 .data(data)
                 .enter()
                 .append('rect')
                 .attr('x', margin.left)
                 .attr('y', d => y(d.score))
-                .attr('width', d => x(d.count) - margin.left)
                 .attr('height', y.bandwidth())
                 .attr('fill', colors.lime)
                 .attr('rx', 3);
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).ticks(5));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y));
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                bars.attr('width', d => x(d.count) - margin.left);
+                xAxis.call(d3.axisBottom(x).ticks(5));
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 9: Goal minute distribution
@@ -1006,52 +3875,158 @@ def main():
             const height = 250;
             const margin = {{top: 20, right: 20, bottom: 40, left: 50}};
 
-            const minuteData = goalscorersData.filter(d => d.minute && d.minute > 0 && d.minute <= 120);
-            const byMinute = d3.rollup(minuteData, v => v.length, d => Math.floor(d.minute / 5) * 5);
-
-            const data = Array.from(byMinute, ([minute, count]) => ({{minute, count}}))
-                .sort((a, b) => a.minute - b.minute);
+            const data = Array.from(goalAggregates().minutes, (count, bin) => ({{minute: bin * 5, count}}))
+                .filter(d => d.count);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleLinear()
-                .domain([0, 120])
-                .range([margin.left, width - margin.right]);
+                .domain([0, 120]);
 
             const y = d3.scaleLinear()
                 .domain([0, d3.max(data, d => d.count)])
                 .range([height - margin.bottom, margin.top]);
 
-            svg.selectAll('rect')
+            const bars = svg.selectAll('rect')
                 .data(data)
                 .enter()
                 .append('rect')
-                .attr('x', d => x(d.minute))
                 .attr('y', d => y(d.count))
-                .attr('width', (width - margin.left - margin.right) / 24 - 1)
                 .attr('height', d => y(0) - y(d.count))
                 .attr('fill', colors.emerald);
 
             // Half-time marker
-            svg.append('line')
-                .attr('x1', x(45))
-                .attr('x2', x(45))
+            const halfTime = svg.append('line')
                 .attr('y1', margin.top)
                 .attr('y2', height - margin.bottom)
                 .attr('stroke', colors.coral)
                 .attr('stroke-dasharray', '4');
 
-            svg.append('g')
+            // Interquartile band and median from the merged decade sketches
+            const [q1, median, q3] = sketchQuantiles(Object.values(minuteSketches.decade), [0.25, 0.5, 0.75]);
+            const quartiles = svg.append('g');
+            if (median !== null) {{
+                quartiles.append('rect')
+                    .attr('y', margin.top)
+                    .attr('height', 4)
+                    .attr('fill', colors.amber)
+                    .attr('opacity', 0.6)
+                    .on('mouseover', event => showTooltip(event, `Middle 50% of goals: ${{q1}}'-${{q3}}'`))
+                    .on('mouseout', hideTooltip);
+
+                quartiles.append('line')
+                    .attr('y1', margin.top)
+                    .attr('y2', height - margin.bottom)
+                    .attr('stroke', colors.amber)
+                    .on('mouseover', event => showTooltip(event, `Median goal minute: ${{median}}'`))
+                    .on('mouseout', hideTooltip);
+            }}
+
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).ticks(10));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(5));
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                bars.attr('x', d => x(d.minute))
+                    .attr('width', (width - margin.left - margin.right) / 24 - 1);
+                halfTime.attr('x1', x(45)).attr('x2', x(45));
+                quartiles.select('rect').attr('x', x(q1)).attr('width', x(q3) - x(q1));
+                quartiles.select('line').attr('x1', x(median)).attr('x2', x(median));
+                xAxis.call(d3.axisBottom(x).ticks(10));
+            }}
+            layout(width);
+            onResize(container, layout);
+        }}
+
+        // Goal minute spread per decade, tournament or team; each group's
+        // quantiles come from its own sketch, so no raw minutes are needed
+        const MINUTE_GROUP_LIMIT = 12;
+
+        function minuteGroups(kind) {{
+            const weight = levels => d3.sum(levels, (items, h) => items.length * 2 ** h);
+            const entries = Object.entries(minuteSketches[kind]).map(([key, levels]) => ({{key, levels, goals: weight(levels)}}));
+            // The latest decades in order; tournaments and teams with the most goals
+            const shown = kind === 'decade'
+                ? entries.sort((a, b) => a.key - b.key).slice(-MINUTE_GROUP_LIMIT)
+                : entries.sort((a, b) => b.goals - a.goals).slice(0, MINUTE_GROUP_LIMIT);
+            return shown.map(({{key, levels, goals}}) => {{
+                const [p10, q1, median, q3, p90] = sketchQuantiles([levels], [0.1, 0.25, 0.5, 0.75, 0.9]);
+                return {{label: kind === 'decade' ? `${{key}}s` : key, goals, p10, q1, median, q3, p90}};
+            }});
+        }}
+
+        function renderMinuteGroups() {{
+            const container = d3.select('#chart-minute-groups');
+            const kindSelect = document.getElementById('minute-groups-kind');
+            let width = container.node().clientWidth || 800;
+            const margin = {{top: 10, right: 30, bottom: 40, left: 170}};
+            const height = margin.top + margin.bottom + MINUTE_GROUP_LIMIT * 24;
+
+            const svg = container.append('svg')
+                .attr('height', height);
+            const x = d3.scaleLinear()
+                .domain([0, 120]);
+            const y = d3.scaleBand()
+                .range([margin.top, height - margin.bottom])
+                .padding(0.3);
+            const xAxis = svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
+            const yAxis = svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(${{margin.left}},0)`);
+            const rows = svg.append('g');
+
+            function layout(newWidth) {{
+                width = newWidth;
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                const group = rows.selectAll('g.minute-group');
+                group.select('line.whisker')
+                    .attr('x1', d => x(d.p10))
+                    .attr('x2', d => x(d.p90));
+                group.select('rect')
+                    .attr('x', d => x(d.q1))
+                    .attr('width', d => Math.max(1, x(d.q3) - x(d.q1)));
+                group.select('line.median')
+                    .attr('x1', d => x(d.median))
+                    .attr('x2', d => x(d.median));
+                xAxis.call(d3.axisBottom(x).ticks(12).tickFormat(minute => `${{minute}}'`));
+            }}
+
+            function update() {{
+                const data = minuteGroups(kindSelect.value);
+                y.domain(data.map(d => d.label));
+                rows.selectAll('g.minute-group')
+                    .data(data, d => d.label)
+                    .join(enter => enter.append('g')
+                        .attr('class', 'minute-group')
+                        .call(g => g.append('line').attr('class', 'whisker').attr('stroke', colors.cyan))
+                        .call(g => g.append('rect').attr('fill', colors.emerald).attr('opacity', 0.7).attr('rx', 2))
+                        .call(g => g.append('line').attr('class', 'median').attr('stroke', colors.amber).attr('stroke-width', 2)))
+                    .attr('transform', d => `translate(0,${{y(d.label)}})`)
+                    .on('mouseover', (event, d) => showTooltip(event,
+                        `<strong>${{d.label}}</strong><br>Median ${{d.median}}', middle 50% ${{d.q1}}'-${{d.q3}}'<br>` +
+                        `10th-90th percentile ${{d.p10}}'-${{d.p90}}' · ~${{d.goals.toLocaleString()}} timed goals`))
+                    .on('mouseout', hideTooltip)
+                    .call(g => g.select('line.whisker').attr('y1', y.bandwidth() / 2).attr('y2', y.bandwidth() / 2))
+                    .call(g => g.select('rect').attr('height', y.bandwidth()))
+                    .call(g => g.select('line.median').attr('y1', 0).attr('y2', y.bandwidth()));
+                yAxis.call(d3.axisLeft(y));
+                layout(width);
+            }}
+
+            kindSelect.addEventListener('change', update);
+            update();
+            onResize(container, layout);
         }}
 
         // Chart 10: Goal types
@@ -1060,9 +4035,8 @@ def main():
             const width = container.node().clientWidth || 400;
             const height = 250;
 
-            const penalties = goalscorersData.filter(d => d.penalty).length;
-            const ownGoals = goalscorersData.filter(d => d.own_goal).length;
-            const regular = goalscorersData.length - penalties - ownGoals;
+            const {{goals, penalties, ownGoals}} = goalAggregates();
+            const regular = goals - penalties - ownGoals;
 
             const data = [
                 {{label: 'Regular', value: regular, color: colors.lime}},
@@ -1071,70 +4045,81 @@ def main():
             ];
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
-            const radius = Math.min(width, height) / 2 - 40;
-            const g = svg.append('g')
-                .attr('transform', `translate(${{width/2}},${{height/2}})`);
+            const g = svg.append('g');
 
             const pie = d3.pie().value(d => d.value);
-            const arc = d3.arc().innerRadius(0).outerRadius(radius);
+            const arc = d3.arc().innerRadius(0);
 
-            g.selectAll('path')
+            const slices = g.selectAll('path')
                 .data(pie(data))
                 .enter()
                 .append('path')
-                .attr('d', arc)
                 .attr('fill', d => d.data.color)
                 .on('mouseover', (event, d) => {{
-                    showTooltip(event, `<strong>${{d.data.label}}</strong><br>${{d.data.value.toLocaleString()}} goals (${{(d.data.value / goalscorersData.length * 100).toFixed(1)}}%)`);
+                    showTooltip(event, `<strong>${{d.data.label}}</strong><br>${{d.data.value.toLocaleString()}} goals (${{(d.data.value / goals * 100).toFixed(1)}}%)`);
                 }})
                 .on('mouseout', hideTooltip);
+
+            function layout(width) {{
+                svg.attr('width', width);
+                g.attr('transform', `translate(${{width/2}},${{height/2}})`);
+                arc.outerRadius(Math.min(width, height) / 2 - 40);
+                slices.attr('d', arc);
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 11: Top scorers
-        function renderTopScorers() {{
+        function renderTopScorers(fromYear = null, toYear = null, tournament = null) {{
             const container = d3.select('#chart-top-scorers');
+            container.selectAll('*').remove();
             const width = container.node().clientWidth || 400;
             const height = 300;
             const margin = {{top: 20, right: 20, bottom: 20, left: 120}};
 
-            const scorerCounts = d3.rollup(goalscorersData, v => v.length, d => d.scorer);
-            const data = Array.from(scorerCounts, ([scorer, goals]) => ({{scorer, goals}}))
-                .sort((a, b) => b.goals - a.goals)
-                .slice(0, 15);
+            // All-time: ids are ranked by goal count, so the leaders are a prefix.
+            // A year window or a tournament goes through the leaderboard index instead.
+            const data = fromYear === null && tournament === null
+                ? Array.from({{length: Math.min(15, scorerTable.name.length)}}, (_, id) => ({{
+                    scorer: scorerTable.name[id],
+                    goals: scorerTable.goals[id]
+                }}))
+                : topScorersInRange(15, fromYear ?? -Infinity, toYear ?? Infinity,
+                    tournament === null ? null : [tournament]).map(d => ({{
+                    scorer: scorerTable.name[d.id],
+                    goals: d.goals
+                }}));
+            if (!data.length) return;
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleLinear()
-                .domain([0, d3.max(data, d => d.goals)])
-                .range([margin.left, width - margin.right]);
+                .domain([0, d3.max(data, d => d.goals)]);
 
             const y = d3.scaleBand()
                 .domain(data.map(d => d.scorer))
                 .range([margin.top, height - margin.bottom])
                 .padding(0.2);
 
-            svg.selectAll('rect')
+            const bars = svg.selectAll('rect')
                 .data(data)
                 .enter()
                 .append('rect')
                 .attr('x', margin.left)
                 .attr('y', d => y(d.scorer))
-                .attr('width', d => x(d.goals) - margin.left)
                 .attr('height', y.bandwidth())
                 .attr('fill', colors.cyan)
                 .attr('rx', 3);
 
             // Goal count labels
-            svg.selectAll('.goal-label')
+            const labels = svg.selectAll('.goal-label')
                 .data(data)
                 .enter()
                 .append('text')
-                .attr('x', d => x(d.goals) + 5)
                 .attr('y', d => y(d.scorer) + y.bandwidth() / 2)
                 .attr('dominant-baseline', 'middle')
                 .style('fill', colors.textTertiary)
@@ -1147,6 +4132,15 @@ def main():
                 .call(d3.axisLeft(y))
                 .selectAll('text')
                 .style('font-size', '9px');
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                bars.attr('width', d => x(d.goals) - margin.left);
+                labels.attr('x', d => x(d.goals) + 5);
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 12: Top teams
@@ -1156,153 +4150,242 @@ def main():
             const height = 300;
             const margin = {{top: 20, right: 20, bottom: 60, left: 50}};
 
-            // Calculate wins per team
-            const wins = new Map();
-            resultsData.forEach(d => {{
-                if (d.home_score > d.away_score) {{
-                    wins.set(d.home_team, (wins.get(d.home_team) || 0) + 1);
-                }} else if (d.away_score > d.home_score) {{
-                    wins.set(d.away_team, (wins.get(d.away_team) || 0) + 1);
-                }}
-            }});
-
-            const data = Array.from(wins, ([team, count]) => ({{team, wins: count}}))
+            const data = Array.from(resultsAggregates().teams, ([team, stats]) => ({{team, wins: stats.wins}}))
+                .filter(d => d.wins > 0)
                 .sort((a, b) => b.wins - a.wins)
                 .slice(0, 20);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleBand()
                 .domain(data.map(d => d.team))
-                .range([margin.left, width - margin.right])
                 .padding(0.2);
 
             const y = d3.scaleLinear()
                 .domain([0, d3.max(data, d => d.wins)])
                 .range([height - margin.bottom, margin.top]);
 
-            svg.selectAll('rect')
+            const bars = svg.selectAll('rect')
                 .data(data)
                 .enter()
                 .append('rect')
-                .attr('x', d => x(d.team))
                 .attr('y', d => y(d.wins))
-                .attr('width', x.bandwidth())
                 .attr('height', d => y(0) - y(d.wins))
                 .attr('fill', colors.lime)
                 .attr('rx', 3)
+                .style('cursor', 'pointer')
                 .on('mouseover', (event, d) => {{
                     showTooltip(event, `<strong>${{d.team}}</strong><br>${{d.wins.toLocaleString()}} wins`);
                 }})
-                .on('mouseout', hideTooltip);
+                .on('mouseout', hideTooltip)
+                .on('click', (event, d) => openTeamDrilldown(d.team));
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x))
-                .selectAll('text')
-                .attr('transform', 'rotate(-45)')
-                .style('text-anchor', 'end')
-                .style('font-size', '9px');
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(5));
-        }}
-
-        // Chart 13: Win rate comparison
-        function renderWinRate() {{
-            const container = d3.select('#chart-win-rate');
-            const width = container.node().clientWidth || 400;
-            const height = 250;
-            const margin = {{top: 20, right: 20, bottom: 60, left: 50}};
 
-            // Calculate home/away wins by team
-            const teamStats = new Map();
-            resultsData.forEach(d => {{
-                // Home team
-                if (!teamStats.has(d.home_team)) {{
-                    teamStats.set(d.home_team, {{homeWins: 0, homeGames: 0, awayWins: 0, awayGames: 0}});
-                }}
-                const home = teamStats.get(d.home_team);
-                home.homeGames++;
-                if (d.home_score > d.away_score) home.homeWins++;
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                bars.attr('x', d => x(d.team))
+                    .attr('width', x.bandwidth());
+                xAxis.call(d3.axisBottom(x))
+                    .selectAll('text')
+                    .attr('transform', 'rotate(-45)')
+                    .style('text-anchor', 'end')
+                    .style('font-size', '9px');
+            }}
+            layout(width);
+            onResize(container, layout);
+        }}
 
-                // Away team
-                if (!teamStats.has(d.away_team)) {{
-                    teamStats.set(d.away_team, {{homeWins: 0, homeGames: 0, awayWins: 0, awayGames: 0}});
+        // Chart 12b: Streak records from the precomputed runs
+        // Teams with a match in the final ACTIVE_TEAM_DAYS count as active
+        const ACTIVE_TEAM_DAYS = 730;
+
+        function streakRecords(kind, period) {{
+            const teams = matchIndex.teams;
+            let runs;
+            if (period === 'all' || period === 'current') {{
+                const current = period === 'current';
+                const lengths = streaks[kind + (current ? 'Current' : 'Best')];
+                const starts = streaks[kind + (current ? 'CurrentStart' : 'BestStart')];
+                const latest = d3.max(streaks.lastDay);
+                runs = Array.from(lengths, (length, id) => ({{
+                    team: teams[id],
+                    length,
+                    start: starts[id],
+                    end: current ? streaks.lastDay[id] : streaks[kind + 'BestEnd'][id]
+                }})).filter((run, id) => run.length && (!current || streaks.lastDay[id] >= latest - ACTIVE_TEAM_DAYS));
+            }} else {{
+                const k = streaks.kinds.indexOf(kind);
+                const decade = +period;
+                runs = [];
+                for (let i = 0; i < streaks.decadeKind.length; i++) {{
+                    if (streaks.decadeKind[i] === k && streaks.decadeDecade[i] === decade) {{
+                        runs.push({{
+                            team: teams[streaks.decadeTeam[i]],
+                            length: streaks.decadeLength[i],
+                            start: streaks.decadeStart[i],
+                            end: streaks.decadeEnd[i]
+                        }});
+                    }}
                 }}
-                const away = teamStats.get(d.away_team);
-                away.awayGames++;
-                if (d.away_score > d.home_score) away.awayWins++;
-            }});
+            }}
+            return runs.sort((a, b) => b.length - a.length || a.team.localeCompare(b.team)).slice(0, 15);
+        }}
 
-            const data = Array.from(teamStats, ([team, stats]) => ({{
-                team,
-                homeRate: stats.homeGames > 50 ? stats.homeWins / stats.homeGames : null,
-                awayRate: stats.awayGames > 50 ? stats.awayWins / stats.awayGames : null
-            }}))
-                .filter(d => d.homeRate !== null && d.awayRate !== null)
-                .sort((a, b) => (b.homeRate + b.awayRate) - (a.homeRate + a.awayRate))
-                .slice(0, 10);
+        function renderStreaks() {{
+            const container = d3.select('#chart-streaks');
+            container.selectAll('*').remove();
+            const width = container.node().clientWidth || 800;
+            const height = 300;
+            const margin = {{top: 20, right: 20, bottom: 60, left: 50}};
+            const kind = document.getElementById('streak-kind').value;
+            const data = streakRecords(kind, document.getElementById('streak-period').value);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleBand()
                 .domain(data.map(d => d.team))
-                .range([margin.left, width - margin.right])
-                .padding(0.3);
+                .padding(0.2);
 
             const y = d3.scaleLinear()
-                .domain([0, 1])
+                .domain([0, d3.max(data, d => d.length) || 1])
                 .range([height - margin.bottom, margin.top]);
 
-            // Dumbbell chart
-            data.forEach(d => {{
-                const xPos = x(d.team) + x.bandwidth() / 2;
-
-                // Line connecting dots
-                svg.append('line')
-                    .attr('x1', xPos)
-                    .attr('x2', xPos)
-                    .attr('y1', y(d.homeRate))
-                    .attr('y2', y(d.awayRate))
-                    .attr('stroke', colors.border)
-                    .attr('stroke-width', 2);
-
-                // Home dot
-                svg.append('circle')
-                    .attr('cx', xPos)
-                    .attr('cy', y(d.homeRate))
-                    .attr('r', 5)
-                    .attr('fill', colors.emerald);
-
-                // Away dot
-                svg.append('circle')
-                    .attr('cx', xPos)
-                    .attr('cy', y(d.awayRate))
-                    .attr('r', 5)
-                    .attr('fill', colors.coral);
-            }});
+            const bars = svg.selectAll('rect')
+                .data(data)
+                .enter()
+                .append('rect')
+                .attr('y', d => y(d.length))
+                .attr('height', d => y(0) - y(d.length))
+                .attr('fill', kind === 'losing' ? colors.coral : colors.emerald)
+                .attr('rx', 3)
+                .style('cursor', 'pointer')
+                .on('mouseover', (event, d) => {{
+                    showTooltip(event, `<strong>${{d.team}}</strong><br>${{d.length}} matches<br>${{formatDay(d.start)}} to ${{formatDay(d.end)}}`);
+                }})
+                .on('mouseout', hideTooltip)
+                .on('click', (event, d) => openTeamDrilldown(d.team));
+
+            const xAxis = svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x))
-                .selectAll('text')
-                .attr('transform', 'rotate(-45)')
-                .style('text-anchor', 'end')
-                .style('font-size', '8px');
+                .attr('transform', `translate(${{margin.left}},0)`)
+                .call(d3.axisLeft(y).ticks(5));
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                bars.attr('x', d => x(d.team))
+                    .attr('width', x.bandwidth());
+                xAxis.call(d3.axisBottom(x))
+                    .selectAll('text')
+                    .attr('transform', 'rotate(-45)')
+                    .style('text-anchor', 'end')
+                    .style('font-size', '9px');
+            }}
+            layout(width);
+            onResize(container, layout);
+        }}
+
+        whenLoaded(['streaks'], () => {{
+            if (!streaks) return;
+            d3.select('#streak-period').selectAll('option')
+                .data([['all', 'All time'], ['current', 'Active runs'],
+                    ...Array.from(new Set(streaks.decadeDecade)).sort((a, b) => b - a).map(decade => [decade, `${{decade}}s`])])
+                .join('option')
+                .attr('value', d => d[0])
+                .text(d => d[1]);
+        }});
+
+        ['streak-kind', 'streak-period'].forEach(id =>
+            document.getElementById(id).addEventListener('change', () => measure('renderStreaks', renderStreaks)));
+
+        // Chart 13: Win rate comparison
+        function renderWinRate() {{
+            const container = d3.select('#chart-win-rate');
+            const width = container.node().clientWidth || 400;
+            const height = 250;
+            const margin = {{top: 20, right: 20, bottom: 60, left: 50}};
+
+            const data = Array.from(resultsAggregates().teams, ([team, stats]) => ({{
+                team,
+                homeRate: stats.homeGames > 50 ? stats.homeWins / stats.homeGames : null,
+                awayRate: stats.awayGames > 50 ? stats.awayWins / stats.awayGames : null
+            }}))
+                .filter(d => d.homeRate !== null && d.awayRate !== null)
+                .sort((a, b) => (b.homeRate + b.awayRate) - (a.homeRate + a.awayRate))
+                .slice(0, 10);
+
+            const svg = container.append('svg')
+                .attr('height', height);
+
+            const x = d3.scaleBand()
+                .domain(data.map(d => d.team))
+                .padding(0.3);
+
+            const y = d3.scaleLinear()
+                .domain([0, 1])
+                .range([height - margin.bottom, margin.top]);
+
+            // Dumbbell chart: a line connecting a home and an away dot
+            const dumbbells = svg.selectAll('.dumbbell')
+                .data(data)
+                .enter()
+                .append('g')
+                .attr('class', 'dumbbell')
+                .style('cursor', 'pointer')
+                .on('click', (event, d) => openTeamDrilldown(d.team));
+
+            dumbbells.append('line')
+                .attr('y1', d => y(d.homeRate))
+                .attr('y2', d => y(d.awayRate))
+                .attr('stroke', colors.border)
+                .attr('stroke-width', 2);
+
+            dumbbells.append('circle')
+                .attr('cy', d => y(d.homeRate))
+                .attr('r', 5)
+                .attr('fill', colors.emerald);
+
+            dumbbells.append('circle')
+                .attr('cy', d => y(d.awayRate))
+                .attr('r', 5)
+                .attr('fill', colors.coral);
+
+            const xAxis = svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(5).tickFormat(d => (d * 100) + '%'));
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                dumbbells.attr('transform', d => `translate(${{x(d.team) + x.bandwidth() / 2}},0)`);
+                xAxis.call(d3.axisBottom(x))
+                    .selectAll('text')
+                    .attr('transform', 'rotate(-45)')
+                    .style('text-anchor', 'end')
+                    .style('font-size', '8px');
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 14: Goals balance scatter
@@ -1312,67 +4395,48 @@ def main():
             const height = 250;
             const margin = {{top: 20, right: 20, bottom: 40, left: 50}};
 
-            // Calculate goals scored/conceded per team
-            const teamGoals = new Map();
-            resultsData.forEach(d => {{
-                if (!teamGoals.has(d.home_team)) {{
-                    teamGoals.set(d.home_team, {{scored: 0, conceded: 0}});
-                }}
-                if (!teamGoals.has(d.away_team)) {{
-                    teamGoals.set(d.away_team, {{scored: 0, conceded: 0}});
-                }}
-                teamGoals.get(d.home_team).scored += d.home_score;
-                teamGoals.get(d.home_team).conceded += d.away_score;
-                teamGoals.get(d.away_team).scored += d.away_score;
-                teamGoals.get(d.away_team).conceded += d.home_score;
-            }});
-
-            const data = Array.from(teamGoals, ([team, goals]) => ({{team, ...goals}}))
+            const data = Array.from(resultsAggregates().teams, ([team, stats]) => ({{team, scored: stats.scored, conceded: stats.conceded}}))
                 .filter(d => d.scored > 100)
                 .sort((a, b) => (b.scored - b.conceded) - (a.scored - a.conceded))
                 .slice(0, 50);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const maxGoals = d3.max(data, d => Math.max(d.scored, d.conceded));
 
             const x = d3.scaleLinear()
-                .domain([0, maxGoals])
-                .range([margin.left, width - margin.right]);
+                .domain([0, maxGoals]);
 
             const y = d3.scaleLinear()
                 .domain([0, maxGoals])
                 .range([height - margin.bottom, margin.top]);
 
             // Diagonal line (balance)
-            svg.append('line')
-                .attr('x1', x(0))
+            const diagonal = svg.append('line')
                 .attr('y1', y(0))
-                .attr('x2', x(maxGoals))
                 .attr('y2', y(maxGoals))
                 .attr('stroke', colors.border)
                 .attr('stroke-dasharray', '4');
 
-            svg.selectAll('circle')
+            const dots = svg.selectAll('circle')
                 .data(data)
                 .enter()
                 .append('circle')
-                .attr('cx', d => x(d.scored))
                 .attr('cy', d => y(d.conceded))
                 .attr('r', 4)
                 .attr('fill', d => d.scored > d.conceded ? colors.emerald : colors.coral)
                 .attr('opacity', 0.7)
+                .style('cursor', 'pointer')
                 .on('mouseover', (event, d) => {{
                     showTooltip(event, `<strong>${{d.team}}</strong><br>Scored: ${{d.scored}}<br>Conceded: ${{d.conceded}}`);
                 }})
-                .on('mouseout', hideTooltip);
+                .on('mouseout', hideTooltip)
+                .on('click', (event, d) => openTeamDrilldown(d.team));
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).ticks(5));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
@@ -1380,8 +4444,7 @@ def main():
                 .call(d3.axisLeft(y).ticks(5));
 
             // Labels
-            svg.append('text')
-                .attr('x', width / 2)
+            const xLabel = svg.append('text')
                 .attr('y', height - 5)
                 .attr('text-anchor', 'middle')
                 .style('fill', colors.textTertiary)
@@ -1396,6 +4459,17 @@ def main():
                 .style('fill', colors.textTertiary)
                 .style('font-size', '9px')
                 .text('Goals Conceded');
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                diagonal.attr('x1', x(0)).attr('x2', x(maxGoals));
+                dots.attr('cx', d => x(d.scored));
+                xAxis.call(d3.axisBottom(x).ticks(5));
+                xLabel.attr('x', width / 2);
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 15: Hexbin
@@ -1406,47 +4480,31 @@ def main():
             const margin = {{top: 20, right: 20, bottom: 40, left: 50}};
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
+            const grid = densityGrids.score;
+
             const x = d3.scaleLinear()
-                .domain([0, 10])
-                .range([margin.left, width - margin.right]);
+                .domain([0, grid.size - 1]);
 
             const y = d3.scaleLinear()
-                .domain([0, 10])
+                .domain([0, grid.size - 1])
                 .range([height - margin.bottom, margin.top]);
 
-            // Count score combinations
-            const scoreCounts = d3.rollup(resultsData,
-                v => v.length,
-                d => d.home_score,
-                d => d.away_score
-            );
-
+            // Score combinations counted by the generator
             const data = [];
-            scoreCounts.forEach((awayCounts, homeScore) => {{
-                awayCounts.forEach((count, awayScore) => {{
-                    if (homeScore <= 10 && awayScore <= 10) {{
-                        data.push({{homeScore, awayScore, count}});
-                    }}
-                }});
+            grid.counts.forEach((count, i) => {{
+                if (count) data.push({{homeScore: Math.floor(i / grid.size), awayScore: i % grid.size, count}});
             }});
 
-            const maxCount = d3.max(data, d => d.count);
+            const maxCount = d3.max(grid.counts);
             const colorScale = d3.scaleSequential(d3.interpolate(colors.bgElevated, colors.lime))
                 .domain([0, maxCount]);
 
-            const cellSize = (width - margin.left - margin.right) / 11;
-
-            svg.selectAll('rect')
+            const cells = svg.selectAll('rect')
                 .data(data)
                 .enter()
                 .append('rect')
-                .attr('x', d => x(d.homeScore) - cellSize / 2)
-                .attr('y', d => y(d.awayScore) - cellSize / 2)
-                .attr('width', cellSize - 1)
-                .attr('height', cellSize - 1)
                 .attr('fill', d => colorScale(d.count))
                 .attr('rx', 2)
                 .on('mouseover', (event, d) => {{
@@ -1454,15 +4512,95 @@ def main():
                 }})
                 .on('mouseout', hideTooltip);
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).ticks(10));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(10));
+
+            // Cells stay square, sized by the plot width
+            function layout(width) {{
+                const cellSize = (width - margin.left - margin.right) / grid.size;
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                cells.attr('x', d => x(d.homeScore) - cellSize / 2)
+                    .attr('y', d => y(d.awayScore) - cellSize / 2)
+                    .attr('width', cellSize - 1)
+                    .attr('height', cellSize - 1);
+                xAxis.call(d3.axisBottom(x).ticks(10));
+            }}
+            layout(width);
+            onResize(container, layout);
+        }}
+
+        // Chart 15b: Goal timing contours over the precomputed grid
+        function renderGoalTiming() {{
+            const container = d3.select('#chart-goal-timing');
+            const width = container.node().clientWidth || 800;
+            const height = 300;
+            const margin = {{top: 20, right: 20, bottom: 40, left: 50}};
+            const grid = densityGrids.goalTiming;
+
+            const svg = container.append('svg')
+                .attr('height', height);
+
+            const x = d3.scaleLinear()
+                .domain([0, grid.width * grid.minuteBin]);
+
+            const y = d3.scaleLinear()
+                .domain([-grid.marginLimit - 0.5, grid.marginLimit + 0.5])
+                .range([height - margin.bottom, margin.top]);
+
+            const contours = d3.contours()
+                .size([grid.width, grid.height])
+                .thresholds(grid.thresholds)(grid.counts);
+
+            const colorScale = d3.scaleSequential(d3.interpolate(colors.bgElevated, colors.lime))
+                .domain([0, grid.thresholds.length]);
+
+            // Contours come back in grid cells; row 0 is the largest deficit.
+            // The paths stay in cell units and only the group's scale changes.
+            const cellHeight = (height - margin.top - margin.bottom) / grid.height;
+            const plot = svg.append('g');
+            plot.selectAll('path')
+                .data(contours)
+                .enter()
+                .append('path')
+                .attr('d', d3.geoPath())
+                .attr('fill', (d, i) => colorScale(i + 1))
+                .attr('stroke', colors.bg)
+                .attr('stroke-width', 0.5)
+                .attr('vector-effect', 'non-scaling-stroke')
+                .on('mouseover', (event, d) => {{
+                    showTooltip(event, `${{d.value.toLocaleString()}}+ goals per ${{grid.minuteBin}} minutes<br>${{grid.goals.toLocaleString()}} goals from ${{grid.matches.toLocaleString()}} replayed matches`);
+                }})
+                .on('mouseout', hideTooltip);
+
+            const xAxis = svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
+
+            svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(${{margin.left}},0)`)
+                .call(d3.axisLeft(y)
+                    .tickValues(d3.range(-grid.marginLimit, grid.marginLimit + 1))
+                    .tickFormat(lead => Math.abs(lead) === grid.marginLimit
+                        ? (lead > 0 ? `+${{lead}} or more` : `${{lead}} or less`)
+                        : lead > 0 ? `+${{lead}}` : `${{lead}}`));
+
+            function layout(width) {{
+                const cellWidth = (width - margin.left - margin.right) / grid.width;
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                plot.attr('transform', `translate(${{margin.left}},${{height - margin.bottom}}) scale(${{cellWidth}},${{-cellHeight}})`);
+                xAxis.call(d3.axisBottom(x).ticks(8));
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 16: Shootouts over time
@@ -1472,50 +4610,57 @@ def main():
             const height = 250;
             const margin = {{top: 20, right: 20, bottom: 40, left: 50}};
 
-            const byYear = d3.rollup(shootoutsData, v => v.length, d => d.year);
+            const byYear = d3.rollup(shootoutsDates.year, v => v.length, year => year);
             const data = Array.from(byYear, ([year, count]) => ({{year, count}}))
                 .sort((a, b) => a.year - b.year);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleLinear()
-                .domain(d3.extent(data, d => d.year))
-                .range([margin.left, width - margin.right]);
+                .domain(d3.extent(data, d => d.year));
 
             const y = d3.scaleLinear()
                 .domain([0, d3.max(data, d => d.count)])
                 .range([height - margin.bottom, margin.top]);
 
-            svg.selectAll('circle')
+            const dots = svg.selectAll('circle')
                 .data(data)
                 .enter()
                 .append('circle')
-                .attr('cx', d => x(d.year))
                 .attr('cy', d => y(d.count))
                 .attr('r', 3)
                 .attr('fill', colors.coral);
 
-            svg.append('path')
+            const line = d3.line()
+                .x(d => x(d.year))
+                .y(d => y(d.count))
+                .curve(d3.curveMonotoneX);
+
+            const linePath = svg.append('path')
                 .datum(data)
                 .attr('fill', 'none')
                 .attr('stroke', colors.coral)
-                .attr('stroke-width', 1.5)
-                .attr('d', d3.line()
-                    .x(d => x(d.year))
-                    .y(d => y(d.count))
-                    .curve(d3.curveMonotoneX));
+                .attr('stroke-width', 1.5);
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).tickFormat(d3.format('d')));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(y).ticks(5));
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                dots.attr('cx', d => x(d.year));
+                linePath.attr('d', line);
+                xAxis.call(d3.axisBottom(x).tickFormat(d3.format('d')));
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
         // Chart 17: Decades comparison
@@ -1525,25 +4670,18 @@ def main():
             const height = 300;
             const margin = {{top: 30, right: 20, bottom: 40, left: 60}};
 
-            const decadeStats = d3.rollup(resultsData.filter(d => d.decade >= 1900),
-                v => ({{
-                    matches: v.length,
-                    avgGoals: d3.mean(v, d => d.total_goals),
-                    homeWinPct: v.filter(d => d.home_score > d.away_score).length / v.length
-                }}),
-                d => d.decade
-            );
-
-            const data = Array.from(decadeStats, ([decade, stats]) => ({{decade, ...stats}}))
-                .sort((a, b) => a.decade - b.decade);
+            const data = Array.from(resultsAggregates().decades, ([decade, stats]) => ({{
+                decade,
+                matches: stats.matches,
+                avgGoals: (stats.homeGoals + stats.awayGoals) / stats.matches,
+                homeWinPct: stats.homeWins / stats.matches
+            }})).sort((a, b) => a.decade - b.decade);
 
             const svg = container.append('svg')
-                .attr('width', width)
                 .attr('height', height);
 
             const x = d3.scaleBand()
                 .domain(data.map(d => d.decade))
-                .range([margin.left, width - margin.right])
                 .padding(0.2);
 
             const yLeft = d3.scaleLinear()
@@ -1555,49 +4693,45 @@ def main():
                 .range([height - margin.bottom, margin.top]);
 
             // Bars for matches
-            svg.selectAll('.bar')
+            const bars = svg.selectAll('.bar')
                 .data(data)
                 .enter()
                 .append('rect')
-                .attr('x', d => x(d.decade))
                 .attr('y', d => yLeft(d.matches))
-                .attr('width', x.bandwidth())
                 .attr('height', d => yLeft(0) - yLeft(d.matches))
                 .attr('fill', colors.cyan)
                 .attr('opacity', 0.6);
 
             // Line for avg goals
-            svg.append('path')
+            const line = d3.line()
+                .x(d => x(d.decade) + x.bandwidth() / 2)
+                .y(d => yRight(d.avgGoals));
+
+            const linePath = svg.append('path')
                 .datum(data)
                 .attr('fill', 'none')
                 .attr('stroke', colors.amber)
-                .attr('stroke-width', 3)
-                .attr('d', d3.line()
-                    .x(d => x(d.decade) + x.bandwidth() / 2)
-                    .y(d => yRight(d.avgGoals)));
+                .attr('stroke-width', 3);
 
-            svg.selectAll('.dot')
+            const dots = svg.selectAll('.dot')
                 .data(data)
                 .enter()
                 .append('circle')
-                .attr('cx', d => x(d.decade) + x.bandwidth() / 2)
                 .attr('cy', d => yRight(d.avgGoals))
                 .attr('r', 4)
                 .attr('fill', colors.amber);
 
-            svg.append('g')
+            const xAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(0,${{height - margin.bottom}})`)
-                .call(d3.axisBottom(x).tickFormat(d => d + 's'));
+                .attr('transform', `translate(0,${{height - margin.bottom}})`);
 
             svg.append('g')
                 .attr('class', 'axis')
                 .attr('transform', `translate(${{margin.left}},0)`)
                 .call(d3.axisLeft(yLeft).ticks(5));
 
-            svg.append('g')
+            const rightAxis = svg.append('g')
                 .attr('class', 'axis')
-                .attr('transform', `translate(${{width - margin.right}},0)`)
                 .call(d3.axisRight(yRight).ticks(5));
 
             // Legend
@@ -1628,37 +4762,1152 @@ def main():
                 .style('fill', colors.textSecondary)
                 .style('font-size', '10px')
                 .text('Avg Goals');
+
+            function layout(width) {{
+                svg.attr('width', width);
+                x.range([margin.left, width - margin.right]);
+                bars.attr('x', d => x(d.decade))
+                    .attr('width', x.bandwidth());
+                linePath.attr('d', line);
+                dots.attr('cx', d => x(d.decade) + x.bandwidth() / 2);
+                xAxis.call(d3.axisBottom(x).tickFormat(d => d + 's'));
+                rightAxis.attr('transform', `translate(${{width - margin.right}},0)`);
+            }}
+            layout(width);
+            onResize(container, layout);
         }}
 
-        // Render all charts
-        renderStreamgraph();
-        renderCalendarHeatmap();
-        renderScoringTrend();
-        renderHomeAway();
-        renderMonthly();
-        renderTournamentDist();
-        renderNeutral();
-        renderScoreDist();
-        renderMinute();
-        renderGoalTypes();
-        renderTopScorers();
-        renderTopTeams();
-        renderWinRate();
-        renderGoalsBalance();
-        renderHexbin();
-        renderShootouts();
-        renderDecades();
-    </script>
+        // Match explorer: filters resolve to a sorted Int32Array of resultsData
+        // positions through the prebuilt index, and the list only creates DOM
+        // rows for the visible window.
+        const MATCH_ROW_HEIGHT = 28;
+        const MATCH_OVERSCAN = 8;
+
+        function indexGroup(offsets, rows, id) {{
+            return rows.subarray(offsets[id], offsets[id + 1]);
+        }}
+
+        function intersectSorted(a, b) {{
+            const out = new Int32Array(Math.min(a.length, b.length));
+            let i = 0, j = 0, n = 0;
+            while (i < a.length && j < b.length) {{
+                if (a[i] < b[j]) i++;
+                else if (a[i] > b[j]) j++;
+                else {{ out[n++] = a[i]; i++; j++; }}
+            }}
+            return out.subarray(0, n);
+        }}
+
+        function unionSorted(groups) {{
+            const all = new Int32Array(groups.reduce((n, group) => n + group.length, 0));
+            let n = 0;
+            groups.forEach(group => {{ all.set(group, n); n += group.length; }});
+            all.sort();
+            // A match between two of the teams is in both groups
+            n = 0;
+            for (let i = 0; i < all.length; i++) {{
+                if (i === 0 || all[i] !== all[i - 1]) all[n++] = all[i];
+            }}
+            return all.subarray(0, n);
+        }}
+
+        // First index in positions whose match day is >= day
+        function lowerBoundDay(positions, day) {{
+            let lo = 0, hi = positions.length;
+            while (lo < hi) {{
+                const mid = (lo + hi) >> 1;
+                if (resultsDates.day[positions[mid]] < day) lo = mid + 1;
+                else hi = mid;
+            }}
+            return lo;
+        }}
+
+        const matchTeamIds = new Map();
+        const matchTournamentIds = new Map();
+        whenLoaded(['matchIndex'], () => {{
+            if (!matchIndex) return;
+            matchIndex.teams.forEach((name, i) => matchTeamIds.set(name, i));
+            matchIndex.tournaments.forEach((name, i) => matchTournamentIds.set(name, i));
+        }});
+        let allMatchPositions = null;
+        let matchTeamKeys = null;
+
+        // Team ids for the team filter text: the exact name, else the team
+        // whose folded name (case and accents ignored) equals it, else every
+        // team with a word starting with it ('korea' -> both Koreas)
+        function matchTeamsFor(query) {{
+            const id = matchTeamIds.get(query);
+            if (id !== undefined) return [id];
+            const q = foldName(query).trim().replace(/\\s+/g, ' ');
+            matchTeamKeys = matchTeamKeys || matchIndex.teams.map(name => foldName(name).split(/\\s+/).join(' '));
+            const exact = matchTeamKeys.indexOf(q);
+            if (exact >= 0) return [exact];
+            const ids = [];
+            matchTeamKeys.forEach((key, i) => {{
+                if (key.startsWith(q) || key.includes(' ' + q)) ids.push(i);
+            }});
+            return ids;
+        }}
+
+        function matchPositions(team, tournament, fromDay, toDay) {{
+            let positions = null;
+            if (team !== null) {{
+                const groups = matchTeamsFor(team).map(id => indexGroup(matchIndex.teamOffsets, matchIndex.teamRows, id));
+                if (!groups.length) return new Int32Array(0);
+                positions = groups.length === 1 ? groups[0] : unionSorted(groups);
+            }}
+            if (tournament !== null) {{
+                const group = indexGroup(matchIndex.tournamentOffsets, matchIndex.tournamentRows,
+                    matchTournamentIds.get(tournament));
+                positions = positions ? intersectSorted(positions, group) : group;
+            }}
+            if (!positions) {{
+                allMatchPositions = allMatchPositions || Int32Array.from(resultsData, (_, i) => i);
+                positions = allMatchPositions;
+            }}
+            return positions.subarray(lowerBoundDay(positions, fromDay), lowerBoundDay(positions, toDay + 1));
+        }}
+
+        function formatDay(day) {{
+            return dayToDate(day).toISOString().slice(0, 10);
+        }}
+
+        function renderMatchBrowser() {{
+            const viewport = document.getElementById('match-viewport');
+            const spacer = document.getElementById('match-spacer');
+            const teamInput = document.getElementById('match-team');
+            const tournamentSelect = document.getElementById('match-tournament');
+            const fromInput = document.getElementById('match-from');
+            const toInput = document.getElementById('match-to');
+            const countLabel = document.getElementById('match-count');
+
+            d3.select('#match-team-options').selectAll('option')
+                .data(matchIndex.teams)
+                .enter()
+                .append('option')
+                .attr('value', d => d);
+            d3.select(tournamentSelect).selectAll('option.tournament')
+                .data(matchIndex.tournaments)
+                .enter()
+                .append('option')
+                .attr('class', 'tournament')
+                .attr('value', d => d)
+                .text(d => d);
+
+            const firstDay = resultsDates.day[0];
+            const lastDay = resultsDates.day[resultsDates.day.length - 1];
+            [fromInput, toInput].forEach(input => {{
+                input.min = formatDay(firstDay);
+                input.max = formatDay(lastDay);
+            }});
+
+            let positions = new Int32Array(0);
+            const pool = [];
+            let framePending = false;
+
+            function rowNode(i) {{
+                if (!pool[i]) {{
+                    const row = document.createElement('div');
+                    row.className = 'match-row';
+                    row.innerHTML = '<span class="muted"></span><span></span><span class="score"></span>' +
+                        '<span></span><span class="muted"></span><span class="muted"></span>';
+                    viewport.appendChild(row);
+                    pool[i] = row;
+                }}
+                return pool[i];
+            }}
+
+            function draw() {{
+                framePending = false;
+                const first = Math.max(0, Math.floor(viewport.scrollTop / MATCH_ROW_HEIGHT) - MATCH_OVERSCAN);
+                const visible = Math.ceil((viewport.clientHeight || 480) / MATCH_ROW_HEIGHT) + 2 * MATCH_OVERSCAN;
+                for (let j = 0; j < visible; j++) {{
+                    const row = rowNode(j);
+                    const k = first + j;
+                    if (k >= positions.length) {{
+                        row.style.display = 'none';
+                        continue;
+                    }}
+                    const d = resultsData[positions[k]];
+                    const cells = row.children;
+                    row.style.display = '';
+                    row.style.transform = `translateY(${{k * MATCH_ROW_HEIGHT}}px)`;
+                    cells[0].textContent = formatDay(resultsDates.day[positions[k]]);
+                    cells[1].textContent = d.home_team;
+                    cells[2].textContent = `${{d.home_score}}-${{d.away_score}}`;
+                    cells[3].textContent = d.away_team;
+                    cells[4].textContent = d.tournament;
+                    cells[5].textContent = d.city ? `${{d.city}}, ${{d.country}}` : d.country;
+                }}
+                for (let j = visible; j < pool.length; j++) pool[j].style.display = 'none';
+            }}
+
+            function applyFilters() {{
+                const team = teamInput.value.trim() || null;
+                const tournament = tournamentSelect.value || null;
+                const fromDay = fromInput.value ? Math.floor(Date.parse(fromInput.value) / MS_PER_DAY) : firstDay;
+                const toDay = toInput.value ? Math.floor(Date.parse(toInput.value) / MS_PER_DAY) : lastDay;
+                positions = matchPositions(team, tournament, fromDay, toDay);
+                spacer.style.height = `${{positions.length * MATCH_ROW_HEIGHT}}px`;
+                viewport.scrollTop = 0;
+                const teams = team === null ? [] : matchTeamsFor(team).map(id => matchIndex.teams[id]);
+                const teamNote = teams.length && teams[0] !== team
+                    ? ` · ${{teams.slice(0, 3).join(', ')}}${{teams.length > 3 ? ` +${{teams.length - 3}} more` : ''}}` : '';
+                countLabel.textContent = `${{positions.length.toLocaleString()}} of ${{resultsData.length.toLocaleString()}} matches${{teamNote}}`;
+                draw();
+            }}
+
+            viewport.addEventListener('scroll', () => {{
+                if (!framePending) {{
+                    framePending = true;
+                    requestAnimationFrame(draw);
+                }}
+            }});
+            [teamInput, tournamentSelect, fromInput, toInput].forEach(input => {{
+                input.addEventListener('input', applyFilters);
+            }});
+            // The tab starts hidden, so size the window again once it is shown
+            document.querySelector('.tab-btn[data-tab="matches"]').addEventListener('click', draw);
+            applyFilters();
+        }}
+
+        // Prefix search over teams, scorers and former names
+        const FOLD_LETTERS = {json.dumps(FOLD_LETTERS, ensure_ascii=False)};
+        const SEARCH_KIND = {{TEAM: 0, SCORER: 1, FORMER: 2}};
+        let searchKeys = null;
+
+        function foldName(name) {{
+            return Array.from(name.toLowerCase().normalize('NFKD').replace(/\\p{{M}}/gu, ''),
+                c => FOLD_LETTERS[c] || c).join('');
+        }}
+
+        // Undo the front coding once, on first use
+        function searchKeyList() {{
+            if (!searchKeys) {{
+                const suffixes = searchIndex.suffixes.split('\\n');
+                searchKeys = new Array(suffixes.length);
+                let previous = '';
+                for (let i = 0; i < suffixes.length; i++) {{
+                    previous = previous.slice(0, searchIndex.shared[i]) + suffixes[i];
+                    searchKeys[i] = previous;
+                }}
+            }}
+            return searchKeys;
+        }}
+
+        function searchNames(query, limit = {SEARCH_HIT_LIMIT}) {{
+            const q = foldName(query).trim().replace(/\\s+/g, ' ');
+            if (!q) return [];
+            const toHit = ref => ({{kind: ref & 3, id: ref >> 2}});
+            // Short prefixes match the most keys; their ranked hits are precomputed
+            if (Array.from(q).length <= {SEARCH_SHORT_PREFIX} && limit <= {SEARCH_HIT_LIMIT}) {{
+                return (searchIndex.shortHits[q] || []).slice(0, limit).map(toHit);
+            }}
+            const keys = searchKeyList();
+            let lo = 0, hi = keys.length;
+            while (lo < hi) {{
+                const mid = (lo + hi) >> 1;
+                if (keys[mid] < q) lo = mid + 1;
+                else hi = mid;
+            }}
+            const refs = new Set();
+            for (let i = lo; i < keys.length && keys[i].startsWith(q); i++) {{
+                refs.add(searchIndex.refs[i]);
+            }}
+            // Teams first, then scorers by goal rank (lower id = more goals),
+            // as search_rank orders shortHits; every match is ranked before
+            // any is dropped
+            return Array.from(refs, toHit)
+                .sort((a, b) => (a.kind === SEARCH_KIND.SCORER) - (b.kind === SEARCH_KIND.SCORER)
+                    || a.id - b.id || a.kind - b.kind)
+                .slice(0, limit);
+        }}
+
+        function describeSearchHit(hit) {{
+            if (hit.kind === SEARCH_KIND.SCORER) {{
+                const teams = Array.from(scorerTable.teamIds.subarray(scorerTable.teamOffsets[hit.id], scorerTable.teamOffsets[hit.id + 1]),
+                    t => scorerTable.teamNames[t]);
+                const years = `${{dayToDate(scorerTable.firstDay[hit.id]).getUTCFullYear()}}-${{dayToDate(scorerTable.lastDay[hit.id]).getUTCFullYear()}}`;
+                return {{
+                    name: scorerTable.name[hit.id],
+                    detail: `${{teams.join(', ')}} · ${{scorerTable.goals[hit.id]}} goals (${{scorerTable.penalties[hit.id]}} pen) · ${{years}}`,
+                    // Scorers open their main team, listed first
+                    team: teams[0],
+                    scorer: hit.id
+                }};
+            }}
+            const team = hit.kind === SEARCH_KIND.TEAM ? matchIndex.teams[hit.id] : formerNamesData[hit.id].current;
+            const id = matchTeamIds.get(team);
+            const matches = id === undefined ? 0 : matchIndex.teamOffsets[id + 1] - matchIndex.teamOffsets[id];
+            return {{
+                name: hit.kind === SEARCH_KIND.TEAM ? team : `${{formerNamesData[hit.id].former}} (now ${{team}})`,
+                detail: `Team · ${{matches.toLocaleString()}} matches`,
+                team
+            }};
+        }}
+
+        function initSearch() {{
+            const input = document.getElementById('search-input');
+            const results = d3.select('#search-results');
+
+            input.addEventListener('input', () => {{
+                const hits = searchNames(input.value).map(describeSearchHit);
+                results.style('display', hits.length ? 'block' : 'none');
+                results.selectAll('.search-hit')
+                    .data(hits)
+                    .join(enter => enter.append('div')
+                        .attr('class', 'search-hit')
+                        .call(div => div.append('span').attr('class', 'name'))
+                        .call(div => div.append('span').attr('class', 'detail')))
+                    .on('click', (event, d) => {{
+                        results.style('display', 'none');
+                        if (!d.team) return;
+                        // Scorers open their team's drill-down with them highlighted
+                        if (d.scorer !== undefined && enabledCharts.has('drilldown')) {{
+                            openTeamDrilldown(d.team, d.scorer);
+                            return;
+                        }}
+                        if (!enabledCharts.has('matches')) {{
+                            openTeamDrilldown(d.team);
+                            return;
+                        }}
+                        // Teams open the match explorer filtered to that team
+                        document.querySelector('.tab-btn[data-tab="matches"]').click();
+                        const teamInput = document.getElementById('match-team');
+                        teamInput.value = d.team;
+                        teamInput.dispatchEvent(new Event('input'));
+                    }})
+                    .call(div => div.select('.name').text(d => d.name))
+                    .call(div => div.select('.detail').text(d => d.detail));
+            }});
+            input.addEventListener('blur', () => setTimeout(() => results.style('display', 'none'), 200));
+        }}
+
+        // Least-recently-used cache; Map keeps insertion order, so the first
+        // key is always the oldest
+        class LRUCache {{
+            constructor(capacity) {{
+                this.capacity = capacity;
+                this.map = new Map();
+            }}
+
+            get(key) {{
+                if (!this.map.has(key)) return undefined;
+                const value = this.map.get(key);
+                this.map.delete(key);
+                this.map.set(key, value);
+                return value;
+            }}
+
+            set(key, value) {{
+                this.map.delete(key);
+                this.map.set(key, value);
+                if (this.map.size > this.capacity) {{
+                    this.map.delete(this.map.keys().next().value);
+                }}
+            }}
+        }}
+
+        // Team drill-down: aggregates come from the team's index groups only,
+        // and are memoised so revisiting a team is a cache hit
+        const teamDrilldownCache = new LRUCache(32);
+
+        function computeTeamDrilldown(team) {{
+            const id = matchTeamIds.get(team);
+            const matches = indexGroup(matchIndex.teamOffsets, matchIndex.teamRows, id);
+
+            const byYear = new Map();
+            const opponents = new Map();
+            const totals = {{won: 0, drawn: 0, lost: 0}};
+            matches.forEach(position => {{
+                const d = resultsData[position];
+                const home = d.home_team === team;
+                const scored = home ? d.home_score : d.away_score;
+                const conceded = home ? d.away_score : d.home_score;
+                const result = scored > conceded ? 'won' : scored < conceded ? 'lost' : 'drawn';
+                totals[result]++;
+
+                const year = resultsDates.year[position];
+                if (!byYear.has(year)) byYear.set(year, {{year, won: 0, drawn: 0, lost: 0}});
+                byYear.get(year)[result]++;
+
+                const opponent = home ? d.away_team : d.home_team;
+                if (!opponents.has(opponent)) opponents.set(opponent, {{team: opponent, played: 0, won: 0, drawn: 0, lost: 0}});
+                const record = opponents.get(opponent);
+                record.played++;
+                record[result]++;
+            }});
+
+            const scorerGoals = new Map();
+            const minuteBins = new Int32Array(8);
+            let goals = 0;
+            const countGoal = (scorerId, minute, ownGoal) => {{
+                goals++;
+                if (!ownGoal) scorerGoals.set(scorerId, (scorerGoals.get(scorerId) || 0) + 1);
+                if (minute) minuteBins[Math.min(7, Math.floor((minute - 1) / 15))]++;
+            }};
+            if (matchGoals) {{
+                // The team's goals are its side's share of each of its matches
+                const {{offsets, scorer, minute, flags, flagBits}} = matchGoals;
+                matches.forEach(position => {{
+                    const side = resultsData[position].away_team === team ? flagBits.away : 0;
+                    for (let j = offsets[position]; j < offsets[position + 1]; j++) {{
+                        if ((flags[j] & flagBits.away) === side) countGoal(scorer[j], minute[j], flags[j] & flagBits.ownGoal);
+                    }}
+                }});
+            }} else {{
+                indexGroup(goalIndex.offsets, goalIndex.rows, id).forEach(position => {{
+                    const d = goalscorersData[position];
+                    countGoal(d.scorer_id, d.minute, d.own_goal);
+                }});
+            }}
+
+            return {{
+                team,
+                matches: matches.length,
+                goals,
+                ...totals,
+                timeline: Array.from(byYear.values()),
+                opponents: Array.from(opponents.values()).sort((a, b) => b.played - a.played).slice(0, 10),
+                scorerGoals,
+                scorers: Array.from(scorerGoals, ([id, count]) => ({{id, name: scorerTable.name[id], goals: count}}))
+                    .sort((a, b) => b.goals - a.goals)
+                    .slice(0, 10),
+                minutes: Array.from(minuteBins, (count, i) => ({{label: i < 6 ? `${{i * 15 + 1}}-${{i * 15 + 15}}` : i === 6 ? '91-105' : '106+', count}}))
+            }};
+        }}
+
+        function teamDrilldown(team) {{
+            let data = teamDrilldownCache.get(team);
+            if (!data) {{
+                data = measure(`drilldown:${{team}}`, () => computeTeamDrilldown(team));
+                teamDrilldownCache.set(team, data);
+            }}
+            return data;
+        }}
+
+        // Rolling form metrics from a window's sums and its match count
+        const FORM_METRICS = {{
+            points: (points, goalDiff, wins, played) => points / played,
+            goalDiff: (points, goalDiff, wins, played) => goalDiff / played,
+            winRate: (points, goalDiff, wins, played) => wins / played
+        }};
+
+        // One team's form after every match, as x (day) / y columns
+        function teamFormSeries(team, key, metric) {{
+            const id = matchTeamIds.get(team);
+            const formWindow = teamForm.windows.find(w => w.key === key);
+            const start = matchIndex.teamOffsets[id];
+            const end = matchIndex.teamOffsets[id + 1];
+            const points = teamForm[key + 'Points'];
+            const goalDiff = teamForm[key + 'GoalDiff'];
+            const wins = teamForm[key + 'Wins'];
+            const played = teamForm[key + 'Played'];
+            const value = FORM_METRICS[metric];
+            const x = new Float64Array(end - start);
+            const y = new Float64Array(end - start);
+            for (let i = start; i < end; i++) {{
+                const count = played ? played[i] : Math.min(i - start + 1, formWindow.size);
+                x[i - start] = resultsDates.day[matchIndex.teamRows[i]];
+                y[i - start] = value(points[i], goalDiff[i], wins[i], count);
+            }}
+            return {{x, y}};
+        }}
+
+        let drilldownTeam = null;
+
+        function renderTeamForm() {{
+            const container = d3.select('#drilldown-form');
+            container.selectAll('*').remove();
+            const metric = document.getElementById('drilldown-form-metric').value;
+            const series = teamFormSeries(drilldownTeam,
+                document.getElementById('drilldown-form-window').value, metric);
+            if (!series.x.length) return;
+
+            const width = container.node().clientWidth || 680;
+            const height = 200;
+            const margin = {{top: 10, right: 10, bottom: 30, left: 40}};
+            const data = downsampleSeries(series, width - margin.left - margin.right);
+
+            const x = d3.scaleTime()
+                .domain([dayToDate(series.x[0]), dayToDate(series.x[series.x.length - 1])])
+                .range([margin.left, width - margin.right]);
+            const [low, high] = d3.extent(series.y);
+            const y = d3.scaleLinear()
+                .domain(metric === 'goalDiff' ? [Math.min(0, low), Math.max(0, high)] : [0, metric === 'points' ? 3 : 1])
+                .nice()
+                .range([height - margin.bottom, margin.top]);
+
+            const svg = container.append('svg').attr('width', width).attr('height', height);
+            svg.append('path')
+                .datum(data)
+                .attr('fill', 'none')
+                .attr('stroke', colors.lime)
+                .attr('stroke-width', 1.5)
+                .attr('d', d3.line()
+                    .x(d => x(dayToDate(d.x)))
+                    .y(d => y(d.y)));
+            svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(0,${{height - margin.bottom}})`)
+                .call(d3.axisBottom(x).ticks(6));
+            svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(${{margin.left}},0)`)
+                .call(d3.axisLeft(y).ticks(4));
+        }}
+
+        whenLoaded(['teamForm'], () => d3.select('#drilldown-form-window').selectAll('option')
+            .data(teamForm ? teamForm.windows : [])
+            .join('option')
+            .attr('value', d => d.key)
+            .text(d => d.kind === 'matches' ? `Last ${{d.size}} matches` : `Last ${{d.size}} days`));
+
+        ['drilldown-form-window', 'drilldown-form-metric'].forEach(id =>
+            document.getElementById(id).addEventListener('change', () => measure('renderTeamForm', renderTeamForm)));
+
+        function openTeamDrilldown(team, scorerId = null) {{
+            if (!enabledCharts.has('drilldown') || !matchTeamIds.has(team)) return;
+            // A click before the drilldown's data has loaded opens it once it has
+            loadOnDemand(chartNeeds.drilldown);
+            whenLoaded(chartNeeds.drilldown, () => showTeamDrilldown(team, scorerId));
+        }}
+
+        function showTeamDrilldown(team, scorerId) {{
+            const data = teamDrilldown(team);
+            document.getElementById('drilldown').style.display = 'block';
+            document.getElementById('drilldown-title').textContent = team;
+            document.getElementById('drilldown-summary').textContent =
+                `${{data.matches.toLocaleString()}} matches · ${{data.won}}W ${{data.drawn}}D ${{data.lost}}L · ${{data.goals.toLocaleString()}} recorded goals`;
+
+            d3.select('#drilldown-opponents').selectAll('li')
+                .data(data.opponents)
+                .join(enter => enter.append('li').call(li => li.append('span')).call(li => li.append('span')))
+                .call(li => li.select('span:first-child').text(d => d.team))
+                .call(li => li.select('span:last-child').text(d => `${{d.played}} played · ${{d.won}}-${{d.drawn}}-${{d.lost}}`));
+
+            // A scorer opened from search is added below the top ten if needed
+            const scorers = scorerId === null || data.scorers.some(d => d.id === scorerId) || !data.scorerGoals.has(scorerId)
+                ? data.scorers
+                : data.scorers.concat({{id: scorerId, name: scorerTable.name[scorerId], goals: data.scorerGoals.get(scorerId)}});
+            d3.select('#drilldown-scorers').selectAll('li')
+                .data(scorers)
+                .join(enter => enter.append('li').call(li => li.append('span')).call(li => li.append('span')))
+                .classed('highlight', d => d.id === scorerId)
+                .call(li => li.select('span:first-child').text(d => d.name))
+                .call(li => li.select('span:last-child').text(d => `${{d.goals}} goals`));
+
+            // Timeline: stacked wins/draws/losses per year
+            const timeline = d3.select('#drilldown-timeline');
+            timeline.selectAll('*').remove();
+            const width = timeline.node().clientWidth || 680;
+            const height = 200;
+            const margin = {{top: 10, right: 10, bottom: 30, left: 40}};
+            const series = d3.stack().keys(['won', 'drawn', 'lost'])(data.timeline);
+            const x = d3.scaleBand()
+                .domain(d3.range(d3.min(data.timeline, d => d.year), d3.max(data.timeline, d => d.year) + 1))
+                .range([margin.left, width - margin.right])
+                .padding(0.1);
+            const y = d3.scaleLinear()
+                .domain([0, d3.max(data.timeline, d => d.won + d.drawn + d.lost)])
+                .range([height - margin.bottom, margin.top]);
+            const svg = timeline.append('svg').attr('width', width).attr('height', height);
+            svg.selectAll('g.series')
+                .data(series)
+                .enter()
+                .append('g')
+                .attr('fill', (d, i) => [colors.emerald, colors.amber, colors.coral][i])
+                .selectAll('rect')
+                .data(d => d)
+                .enter()
+                .append('rect')
+                .attr('x', d => x(d.data.year))
+                .attr('y', d => y(d[1]))
+                .attr('width', x.bandwidth())
+                .attr('height', d => y(d[0]) - y(d[1]));
+            svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(0,${{height - margin.bottom}})`)
+                .call(d3.axisBottom(x).tickValues(x.domain().filter(year => year % 10 === 0)));
+            svg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(${{margin.left}},0)`)
+                .call(d3.axisLeft(y).ticks(4));
+
+            // Goal minute profile in 15-minute bins
+            const minutes = d3.select('#drilldown-minutes');
+            minutes.selectAll('*').remove();
+            const mx = d3.scaleBand()
+                .domain(data.minutes.map(d => d.label))
+                .range([margin.left, width - margin.right])
+                .padding(0.2);
+            const my = d3.scaleLinear()
+                .domain([0, d3.max(data.minutes, d => d.count) || 1])
+                .range([height - margin.bottom, margin.top]);
+            const msvg = minutes.append('svg').attr('width', width).attr('height', height);
+            msvg.selectAll('rect')
+                .data(data.minutes)
+                .enter()
+                .append('rect')
+                .attr('x', d => mx(d.label))
+                .attr('y', d => my(d.count))
+                .attr('width', mx.bandwidth())
+                .attr('height', d => my(0) - my(d.count))
+                .attr('fill', colors.cyan)
+                .attr('rx', 3);
+            msvg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(0,${{height - margin.bottom}})`)
+                .call(d3.axisBottom(mx));
+            msvg.append('g')
+                .attr('class', 'axis')
+                .attr('transform', `translate(${{margin.left}},0)`)
+                .call(d3.axisLeft(my).ticks(4));
+
+            drilldownTeam = team;
+            renderTeamForm();
+        }}
+
+        document.getElementById('drilldown-close').addEventListener('click', () => {{
+            document.getElementById('drilldown').style.display = 'none';
+        }});
+
+        // Render the charts chosen at build time; drop the rest from the page
+        {removed_elements}.forEach(id => document.getElementById(id).closest('.chart-card, .search-box, .drilldown').remove());
+{render_calls}
+        sampleMemory('after render');
+
+        // Year window and tournament for the top scorers chart
+        if (enabledCharts.has('top-scorers')) whenLoaded(chartNeeds['top-scorers'], () => {{
+            const [minYear, maxYear] = d3.extent(scorerLeaderboard.bucketYear);
+            const fromInput = document.getElementById('top-scorers-from');
+            const toInput = document.getElementById('top-scorers-to');
+            const tournamentSelect = document.getElementById('top-scorers-tournament');
+            d3.select(tournamentSelect).selectAll('option.tournament')
+                .data(scorerLeaderboard.tournaments)
+                .join('option')
+                .attr('class', 'tournament')
+                .attr('value', d => d)
+                .text(d => d);
+            [fromInput, toInput].forEach(input => {{
+                input.min = minYear;
+                input.max = maxYear;
+            }});
+            fromInput.value = minYear;
+            toInput.value = maxYear;
+
+            const update = () => {{
+                const from = +fromInput.value, to = +toInput.value;
+                const tournament = tournamentSelect.value || null;
+                if (from <= minYear && to >= maxYear && tournament === null) renderTopScorers();
+                else renderTopScorers(from, to, tournament);
+            }};
+            [fromInput, toInput, tournamentSelect].forEach(input => input.addEventListener('change', update));
+        }});
+        perfLog.interactive = performance.now();
+
+        // Deferred chunks run one per idle period, in page order, each
+        // releasing the charts and setup waiting on its constant. On-demand
+        // chunks are skipped; loadOnDemand runs them when first needed.
+        const idle = window.requestIdleCallback || (callback => setTimeout(callback, 1));
+
+        function runDeferredChunk(chunk) {{
+            const name = chunk.dataset.name;
+            measure(`load ${{name}}`, () => {{
+                const script = document.createElement('script');
+                script.text = chunk.text;
+                chunk.replaceWith(script);
+            }});
+            deferredData.delete(name);
+            const ready = dataCallbacks.filter(([names]) => dataReady(names));
+            dataCallbacks = dataCallbacks.filter(entry => !ready.includes(entry));
+            ready.forEach(([, callback]) => callback());
+        }}
+
+        function loadDeferredChunk() {{
+            const chunk = document.querySelector('script[type="text/deferred-data"]:not([data-on-demand])');
+            if (!chunk) {{
+                perfLog.loaded = performance.now();
+                sampleMemory('after deferred data');
+                return;
+            }}
+            runDeferredChunk(chunk);
+            idle(loadDeferredChunk);
+        }}
+
+        function loadOnDemand(names) {{
+            names.forEach(name => {{
+                const chunk = document.querySelector(`script[type="text/deferred-data"][data-on-demand][data-name="${{name}}"]`);
+                if (chunk) runDeferredChunk(chunk);
+            }});
+        }}
+
+        if (deferredData.size) document.addEventListener('DOMContentLoaded', () => idle(loadDeferredChunk));
+
+        // Diagnostics panel, shown when the page is opened with ?perf
+        function perfReport() {{
+            const nav = performance.getEntriesByType('navigation')[0];
+            return {{
+                userAgent: navigator.userAgent,
+                viewport: {{width: window.innerWidth, height: window.innerHeight}},
+                deviceMemory: navigator.deviceMemory || null,
+                hardwareConcurrency: navigator.hardwareConcurrency || null,
+                interactive: perfLog.interactive,
+                loaded: perfLog.loaded ?? perfLog.interactive,
+                navigation: nav ? {{
+                    responseEnd: nav.responseEnd,
+                    domInteractive: nav.domInteractive,
+                    domContentLoaded: nav.domContentLoadedEventEnd,
+                    loadEventEnd: nav.loadEventEnd
+                }} : null,
+                measures: perfLog.measures,
+                longTasks: perfLog.longTasks,
+                memory: perfLog.memory
+            }};
+        }}
+
+        function renderPerfPanel() {{
+            const report = perfReport();
+            const longTaskTotal = d3.sum(report.longTasks, d => d.duration);
+            const lastMemory = report.memory[report.memory.length - 1];
+            document.getElementById('perf-summary').textContent =
+                `Interactive at ${{report.interactive.toFixed(0)}} ms · all data at ${{report.loaded.toFixed(0)}} ms · ` +
+                `${{report.longTasks.length}} long tasks (${{longTaskTotal.toFixed(0)}} ms)` +
+                (lastMemory ? ` · JS heap ${{(lastMemory.usedJSHeapSize / 1048576).toFixed(1)}} MB` : '');
+
+            const rows = report.measures.slice().sort((a, b) => b.duration - a.duration);
+            d3.select('#perf-table').html('')
+                .call(table => table.append('tr').html('<th>Stage</th><th>Start (ms)</th><th>Duration (ms)</th>'))
+                .selectAll('tr.perf-row')
+                .data(rows)
+                .enter()
+                .append('tr')
+                .attr('class', 'perf-row')
+                .html(d => `<td>${{d.name}}</td><td class="num">${{d.start.toFixed(1)}}</td><td class="num">${{d.duration.toFixed(1)}}</td>`);
+        }}
+
+        if (new URLSearchParams(window.location.search).has('perf')) {{
+            document.getElementById('perf-panel').style.display = 'block';
+            renderPerfPanel();
+            // Late long tasks (layout, paint, fonts) land after the first pass
+            window.addEventListener('load', () => setTimeout(renderPerfPanel, 1000));
+
+            document.getElementById('perf-export').addEventListener('click', () => {{
+                const blob = new Blob([JSON.stringify(perfReport(), null, 2)], {{type: 'application/json'}});
+                const link = document.createElement('a');
+                link.href = URL.createObjectURL(blob);
+                link.download = 'dashboard-perf.json';
+                link.click();
+                URL.revokeObjectURL(link.href);
+            }});
+        }}
+    </script>{deferred_chunks}{live_reload_js}
 </body>
 </html>'''
+    return html_content
 
-    # Write the HTML file
-    output_path = Path(__file__).parent / 'dashboard.html'
-    with open(output_path, 'w', encoding='utf-8') as f:
+def write_dashboard(html_content, output_path):
+    """Write the rendered page to disk; readers never see a half-written file."""
+    output_path = Path(output_path)
+    partial = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+    with open(partial, 'w', encoding='utf-8') as f:
         f.write(html_content)
+    os.replace(partial, output_path)
+
+def slugify(name):
+    """Turn a team or tournament name into a file-name friendly slug."""
+    folded = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', folded.lower()).strip('-')
+
+# Datasets and row index shared with batch workers. Set in the parent before
+# the pool forks, so children read them copy-on-write instead of re-parsing.
+_batch_datasets = None
+_batch_index = None
+
+def _init_batch_worker(base_path):
+    """Load the data in a worker when the platform cannot fork."""
+    global _batch_datasets, _batch_index
+    _batch_datasets = load_datasets(Path(base_path))
+    _batch_index = build_row_index(_batch_datasets)
+
+def _render_batch_job(job):
+    """Render one filtered dashboard inside a worker process."""
+    kind, value, output_path, options = job
+    start = time.perf_counter()
+    data = filter_datasets(_batch_datasets, _batch_index, **{kind: value})
+    subtitle = f"{value} - {len(data['results']):,} matches"
+    write_dashboard(build_dashboard_html(data, subtitle, **options), output_path)
+    return value, output_path, time.perf_counter() - start, len(data['results'])
+
+def batch_jobs(index, kind, output_dir, min_matches):
+    """List (kind, value, output_path) jobs for every team or major tournament."""
+    groups = index['team_results'] if kind == 'team' else index['tournament_results']
+    jobs = []
+    for value, positions in sorted(groups.items(), key=lambda item: -len(item[1])):
+        if len(positions) >= min_matches:
+            jobs.append((kind, value, str(output_dir / f'dashboard-{kind}-{slugify(value)}.html')))
+    return jobs
+
+def run_batch(base_path, args):
+    """Parse the CSVs once and render filtered dashboards on a process pool."""
+    global _batch_datasets, _batch_index
+    total_start = time.perf_counter()
+    print("Reading datasets...")
+    validator = DatasetValidator()
+    _batch_datasets = load_datasets(base_path, validator=validator)
+    _batch_index = build_row_index(_batch_datasets)
+    load_seconds = time.perf_counter() - total_start
+    validator.print_summary()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    validator.write_quarantine(output_dir / 'quarantine.csv')
+    kinds = ['team', 'tournament'] if args.batch == 'all' else [args.batch.rstrip('s')]
+    jobs = []
+    for kind in kinds:
+        jobs.extend(job + (render_options(args),)
+                    for job in batch_jobs(_batch_index, kind, output_dir, args.min_matches))
+    workers = args.workers or os.cpu_count() or 1
+    print(f"Rendering {len(jobs)} dashboards with {workers} workers (data loaded in {load_seconds:.2f}s)")
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        initializer, initargs = None, ()
+        # Keep the parsed rows out of the collector so forked children
+        # don't dirty every shared page by touching reference counts.
+        gc.freeze()
+    else:
+        context = multiprocessing.get_context('spawn')
+        initializer, initargs = _init_batch_worker, (str(base_path),)
+
+    timings = []
+    render_start = time.perf_counter()
+    with context.Pool(workers, initializer=initializer, initargs=initargs) as pool:
+        for value, path, seconds, matches in pool.imap_unordered(_render_batch_job, jobs):
+            timings.append(seconds)
+            print(f"  {seconds:7.2f}s  {matches:>6,} matches  {path}")
+
+    # Share of the workers' wall time spent inside a job. Not a speedup:
+    # with more workers than CPUs the jobs overlap without running faster.
+    render_wall = time.perf_counter() - render_start
+    busy = sum(timings)
+    utilisation = busy / (render_wall * workers) if render_wall else 0
+    print(f"Generated {len(jobs)} dashboards in {time.perf_counter() - total_start:.2f}s "
+          f"({busy:.2f}s of render time on {workers} workers, {utilisation:.0%} pool utilisation)")
+
+def render_options(args):
+    """build_dashboard_html keyword arguments taken from the command line."""
+    return {'line_points': args.line_points, 'layout_cache': args.layout_cache or None, 'charts': args.charts,
+            'goal_encoding': args.goal_encoding, 'packed': args.packed, 'progressive': args.progressive}
+
+def chart_list(value):
+    """Parse --charts: comma-separated names from CHARTS."""
+    charts = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in charts if name not in CHARTS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown chart(s) {', '.join(unknown)}; choose from {', '.join(CHARTS)}")
+    return charts
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--team', help='only include matches involving this team')
+    parser.add_argument('--tournament', help='only include matches from this tournament')
+    parser.add_argument('--output', default=str(Path(__file__).parent / 'dashboard.html'),
+                        help='output HTML path (default: dashboard.html next to this script)')
+    parser.add_argument('--quarantine',
+                        help='CSV of rejected and suspicious rows (default: quarantine.csv next to the output)')
+    parser.add_argument('--batch', choices=['teams', 'tournaments', 'all'],
+                        help='render one dashboard per team and/or tournament')
+    parser.add_argument('--output-dir', default=str(Path(__file__).parent / 'dashboards'),
+                        help='directory for batch output (default: dashboards/)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='batch worker processes (default: one per CPU)')
+    parser.add_argument('--min-matches', type=int, default=1,
+                        help='skip batch teams/tournaments with fewer matches than this')
+    parser.add_argument('--export', metavar='DIR',
+                        help='write the computed aggregates (team cube, year series, scorers, '
+                             'head-to-head) to DIR with a manifest instead of building a dashboard')
+    parser.add_argument('--export-format', choices=EXPORT_FORMATS, default='csv',
+                        help='table format for --export (default: csv)')
+    parser.add_argument('--line-points', type=int, default=LINE_POINTS,
+                        help=f'cap each embedded line series at this many points with LTTB '
+                             f'(default: {LINE_POINTS}; 0 keeps every point)')
+    parser.add_argument('--layout-cache', default=str(Path(__file__).parent / '.layout-cache'),
+                        help='directory of cached rivalry network layouts (default: .layout-cache/; '
+                             'empty string disables)')
+    parser.add_argument('--goal-encoding', choices=GOAL_ENCODINGS, default='rows',
+                        help='embed goals as one object per goalscorers row (default), or nested: '
+                             'per-match lists of scorer id, minute and flag bits in typed arrays')
+    parser.add_argument('--packed', action='store_true',
+                        help='embed typed columns as delta/varint/RLE/bit-packed base64 decoded on load, '
+                             'instead of JSON number arrays')
+    parser.add_argument('--no-progressive', dest='progressive', action='store_false',
+                        help='inline all data in the main script instead of painting the stats bar and '
+                             'default tab first and loading the rest at idle time')
+    parser.add_argument('--charts', type=chart_list,
+                        help=f"comma-separated charts to build (default: all): {', '.join(CHARTS)}")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='processes for independent aggregates, 0 for one per CPU (default: 1, as forking '
+                             'and pickling results back costs more than the waves save; batch mode always uses 1)')
+    parser.add_argument('--watch', action='store_true',
+                        help='rebuild whenever a CSV in Dataset/ changes, recomputing only what it affects')
+    parser.add_argument('--serve', type=int, nargs='?', const=8000, metavar='PORT',
+                        help='with --watch, serve the dashboard on localhost and reload it after '
+                             'each rebuild (default port: 8000)')
+    parser.add_argument('--profile', action='store_true',
+                        help='record per-stage wall/CPU time and tracemalloc peaks')
+    parser.add_argument('--profile-report', default='profile.json',
+                        help='where --profile writes its JSON report (default: profile.json)')
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help='with --profile, skip memory tracing (it slows every stage down)')
+    parser.add_argument('--cprofile', metavar='PSTATS',
+                        help='with --profile, also run under cProfile and dump stats here')
+    args = parser.parse_args(argv)
+    if args.profile and (args.batch or args.watch):
+        parser.error('--profile works with a single build or --export, not --batch or --watch')
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    base_path = Path(__file__).parent / 'Dataset'
+
+    if args.batch:
+        run_batch(base_path, args)
+        return
+
+    if args.watch:
+        watch(base_path, args)
+        return
+
+    build = export_aggregates if args.export else generate
+    if not args.profile:
+        build(base_path, args)
+        return
+
+    profiler = StageProfiler()
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+    profile = cProfile.Profile() if args.cprofile else None
+    if profile:
+        profile.enable()
+    try:
+        output_path, validation = build(base_path, args, profiler)
+    finally:
+        if profile:
+            profile.disable()
+            profile.dump_stats(args.cprofile)
+    report = profiler.report()
+    tracemalloc.stop()
+
+    report['output'] = str(output_path)
+    report['output_bytes'] = (sum(path.stat().st_size for path in output_path.iterdir())
+                              if output_path.is_dir() else output_path.stat().st_size)
+    report['validation'] = validation
+    if args.cprofile:
+        report['pstats'] = args.cprofile
+    with open(args.profile_report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print()
+    profiler.print_table()
+    print(f"Profile report: {args.profile_report}")
+    if args.cprofile:
+        print(f"cProfile stats: {args.cprofile}")
+
+def read_dashboard_data(base_path, args, profiler=NO_PROFILE):
+    """Load, validate and filter the CSVs; returns (datasets, subtitle, validator)."""
+    print("Reading datasets...")
+    validator = DatasetValidator()
+    datasets = load_datasets(base_path, profiler, validator)
+    return prepare_dashboard_data(datasets, validator, args, profiler)
+
+def prepare_dashboard_data(datasets, validator, args, profiler=NO_PROFILE):
+    """Report and quarantine what validator found, then filter the loaded datasets."""
+    validator.print_summary()
+    quarantine_path = Path(args.quarantine or Path(args.output).with_name('quarantine.csv'))
+    validator.write_quarantine(quarantine_path)
+    print(f"Quarantine: {quarantine_path} ({len(validator.issues)} rows)")
+    subtitle = DEFAULT_SUBTITLE
+    if args.team or args.tournament:
+        with profiler.stage('filter datasets'):
+            datasets = filter_datasets(datasets, build_row_index(datasets),
+                                       team=args.team, tournament=args.tournament)
+        subtitle = ' / '.join(v for v in (args.team, args.tournament) if v)
+
+    print(f"Loaded: {len(datasets['results'])} results, {len(datasets['goalscorers'])} goals, "
+          f"{len(datasets['shootouts'])} shootouts")
+    return datasets, subtitle, validator
+
+def generate(base_path, args, profiler=NO_PROFILE):
+    """Build one dashboard from the CSVs and return the output path."""
+    datasets, subtitle, validator = read_dashboard_data(base_path, args, profiler)
 
-    print(f"Dashboard generated: {{output_path}}")
-    print(f"File size: {{output_path.stat().st_size / 1024 / 1024:.2f}} MB")
+    # Write the HTML file
+    output_path = Path(args.output)
+    html_content = build_dashboard_html(datasets, subtitle, profiler, jobs=args.jobs or os.cpu_count() or 1,
+                                        **render_options(args))
+    with profiler.stage('write output'):
+        write_dashboard(html_content, output_path)
+
+    print(f"Dashboard generated: {output_path}")
+    print(f"File size: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
+    return output_path, validator.summary()
+
+class HashingSink:
+    """Text sink that encodes, hashes and counts everything written through it."""
+
+    def __init__(self, f):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self.digest.update(data)
+        self.bytes += len(data)
+        return self.f.write(data)
+
+def write_export_table(path, fields, rows, fmt):
+    """Stream rows to CSV or NDJSON one line at a time; returns the manifest entry."""
+    partial = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    count = 0
+    with open(partial, 'wb') as f:
+        sink = HashingSink(f)
+        if fmt == 'csv':
+            writer = csv.writer(sink, lineterminator='\n')
+            writer.writerow(fields)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                sink.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n')
+                count += 1
+    os.replace(partial, path)
+    return {'path': path.name, 'rows': count, 'bytes': sink.bytes, 'sha256': sink.digest.hexdigest()}
+
+def export_aggregates(base_path, args, profiler=NO_PROFILE):
+    """Write every EXPORTS table to args.export, then manifest.json.
+
+    Tables are computed through the same build DAG as the dashboard and
+    honour --team/--tournament. The manifest is written last, so its
+    presence means every table it lists is complete. Returns the export
+    directory and the validation summary.
+    """
+    datasets, _, validator = read_dashboard_data(base_path, args, profiler)
+    targets = {dep for deps, _, _ in EXPORTS.values() for dep in deps}
+    values = compute_aggregates(datasets, targets, render_options(args), profiler,
+                                args.jobs or os.cpu_count() or 1)
+    export_dir = Path(args.export)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'format': args.export_format,
+                'filters': {'team': args.team, 'tournament': args.tournament},
+                'sources': {name: len(datasets[name]) for name in SOURCES},
+                'tables': {}}
+    for name, (deps, fields, rows) in EXPORTS.items():
+        with profiler.stage(f'export {name}'):
+            entry = write_export_table(export_dir / f'{name}.{args.export_format}', fields,
+                                       rows(*(values[dep] for dep in deps)), args.export_format)
+        manifest['tables'][name] = entry
+        print(f"  {entry['rows']:>8,} rows  {export_dir / entry['path']}")
+    partial = export_dir / f'.manifest.json.{os.getpid()}.tmp'
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(partial, export_dir / 'manifest.json')
+    print(f"Manifest: {export_dir / 'manifest.json'}")
+    return export_dir, validator.summary()
+
+WATCH_INTERVAL = 0.2
+
+def dataset_signature(base_path):
+    """(mtime, size) of every source CSV; polling compares these."""
+    signature = {}
+    for name in SOURCES:
+        try:
+            stat = (base_path / f'{name}.csv').stat()
+            signature[name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature[name] = None
+    return signature
+
+class LiveReloadServer:
+    """Serve the output directory; /__build reports the build number pages poll."""
+
+    def __init__(self, output_path, port):
+        self.build = 0
+        server = self
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=str(output_path.parent), **kwargs)
+
+            def do_GET(self):
+                if self.path != '/__build':
+                    return super().do_GET()
+                body = str(server.build).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain')
+                self.send_header('Cache-Control', 'no-store')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}/{output_path.name}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+def watch(base_path, args):
+    """Rebuild the dashboard whenever a source CSV changes, until interrupted.
+
+    Every rebuild re-reads and re-validates only the CSVs whose signature
+    changed (and the match-checked ones when the kept matches did), then
+    recomputes only the aggregates downstream of a source whose accepted
+    rows changed, stopping at any that come out the same; everything else
+    comes from the last build. A change is picked up once the file's mtime
+    and size hold still for one poll, so half-written saves are skipped.
+    """
+    output_path = Path(args.output)
+    server = LiveReloadServer(output_path, args.serve) if args.serve is not None else None
+    values, loaded, validator, datasets, built, seen = {}, None, None, None, None, None
+    print(f"Watching {base_path} (Ctrl+C to stop)")
+    try:
+        while True:
+            signature = dataset_signature(base_path)
+            if signature != built and signature == seen:
+                start = time.perf_counter()
+                reread = None if loaded is None else [name for name in SOURCES if signature[name] != built[name]]
+                try:
+                    if loaded is None:
+                        validator = DatasetValidator()
+                    loaded = load_datasets(base_path, validator=validator, datasets=loaded, names=reread)
+                    fresh, subtitle, _ = prepare_dashboard_data(loaded, validator, args)
+                except (OSError, ValueError) as error:
+                    # The validator may hold half a file; start over on the next change
+                    print(f"Skipping rebuild: {error}")
+                    loaded = None
+                else:
+                    changed = [name for name in SOURCES if datasets is None
+                               or (fresh[name] is not datasets[name] and fresh[name] != datasets[name])]
+                    datasets = fresh
+                    previous = dict(values)
+                    html_content = build_dashboard_html(datasets, subtitle, jobs=args.jobs or os.cpu_count() or 1,
+                                                        values=values, live_reload=server is not None,
+                                                        **render_options(args))
+                    write_dashboard(html_content, output_path)
+                    kept = sum(values[name] is previous.get(name) for name in values if name not in SOURCES)
+                    if server:
+                        server.build += 1
+                    print(f"Rebuilt {output_path} in {time.perf_counter() - start:.2f}s "
+                          f"(changed: {', '.join(changed) or 'nothing'}; {kept} aggregates reused)")
+                    if server and server.build == 1:
+                        print(f"Serving {server.url}")
+                built = signature
+            seen = signature
+            time.sleep(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        print("Stopped watching")
 
 if __name__ == '__main__':
     main()